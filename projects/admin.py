@@ -1,6 +1,9 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from .models import User, Project, ProjectModification, File, FileDownloadEvent, FieldHistory
+from .models import (
+    User, Project, ProjectModification, File, FileBlob, FilePreview, FileDownloadEvent, FieldHistory,
+    FileDownloadStats, ProjectDownloadStats, ProjectDownloadMonth, ProjectCalendarEntry,
+)
 
 
 class UserAdmin(BaseUserAdmin):
@@ -19,7 +22,8 @@ class FileInline(admin.TabularInline):
     """Inline admin for files in project"""
     model = File
     extra = 0
-    readonly_fields = ['created_at', 'size_bytes']
+    readonly_fields = ['created_at', 'size_bytes', 'sha256']
+    exclude = ['blob']
 
 
 class ProjectModificationInline(admin.TabularInline):
@@ -72,8 +76,31 @@ class FileAdmin(admin.ModelAdmin):
     """File admin"""
     list_display = ['display_name', 'project', 'uploaded_by', 'get_size_display', 'created_at']
     list_filter = ['created_at']
-    search_fields = ['display_name', 'project__name']
-    readonly_fields = ['size_bytes', 'created_at']
+    search_fields = ['display_name', 'project__name', 'sha256']
+    readonly_fields = ['size_bytes', 'sha256', 'blob', 'created_at']
+
+
+@admin.register(FileBlob)
+class FileBlobAdmin(admin.ModelAdmin):
+    """Shared file content admin"""
+    list_display = ['sha256', 'file', 'size_bytes', 'ref_count', 'created_at']
+    search_fields = ['sha256']
+    readonly_fields = ['sha256', 'file', 'size_bytes', 'ref_count', 'created_at']
+
+
+@admin.register(FilePreview)
+class FilePreviewAdmin(admin.ModelAdmin):
+    """Video preview processing status"""
+    list_display = ['file', 'status', 'duration_seconds', 'attempts', 'processed_at']
+    list_filter = ['status']
+    list_select_related = ['file']
+    search_fields = ['file__display_name']
+    readonly_fields = ['file', 'poster', 'proxy', 'duration_seconds', 'attempts', 'error', 'created_at', 'processed_at']
+    actions = ['requeue']
+    
+    @admin.action(description='Queue selected previews for processing again')
+    def requeue(self, request, queryset):
+        queryset.update(status='PENDING', error=None)
 
 
 @admin.register(FileDownloadEvent)
@@ -84,6 +111,46 @@ class FileDownloadEventAdmin(admin.ModelAdmin):
     readonly_fields = ['created_at']
 
 
+@admin.register(ProjectDownloadStats)
+class ProjectDownloadStatsAdmin(admin.ModelAdmin):
+    """Project delivery status, read from the download rollup"""
+    list_display = ['project', 'client_download_count', 'files_downloaded_by_client', 'download_count',
+                    'distinct_downloaders', 'first_downloaded_at', 'last_client_download_at']
+    list_select_related = ['project']
+    search_fields = ['project__name', 'project__client_name']
+    readonly_fields = [f.name for f in ProjectDownloadStats._meta.fields]
+
+
+@admin.register(FileDownloadStats)
+class FileDownloadStatsAdmin(admin.ModelAdmin):
+    """Per-file download rollup"""
+    list_display = ['file', 'project', 'client_download_count', 'download_count',
+                    'distinct_downloaders', 'first_downloaded_at', 'last_downloaded_at']
+    list_select_related = ['file', 'project']
+    search_fields = ['file__display_name', 'project__name']
+    readonly_fields = [f.name for f in FileDownloadStats._meta.fields]
+
+
+@admin.register(ProjectDownloadMonth)
+class ProjectDownloadMonthAdmin(admin.ModelAdmin):
+    """Downloads per project per month"""
+    list_display = ['project', 'month', 'download_count', 'client_download_count']
+    list_select_related = ['project']
+    list_filter = ['month']
+    date_hierarchy = 'month'
+    readonly_fields = ['project', 'month', 'download_count', 'client_download_count']
+
+
+@admin.register(ProjectCalendarEntry)
+class ProjectCalendarEntryAdmin(admin.ModelAdmin):
+    """Production calendar, maintained from the projects"""
+    list_display = ['day', 'kind', 'name', 'status', 'edit_status']
+    list_filter = ['kind', 'status']
+    date_hierarchy = 'day'
+    search_fields = ['name']
+    readonly_fields = [f.name for f in ProjectCalendarEntry._meta.fields]
+
+
 @admin.register(FieldHistory)
 class FieldHistoryAdmin(admin.ModelAdmin):
     """Field history admin"""
@@ -0,0 +1,142 @@
+"""
+Download analytics: incremental rollups of FileDownloadEvent
+"""
+from django.db import transaction
+from django.db.models import Count, F, Max, Min, Q
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from .models import (
+    FileDownloadEvent, FileDownloadStats, Project, ProjectDownloadMonth, ProjectDownloadStats,
+)
+
+
+def _bump(stats, now, is_client, is_new_downloader):
+    stats.download_count += 1
+    stats.distinct_downloaders += int(is_new_downloader)
+    if stats.first_downloaded_at is None:
+        stats.first_downloaded_at = now
+    stats.last_downloaded_at = now
+    if is_client:
+        stats.client_download_count += 1
+        stats.last_client_download_at = now
+
+
+def record_download(file, user, success=True):
+    """
+    Log a download event and update the file, project and monthly rollups
+    in the same transaction. Returns the created FileDownloadEvent.
+    """
+    project = file.project
+
+    with transaction.atomic():
+        if not success:
+            return FileDownloadEvent.objects.create(file=file, project=project, downloaded_by=user, success=False)
+
+        # Lock the rollups before looking at earlier events: a concurrent download
+        # of this project waits here until it has committed its event, so the same
+        # user can't be counted as a new downloader twice
+        project_stats, _ = ProjectDownloadStats.objects.select_for_update().get_or_create(project=project)
+        file_stats, _ = FileDownloadStats.objects.select_for_update().get_or_create(
+            file=file, defaults={'project': project}
+        )
+
+        is_new_file_downloader = is_new_project_downloader = False
+        if user is not None:
+            # Both checks are served by the (file|project, downloaded_by) indexes
+            is_new_file_downloader = not FileDownloadEvent.objects.filter(
+                file=file, downloaded_by=user, success=True
+            ).exists()
+            is_new_project_downloader = is_new_file_downloader and not FileDownloadEvent.objects.filter(
+                project=project, downloaded_by=user, success=True
+            ).exists()
+
+        event = FileDownloadEvent.objects.create(file=file, project=project, downloaded_by=user, success=True)
+        now = event.created_at
+        is_client = user is not None and user.pk == project.user_id
+
+        first_client_download = is_client and file_stats.client_download_count == 0
+        _bump(file_stats, now, is_client, is_new_file_downloader)
+        file_stats.save()
+
+        _bump(project_stats, now, is_client, is_new_project_downloader)
+        project_stats.files_downloaded_by_client += int(first_client_download)
+        project_stats.save()
+
+        month = timezone.localdate(now).replace(day=1)
+        month_stats, _ = ProjectDownloadMonth.objects.get_or_create(project=project, month=month)
+        ProjectDownloadMonth.objects.filter(pk=month_stats.pk).update(
+            download_count=F('download_count') + 1,
+            client_download_count=F('client_download_count') + int(is_client),
+        )
+
+    return event
+
+
+def rebuild_download_stats():
+    """Recompute every rollup from the event table; returns (files, projects, months) counts"""
+    events = FileDownloadEvent.objects.filter(success=True)
+    by_client = Q(downloaded_by=F('project__user'))
+
+    file_rows = events.values('file', 'project').annotate(
+        download_count=Count('id'),
+        client_download_count=Count('id', filter=by_client),
+        distinct_downloaders=Count('downloaded_by', distinct=True),
+        first_downloaded_at=Min('created_at'),
+        last_downloaded_at=Max('created_at'),
+        last_client_download_at=Max('created_at', filter=by_client),
+    ).order_by()
+
+    project_rows = events.values('project').annotate(
+        download_count=Count('id'),
+        client_download_count=Count('id', filter=by_client),
+        files_downloaded_by_client=Count('file', filter=by_client, distinct=True),
+        distinct_downloaders=Count('downloaded_by', distinct=True),
+        first_downloaded_at=Min('created_at'),
+        last_downloaded_at=Max('created_at'),
+        last_client_download_at=Max('created_at', filter=by_client),
+    ).order_by()
+
+    month_rows = events.annotate(month=TruncMonth('created_at')).values('project', 'month').annotate(
+        download_count=Count('id'),
+        client_download_count=Count('id', filter=by_client),
+    ).order_by()
+
+    with transaction.atomic():
+        FileDownloadStats.objects.all().delete()
+        ProjectDownloadStats.objects.all().delete()
+        ProjectDownloadMonth.objects.all().delete()
+
+        FileDownloadStats.objects.bulk_create([
+            FileDownloadStats(
+                file_id=row.pop('file'), project_id=row.pop('project'), **row
+            ) for row in file_rows
+        ], batch_size=500)
+        ProjectDownloadStats.objects.bulk_create([
+            ProjectDownloadStats(project_id=row.pop('project'), **row) for row in project_rows
+        ], batch_size=500)
+        month_objects = []
+        for row in month_rows:
+            month = row.pop('month')
+            month_objects.append(ProjectDownloadMonth(
+                project_id=row.pop('project'),
+                month=(timezone.localtime(month) if timezone.is_aware(month) else month).date(),
+                **row
+            ))
+        ProjectDownloadMonth.objects.bulk_create(month_objects, batch_size=500)
+
+    return len(file_rows), len(project_rows), len(month_objects)
+
+
+def delivery_status_queryset():
+    """Active projects with files, annotated for the delivery status page from the rollups only"""
+    return Project.objects.filter(is_archived=False).annotate(
+        file_count=Count('files', distinct=True),
+    ).filter(file_count__gt=0).select_related('download_stats', 'user').only(
+        'name', 'slug', 'client_name', 'event_date', 'status', 'edit_status',
+        'user__first_name', 'user__last_name', 'user__username', 'user__email',
+        'download_stats__download_count', 'download_stats__client_download_count',
+        'download_stats__files_downloaded_by_client', 'download_stats__distinct_downloaders',
+        'download_stats__first_downloaded_at', 'download_stats__last_downloaded_at',
+        'download_stats__last_client_download_at',
+    ).order_by('event_date')
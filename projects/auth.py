@@ -0,0 +1,74 @@
+"""
+Authentication backend that serves the per-request user lookup from the cache,
+and login_required for async views
+"""
+from functools import wraps
+
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.views import redirect_to_login
+from django.db import DEFAULT_DB_ALIAS
+
+from .cache import cached
+from .models import User
+
+
+# Every column but the password hash, in model order (see cached_user())
+CACHED_USER_FIELDS = tuple(field.attname for field in User._meta.concrete_fields if field.attname != 'password')
+
+
+@cached('users')
+def get_cached_user(user_id):
+    """
+    The user's CACHED_USER_FIELDS values and session auth hashes, or None;
+    invalidated whenever a user is saved (except for sign-ins) or deleted
+    """
+    user = User.objects.filter(pk=user_id).first()
+    if user is None:
+        return None
+    return {
+        'values': [getattr(user, name) for name in CACHED_USER_FIELDS],
+        'session_hashes': [user.get_session_auth_hash(), *user.get_session_auth_fallback_hash()],
+    }
+
+
+def cached_user(user_id):
+    """
+    User from the cache, like one loaded with .defer('password'): reading the
+    password queries it, and save() only writes the other columns
+    """
+    data = get_cached_user(user_id)
+    if data is None:
+        return None
+    user = User.from_db(DEFAULT_DB_ALIAS, CACHED_USER_FIELDS, data['values'])
+    user.cached_session_hashes = data['session_hashes']
+    return user
+
+
+class CachedModelBackend(ModelBackend):
+    """
+    ModelBackend whose get_user() (called by AuthenticationMiddleware on every
+    request) hits the shared cache instead of the users table. The cache holds
+    the session auth hash rather than the password hash; password changes save
+    the user, which invalidates the entry, so session verification still sees
+    the current password.
+    """
+
+    def get_user(self, user_id):
+        user = cached_user(user_id)
+        return user if self.user_can_authenticate(user) else None
+
+
+def alogin_required(view):
+    """
+    login_required for async views (Django 5.0's decorator only wraps sync
+    views). The user is loaded with request.auser() and assigned to
+    request.user, so the view and templates can use it without lazy DB access.
+    """
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        user = await request.auser()
+        if not user.is_authenticated:
+            return redirect_to_login(request.get_full_path())
+        request.user = user
+        return await view(request, *args, **kwargs)
+    return wrapper
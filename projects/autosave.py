@@ -0,0 +1,96 @@
+"""
+Autosave coalescing for the audit trail
+
+The project page saves field by field as the user types. Recording every
+intermediate state would add a ProjectModification (and, for the free-text
+fields, a FieldHistory row) per debounced keystroke. Instead, an edit extends
+the latest row for the same field when that row:
+
+- was written by the same user,
+- is still the newest row for the field (nobody else edited in between), and
+- was created less than AUTOSAVE_COALESCE_SECONDS ago.
+
+The row keeps the value from before the editing session and takes the
+latest value, so the trail still reads "from A to Z, by whom, when". If the
+user types the field back to where it started, the row is removed.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import FieldHistory, ProjectModification
+
+
+def coalesce_window():
+    """The coalescing window as a timedelta, or None when coalescing is disabled"""
+    seconds = getattr(settings, 'AUTOSAVE_COALESCE_SECONDS', 0)
+    return timedelta(seconds=seconds) if seconds > 0 else None
+
+
+def _open_row(queryset, author_field, user, *fields):
+    """The newest row of `queryset` if it belongs to `user` and is still inside the window"""
+    window = coalesce_window()
+    if window is None:
+        return None
+    latest = queryset.order_by('-created_at', '-id').only('id', 'old_value', 'created_at', author_field, *fields).first()
+    if latest is None or getattr(latest, f'{author_field}_id') != user.pk:
+        return None
+    if latest.created_at < timezone.now() - window:
+        return None
+    return latest
+
+
+def _extend(model, row, new_value):
+    """Point an open row at the latest value; drop it when the session ended where it started"""
+    if (row.old_value or '') == new_value:
+        model.objects.filter(pk=row.pk).delete()
+        return None
+    model.objects.filter(pk=row.pk).update(new_value=new_value)
+    row.new_value = new_value
+    return row
+
+
+def record_auto_applied(project, field_name, old_value, new_value, user):
+    """
+    Record an applied edit as an AUTO_APPLIED ProjectModification, extending
+    the user's open row for the field when there is one. Returns the row, or
+    None when a coalesced edit cancelled out.
+    """
+    row = _open_row(
+        ProjectModification.objects.filter(project=project, field_name=field_name),
+        'created_by', user, 'status',
+    )
+    if row is not None and row.status == 'AUTO_APPLIED':
+        return _extend(ProjectModification, row, new_value)
+    return ProjectModification.objects.create(
+        project=project,
+        field_name=field_name,
+        old_value=old_value,
+        new_value=new_value,
+        created_by=user,
+        status='AUTO_APPLIED'
+    )
+
+
+def record_field_history(project, field_name, old_value, new_value, user):
+    """
+    Record a FieldHistory entry, extending the user's open entry for the
+    field when there is one. Returns (entry, created); entry is None when the
+    value did not change or a coalesced edit cancelled out.
+    """
+    row = _open_row(
+        FieldHistory.objects.filter(project=project, field_name=field_name),
+        'edited_by', user,
+    )
+    if row is not None:
+        return _extend(FieldHistory, row, new_value), False
+    if old_value == new_value:
+        return None, False
+    return FieldHistory.objects.create(
+        project=project,
+        field_name=field_name,
+        old_value=old_value,
+        new_value=new_value,
+        edited_by=user
+    ), True
@@ -0,0 +1,352 @@
+"""
+Backup creation, catalog and retention helpers
+
+Every backup written through this module is recorded in a manifest file that
+lives next to the backups, so listing pages never have to glob and stat the
+backup directory. Changes to the manifest re-read it and replace it atomically
+under a file lock, so backups, pruning and the admin page (possibly in
+different processes) don't drop each other's entries.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone as dt_timezone
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files import File
+from django.core.management import call_command
+from django.utils import timezone
+
+from .storage import get_backup_storage
+
+try:
+    import fcntl
+except ImportError:  # Windows: no lock, as before
+    fcntl = None
+
+
+BACKUP_PREFIX = 'wedding_portal_backup_'
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_LOCK_NAME = '.manifest.lock'
+COPY_CHUNK_SIZE = 1024 * 1024  # 1MB
+
+DEFAULT_RETENTION = {
+    'daily': 7,
+    'weekly': 4,
+    'monthly': 12,
+}
+
+
+def get_backup_dir():
+    """Return the default backups directory"""
+    return Path(settings.BASE_DIR) / 'backups'
+
+
+def get_retention_policy():
+    """Return the GFS retention policy merged with settings.BACKUP_RETENTION"""
+    policy = dict(DEFAULT_RETENTION)
+    policy.update(getattr(settings, 'BACKUP_RETENTION', {}))
+    return policy
+
+
+class HashingWriter:
+    """Text stream wrapper that hashes everything written through it"""
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._hash = hashlib.sha256()
+        self.size_bytes = 0
+
+    def write(self, text):
+        data = text.encode('utf-8')
+        self._hash.update(data)
+        self.size_bytes += len(data)
+        return self._stream.write(text)
+
+    def flush(self):
+        self._stream.flush()
+
+    def hexdigest(self):
+        return self._hash.hexdigest()
+
+
+class BackupCatalog:
+    """Manifest of the backups stored in a directory"""
+
+    def __init__(self, backup_dir=None):
+        self.backup_dir = Path(backup_dir) if backup_dir else get_backup_dir()
+        self.manifest_path = self.backup_dir / MANIFEST_NAME
+        self._entries = None
+        self._lock_file = None
+
+    @contextmanager
+    def _locked(self):
+        """
+        Hold the manifest's file lock and work on a fresh copy of it; the
+        lock is re-entrant within this catalog (reindex() runs inside add())
+        """
+        if self._lock_file is not None:
+            yield
+            return
+
+        self.backup_dir.mkdir(parents=True, exist_ok=True)
+        self._lock_file = open(self.backup_dir / MANIFEST_LOCK_NAME, 'a')
+        try:
+            if fcntl:
+                fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+            self._entries = None  # Another process may have changed it since we read it
+            yield
+        finally:
+            self._lock_file.close()  # Releases the lock
+            self._lock_file = None
+
+    def _load(self):
+        if self._entries is not None:
+            return self._entries
+
+        if self.manifest_path.exists():
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self._entries = {entry['name']: entry for entry in data.get('backups', [])}
+        else:
+            # First use: index whatever is already on disk, once
+            self.reindex()
+        return self._entries
+
+    def _save(self):
+        # Callers hold the lock; readers see the old or the new file, never half of one
+        entries = sorted(self._entries.values(), key=lambda e: e['created_at'], reverse=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.backup_dir, prefix='.manifest-', suffix='.json')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'version': 1, 'backups': entries}, f, indent=2)
+            os.replace(temp_path, self.manifest_path)
+        except Exception:
+            Path(temp_path).unlink(missing_ok=True)
+            raise
+
+    def entries(self):
+        """Return catalog entries, newest first"""
+        return sorted(self._load().values(), key=lambda e: e['created_at'], reverse=True)
+
+    def get(self, name):
+        return self._load().get(name)
+
+    def add(self, entry):
+        with self._locked():
+            self._load()[entry['name']] = entry
+            self._save()
+
+    def remove(self, *names):
+        with self._locked():
+            entries = self._load()
+            removed = [name for name in names if entries.pop(name, None) is not None]
+            if removed:
+                self._save()
+
+    def reindex(self):
+        """Reconcile the catalog with the files actually present on disk"""
+        with self._locked():
+            return self._reindex()
+
+    def _reindex(self):
+        if self._entries is None and self.manifest_path.exists():
+            self._load()
+        entries = self._entries if self._entries is not None else {}
+        self._entries = entries
+
+        on_disk = {}
+        if self.backup_dir.exists():
+            on_disk = {p.name: p for p in self.backup_dir.glob(f'{BACKUP_PREFIX}*') if p.is_file()}
+
+        for name in list(entries):
+            if name not in on_disk:
+                del entries[name]
+
+        for name, path in on_disk.items():
+            if name in entries:
+                continue
+            stat = path.stat()
+            entries[name] = {
+                'name': name,
+                'type': path.suffix[1:].upper(),
+                'size_bytes': stat.st_size,
+                'checksum': file_checksum(path),
+                'duration_ms': None,
+                'created_at': datetime.fromtimestamp(stat.st_mtime, tz=dt_timezone.utc).isoformat(),
+            }
+
+        self._save()
+        return self.entries()
+
+
+def file_checksum(path):
+    """Return the SHA-256 hex digest of a file"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(COPY_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _write_json_backup(path):
+    with open(path, 'w', encoding='utf-8') as f:
+        writer = HashingWriter(f)
+        call_command(
+            'dumpdata',
+            '--natural-foreign',
+            '--natural-primary',
+            '--indent', '2',
+            stdout=writer,
+            exclude=['contenttypes', 'auth.permission', 'sessions.session']
+        )
+    return writer.hexdigest()
+
+
+def _write_sqlite_backup(db_path, path):
+    # SQLite's online backup reads through the database, so commits still in the
+    # -wal file (WAL journaling, see SQLITE_PRAGMAS) are included; a plain file
+    # copy would miss them
+    source = sqlite3.connect(db_path)
+    target = sqlite3.connect(path)
+    try:
+        source.backup(target)
+        # Leave one self-contained file, with no -wal beside it
+        target.execute('PRAGMA journal_mode=delete')
+    finally:
+        target.close()
+        source.close()
+    return file_checksum(path)
+
+
+def create_backup(backup_format='json', backup_dir=None, base_filename=None, catalog=None):
+    """
+    Write a backup in the requested format and record it in the catalog.
+    Returns the list of catalog entries created. Raises on the first failure.
+    """
+    catalog = catalog or BackupCatalog(backup_dir)
+    backup_dir = catalog.backup_dir
+    backup_dir.mkdir(parents=True, exist_ok=True)
+
+    if not base_filename:
+        base_filename = f'{BACKUP_PREFIX}{datetime.now().strftime("%Y%m%d_%H%M%S")}'
+
+    jobs = []
+    if backup_format in ['json', 'both']:
+        jobs.append(('JSON', backup_dir / f'{base_filename}.json'))
+    if backup_format in ['sqlite', 'both']:
+        db_engine = settings.DATABASES['default']['ENGINE']
+        if 'sqlite' not in db_engine:
+            if backup_format == 'sqlite':
+                raise ValueError('SQLite backup only works with SQLite databases.')
+        else:
+            db_path = Path(settings.DATABASES['default']['NAME'])
+            if not db_path.exists():
+                raise FileNotFoundError(f'Database file not found: {db_path}')
+            jobs.append(('SQLITE3', backup_dir / f'{base_filename}.sqlite3'))
+
+    created = []
+    for backup_type, path in jobs:
+        started = time.monotonic()
+        if backup_type == 'JSON':
+            checksum = _write_json_backup(path)
+        else:
+            checksum = _write_sqlite_backup(Path(settings.DATABASES['default']['NAME']), path)
+        duration_ms = int((time.monotonic() - started) * 1000)
+
+        entry = {
+            'name': path.name,
+            'type': backup_type,
+            'size_bytes': path.stat().st_size,
+            'checksum': checksum,
+            'duration_ms': duration_ms,
+            'created_at': timezone.now().isoformat(),
+        }
+        entry['remote'] = offload_backup(path)
+        catalog.add(entry)
+        created.append(entry)
+
+    return created
+
+
+def offload_backup(path, storage=None):
+    """Copy a local backup file to the backups storage; returns the remote name or None"""
+    storage = storage or get_backup_storage()
+    if storage is None:
+        return None
+    with open(path, 'rb') as f:
+        return storage.save(Path(path).name, File(f))
+
+
+def delete_backup_file(catalog, name):
+    """Delete a backup locally and from the backups storage"""
+    (catalog.backup_dir / name).unlink(missing_ok=True)
+    entry = catalog.get(name)
+    storage = get_backup_storage()
+    if entry and entry.get('remote') and storage is not None:
+        storage.delete(entry['remote'])
+
+
+def select_backups_to_prune(entries, policy=None):
+    """
+    Apply a grandfather-father-son policy to catalog entries.
+
+    The newest backup of each of the last `daily` days, `weekly` ISO weeks
+    and `monthly` months is kept; files sharing a base name (JSON + SQLite
+    from the same run) are kept or pruned together. Only automatically named
+    backups are candidates for pruning.
+    """
+    policy = policy or get_retention_policy()
+
+    runs = {}
+    for entry in entries:
+        if not entry['name'].startswith(BACKUP_PREFIX):
+            continue
+        base_name = entry['name'].rsplit('.', 1)[0]
+        created_at = datetime.fromisoformat(entry['created_at'])
+        run = runs.setdefault(base_name, {'created_at': created_at, 'entries': []})
+        run['created_at'] = max(run['created_at'], created_at)
+        run['entries'].append(entry)
+
+    ordered = sorted(runs.values(), key=lambda r: r['created_at'], reverse=True)
+    keep = set()
+    buckets = {
+        'daily': lambda d: d.date(),
+        'weekly': lambda d: d.isocalendar()[:2],
+        'monthly': lambda d: (d.year, d.month),
+    }
+    for period, bucket_of in buckets.items():
+        limit = policy.get(period, 0)
+        seen = set()
+        for index, run in enumerate(ordered):
+            if len(seen) >= limit:
+                break
+            local_date = timezone.localtime(run['created_at']) if timezone.is_aware(run['created_at']) else run['created_at']
+            bucket = bucket_of(local_date)
+            if bucket not in seen:
+                seen.add(bucket)
+                keep.add(index)
+
+    prune = []
+    for index, run in enumerate(ordered):
+        if index not in keep:
+            prune.extend(run['entries'])
+    return prune
+
+
+def prune_backups(catalog=None, policy=None, dry_run=False):
+    """Delete backups that fall outside the retention policy; return pruned entries"""
+    catalog = catalog or BackupCatalog()
+    to_prune = select_backups_to_prune(catalog.entries(), policy=policy)
+    if dry_run:
+        return to_prune
+
+    for entry in to_prune:
+        delete_backup_file(catalog, entry['name'])
+    catalog.remove(*[entry['name'] for entry in to_prune])
+    return to_prune
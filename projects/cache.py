@@ -0,0 +1,86 @@
+"""
+Application cache helpers
+
+Values live in the shared CACHES['default'] backend, whose KEY_PREFIX carries
+the deploy version so a new release never reads entries written by the
+previous code. Entries are grouped into namespaces ('projects', 'users', ...).
+Every key includes the namespace's current generation number. The model
+signals in signals.py bump the generation, which invalidates the whole
+namespace at once without tracking individual keys.
+"""
+import functools
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import translation
+
+
+DEFAULT_TIMEOUT = getattr(settings, 'APP_CACHE_TIMEOUT', 300)
+_MISSING = object()
+
+
+def _generation_key(namespace):
+    return f'gen:{namespace}'
+
+
+def generations(*namespaces):
+    """Current generation number of each namespace, in order"""
+    keys = [_generation_key(ns) for ns in namespaces]
+    found = cache.get_many(keys)
+    result = []
+    for key in keys:
+        if key not in found:
+            # Start from the clock, not 1, so an evicted counter can never
+            # come back at a value that older entries were written under
+            cache.add(key, time.time_ns(), timeout=None)
+            found[key] = cache.get(key)
+        result.append(found[key])
+    return result
+
+
+def invalidate(*namespaces):
+    """Drop every cached value in the given namespaces"""
+    for namespace in namespaces:
+        try:
+            cache.incr(_generation_key(namespace))
+        except ValueError:
+            cache.set(_generation_key(namespace), time.time_ns(), timeout=None)
+
+
+def make_key(namespaces, *parts):
+    raw = '|'.join(str(part) for part in parts)
+    digest = hashlib.md5(raw.encode('utf-8')).hexdigest()
+    stamp = '.'.join(str(g) for g in generations(*namespaces))
+    return f'{"+".join(namespaces)}:{stamp}:{digest}'
+
+
+def cached(namespaces, timeout=DEFAULT_TIMEOUT, per_language=False):
+    """
+    Cache a function's return value, keyed on its arguments and on the
+    generations of `namespaces`. Pass per_language=True for results that
+    contain translated text. The undecorated function is available as
+    `.uncached`.
+    """
+    if isinstance(namespaces, str):
+        namespaces = (namespaces,)
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            parts = [func.__module__, func.__qualname__, *args, *sorted(kwargs.items())]
+            if per_language:
+                parts.append(translation.get_language())
+            key = make_key(namespaces, *parts)
+
+            value = cache.get(key, _MISSING)
+            if value is _MISSING:
+                value = func(*args, **kwargs)
+                cache.set(key, value, timeout)
+            return value
+
+        wrapper.uncached = func
+        return wrapper
+
+    return decorator
@@ -0,0 +1,130 @@
+"""
+Change sets: a project edit computed once and written in one transaction
+
+diff() compares the submitted values with the project's as typed values, so
+an unchanged checkbox, number or date is not mistaken for an edit. What an edit
+produces is then written together:
+
+- the applied values and workflow flags with one UPDATE (Project.compare_and_set),
+- change requests for the fields that need approval (see pending.py),
+- AUTO_APPLIED modifications and FieldHistory entries with one INSERT each.
+"""
+from django.db import transaction
+
+from .events import publish_field_changes
+from .models import FieldHistory, ProjectModification
+from .pending import PendingConflict, submit_pending
+from .policy import HISTORY_FIELDS
+from .schema import FIELDS
+
+
+_EMPTY = (None, '')
+
+
+class ChangeConflict(Exception):
+    """Another writer changed the fields being applied first; nothing was written"""
+
+
+def diff(project, values):
+    """Field name -> (old, new) for the `values` that differ from the project's"""
+    changes = {}
+    for field_name, new_value in values.items():
+        old_value = getattr(project, field_name)
+        if _normalized(old_value) != _normalized(new_value):
+            changes[field_name] = (old_value, new_value)
+    return changes
+
+
+def _normalized(value):
+    # Forms strip surrounding whitespace and return '' or None for empty input
+    if isinstance(value, str):
+        value = value.strip()
+    return None if value in _EMPTY else value
+
+
+def as_text(changes):
+    """The (old, new) pairs of a diff as audit trail text"""
+    return {name: (FIELDS[name].text(old), FIELDS[name].text(new)) for name, (old, new) in changes.items()}
+
+
+def record_applied(project, changes, user):
+    """
+    Audit applied `changes` (field name -> (old, new) text): an AUTO_APPLIED
+    modification for each, and FieldHistory for the HISTORY_FIELDS that changed
+    """
+    ProjectModification.objects.bulk_create([
+        ProjectModification(
+            project=project,
+            field_name=field_name,
+            old_value=old_value,
+            new_value=new_value,
+            created_by=user,
+            status='AUTO_APPLIED'
+        )
+        for field_name, (old_value, new_value) in changes.items()
+    ])
+    FieldHistory.objects.bulk_create([
+        FieldHistory(
+            project=project,
+            field_name=field_name,
+            old_value=old_value,
+            new_value=new_value,
+            edited_by=user
+        )
+        for field_name, (old_value, new_value) in changes.items()
+        if field_name in HISTORY_FIELDS and old_value != new_value
+    ])
+
+
+def save_project_changes(project, changes, fields, client_version=None, client_expected=None, actor=None):
+    """
+    Write `changes` with optimistic locking (see Project.compare_and_set).
+
+    The client sends the version it loaded; if that is stale the write still
+    goes through when each of `fields` holds the value the client last saw
+    (`client_expected`), i.e. someone changed other fields meanwhile. Callers
+    without a version are checked against what this request read.
+    Saved values are published to open project pages (see events.py).
+    """
+    if client_version is None:
+        client_version = project.version
+        client_expected = {name: getattr(project, name) for name in fields}
+    saved = project.compare_and_set(changes, expected_version=client_version) or (
+        bool(client_expected) and project.compare_and_set(changes, expected_values=client_expected)
+    )
+    if saved:
+        published = dict(changes)
+        if 'title_video' in changes or 'type' in changes:
+            published['name'] = project.name
+        publish_field_changes(project, published, actor)
+    return saved
+
+
+def apply_change_set(project, values, user, bypass_fields=()):
+    """
+    Apply submitted `values` for `user`: fields in `bypass_fields` are written
+    directly, the others become change requests for the admin. Returns the
+    (applied, requested) field names. Raises ChangeConflict, writing nothing,
+    if the applied fields changed since `project` was loaded, or concurrent
+    requests for the requested ones kept conflicting.
+    """
+    changes = diff(project, values)
+    applied = {name: change for name, change in changes.items() if name in bypass_fields}
+    requested = {name: change for name, change in changes.items() if name not in applied}
+
+    with transaction.atomic():
+        # Replaces the user's earlier requests for the same fields
+        try:
+            created = submit_pending(project, as_text(requested), user)
+        except PendingConflict as conflict:
+            raise ChangeConflict(conflict.fields)
+        updates = {name: new_value for name, (_, new_value) in applied.items()}
+        if created:
+            updates.update(admin_notified_of_changes=True, has_unsent_changes=True)
+        if applied:
+            if not save_project_changes(project, updates, list(applied), actor=user):
+                raise ChangeConflict(sorted(applied))
+        elif updates:
+            project.compare_and_set(updates)  # Only the flags change, so no version check is needed
+        record_applied(project, as_text(applied), user)
+    return list(applied), [modification.field_name for modification in created]
@@ -0,0 +1,33 @@
+"""
+Per-connection database tuning
+
+SQLite's defaults (rollback journal, full fsync on every commit, no busy
+timeout) make concurrent gunicorn workers fail with "database is locked" as
+soon as two client edits land at the same time. The PRAGMAs in
+settings.SQLITE_PRAGMAS are applied to every new connection here.
+PostgreSQL needs nothing per connection; its tuning lives in DATABASES.
+"""
+from django.conf import settings
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    """connection_created handler applying SQLITE_PRAGMAS to new SQLite connections"""
+    if connection.vendor != 'sqlite':
+        return
+
+    pragmas = getattr(settings, 'SQLITE_PRAGMAS', {})
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+def sqlite_pragma_values(connection, names=None):
+    """Read back the current PRAGMA values of a SQLite connection (for diagnostics)"""
+    names = names or list(getattr(settings, 'SQLITE_PRAGMAS', {}))
+    values = {}
+    with connection.cursor() as cursor:
+        for name in names:
+            cursor.execute(f'PRAGMA {name}')
+            row = cursor.fetchone()
+            values[name] = row[0] if row else None
+    return values
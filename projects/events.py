@@ -0,0 +1,228 @@
+"""
+Live project updates: a DB-backed event bus streamed as Server-Sent Events
+
+Writers call publish() (views, or signal handlers in signals.py), which
+stores a ProjectEvent row. Open streams poll the table by id, so events
+reach browsers connected to any worker or server. Streams in the writing
+process are also woken as soon as the transaction commits, so they do not
+wait for the next poll.
+
+Streams are async generators and are meant to be served through asgi.py.
+Under WSGI pages don't subscribe and the endpoint answers 204, unless
+settings.SSE_WSGI opts in to a blocking variant, which holds a worker
+thread for as long as the page stays open.
+"""
+import asyncio
+import json
+import threading
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db import close_old_connections, transaction
+
+from .models import Project, ProjectEvent
+from .policy import ADMIN_ONLY_FIELDS, UNPUBLISHED_FIELDS
+
+
+# (event loop, asyncio.Event) for every open stream in this process
+_waiters = set()
+_waiters_lock = threading.Lock()
+
+
+def live_updates_enabled(request):
+    """Whether pages served for `request` should open an event stream"""
+    return isinstance(request, ASGIRequest) or settings.SSE_WSGI
+
+
+def _wake_streams():
+    with _waiters_lock:
+        waiters = list(_waiters)
+    for loop, wake in waiters:
+        try:
+            loop.call_soon_threadsafe(wake.set)
+        except RuntimeError:
+            pass  # Loop already closed; the stream is going away
+
+
+def _store(events):
+    """Insert events in one query; streams in this process are woken once it commits"""
+    if events:
+        ProjectEvent.objects.bulk_create(events)
+        transaction.on_commit(_wake_streams)
+    return events
+
+
+def publish(project, kind, data=None, actor=None, audience='ALL'):
+    """Record an event for `project`"""
+    return _store([ProjectEvent(project=project, kind=kind, data=data or {}, actor=actor, audience=audience)])[0]
+
+
+def publish_field_changes(project, changes, actor=None):
+    """Publish the values a write stored: progress.changed, and field.updated split by audience"""
+    progress, visible, admin_only = {}, {}, {}
+    for name, value in changes.items():
+        if name in UNPUBLISHED_FIELDS:
+            continue
+        if name in Project.PROGRESS_FIELDS:
+            progress[name] = value
+        elif name in ADMIN_ONLY_FIELDS:
+            admin_only[name] = value
+        else:
+            visible[name] = value
+
+    events = [
+        ProjectEvent(project=project, kind=kind, data=data, actor=actor, audience=audience)
+        for kind, data, audience in (
+            ('progress.changed', progress, 'ALL'),
+            ('field.updated', {'fields': visible}, 'ALL'),
+            ('field.updated', {'fields': admin_only}, 'ADMIN'),
+        )
+        if data.get('fields', data)
+    ]
+    _store(events)  # One INSERT however many audiences
+
+
+def publish_reviews(modifications, actor):
+    """modification.approved / modification.rejected for reviewed change requests, in one INSERT"""
+    _store([
+        ProjectEvent(
+            project_id=modification.project_id,
+            kind=f'modification.{modification.status.lower()}',
+            data={
+                'modification_id': modification.pk,
+                'field': modification.field_name,
+                'new_value': modification.new_value or '',
+                'notes': modification.notes or '',
+            },
+            actor=actor,
+        )
+        for modification in modifications
+    ])
+
+
+def publish_pending(created, superseded=None, actor=None):
+    """
+    For admins, in one INSERT: modification.superseded for the requests
+    replaced or withdrawn (`superseded` maps project id -> field -> ids) and
+    modification.pending for the `created` ones
+    """
+    replacements = {(modification.project_id, modification.field_name): modification.pk for modification in created}
+    events = [
+        ProjectEvent(
+            project_id=project_id,
+            kind='modification.superseded',
+            data={'modification_ids': ids, 'field': field, 'replaced_by': replacements.get((project_id, field))},
+            actor=actor,
+            audience='ADMIN',
+        )
+        for project_id, fields in (superseded or {}).items()
+        for field, ids in fields.items()
+    ]
+    events += [
+        ProjectEvent(
+            project_id=modification.project_id,
+            kind='modification.pending',
+            data={
+                'modification_id': modification.pk,
+                'field': modification.field_name,
+                'old_value': modification.old_value or '',
+                'new_value': modification.new_value or '',
+            },
+            actor=actor,
+            audience='ADMIN',
+        )
+        for modification in created
+    ]
+    _store(events)
+
+
+def latest_event_id():
+    """Id to start a fresh stream from, so it only receives new events"""
+    return ProjectEvent.objects.order_by('-id').values_list('id', flat=True).first() or 0
+
+
+def fetch_events(user, after_id, project_id=None, limit=100):
+    """Events after `after_id` that `user` may see, oldest first, as dicts"""
+    close_old_connections()  # Long-lived stream threads must honour CONN_MAX_AGE too
+    events = ProjectEvent.objects.filter(id__gt=after_id)
+    if project_id is not None:
+        events = events.filter(project_id=project_id)
+    if not user.is_admin():
+        events = events.filter(project__user=user, audience='ALL')
+    return list(events.order_by('id').values(
+        'id', 'kind', 'data', 'created_at', 'actor_id',
+        'project__slug', 'project__name', 'actor__first_name', 'actor__last_name', 'actor__email',
+    )[:limit])
+
+
+def format_event(event):
+    """One event in the text/event-stream wire format"""
+    actor = f"{event['actor__first_name'] or ''} {event['actor__last_name'] or ''}".strip() or event['actor__email']
+    payload = {
+        'id': event['id'],
+        'type': event['kind'],
+        'project': event['project__slug'],
+        'project_name': event['project__name'],
+        'actor': actor or '',
+        'data': event['data'],
+        'created_at': event['created_at'].isoformat(),
+    }
+    return f"id: {event['id']}\nevent: {event['kind']}\ndata: {json.dumps(payload, default=str)}\n\n"
+
+
+def _frames(user, events):
+    """SSE frames for the events `user` did not cause and the last id seen"""
+    frames, last_id = [], None
+    for event in events:
+        last_id = event['id']
+        if event['actor_id'] != user.pk:  # People don't need to hear about their own edits
+            frames.append(format_event(event))
+    return frames, last_id
+
+
+async def stream_events(user, after_id, project_id=None):
+    """Async text/event-stream body: events as they happen, heartbeats in between"""
+    loop = asyncio.get_running_loop()
+    wake = asyncio.Event()
+    waiter = (loop, wake)
+    with _waiters_lock:
+        _waiters.add(waiter)
+    fetch = sync_to_async(fetch_events, thread_sensitive=False)  # Don't queue behind sync views
+    try:
+        yield f'retry: {settings.SSE_RETRY_MS}\n\n'
+        started = last_write = loop.time()
+        while loop.time() - started < settings.SSE_MAX_SECONDS:
+            wake.clear()  # Before fetching, so a commit during the fetch still wakes us
+            frames, last_id = _frames(user, await fetch(user, after_id, project_id))
+            after_id = last_id or after_id
+            if frames:
+                yield ''.join(frames)
+                last_write = loop.time()
+            elif loop.time() - last_write >= settings.SSE_HEARTBEAT_SECONDS:
+                yield ': keep-alive\n\n'  # Comment line: keeps proxies from closing the connection
+                last_write = loop.time()
+            try:
+                await asyncio.wait_for(wake.wait(), timeout=settings.SSE_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        with _waiters_lock:
+            _waiters.discard(waiter)
+
+
+def stream_events_sync(user, after_id, project_id=None):
+    """Blocking equivalent of stream_events for WSGI servers"""
+    yield f'retry: {settings.SSE_RETRY_MS}\n\n'
+    started = last_write = time.monotonic()
+    while time.monotonic() - started < settings.SSE_MAX_SECONDS:
+        frames, last_id = _frames(user, fetch_events(user, after_id, project_id))
+        after_id = last_id or after_id
+        if frames:
+            yield ''.join(frames)
+            last_write = time.monotonic()
+        elif time.monotonic() - last_write >= settings.SSE_HEARTBEAT_SECONDS:
+            yield ': keep-alive\n\n'
+            last_write = time.monotonic()
+        time.sleep(settings.SSE_POLL_INTERVAL)
@@ -1,6 +1,7 @@
 from django import forms
 from django.contrib.auth.forms import UserCreationForm
 from .models import User, Project, File
+from .policy import ADMIN_MANAGED_FIELDS, ADMIN_ONLY_FIELDS
 
 
 class LoginForm(forms.Form):
@@ -169,6 +170,16 @@ class ProjectDetailForm(forms.ModelForm):
                     del self.fields['civil_union_details']
 
 
+class ClientProjectDetailForm(ProjectDetailForm):
+    """The project form as clients get it: without admin-only and admin-managed fields"""
+    
+    class Meta(ProjectDetailForm.Meta):
+        fields = [
+            name for name in ProjectDetailForm.Meta.fields
+            if name not in ADMIN_ONLY_FIELDS and name not in ADMIN_MANAGED_FIELDS
+        ]
+
+
 class FileUploadForm(forms.ModelForm):
     """File upload form"""
     class Meta:
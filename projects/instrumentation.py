@@ -0,0 +1,293 @@
+"""
+Request-level performance instrumentation
+
+PerformanceMiddleware records, per view name, wall time, DB query count, DB
+time, template render time and response size. Each response gets a
+Server-Timing header. Samples feed an in-memory registry with a rolling
+window for percentiles and cumulative histograms for Prometheus. The
+registry is per process, so each gunicorn worker reports its own traffic.
+
+Template time is measured by InstrumentedDjangoTemplates (configured as the
+TEMPLATES backend) around each top-level render. It includes any queries
+the template triggers lazily.
+
+Queries are counted by a wrapper installed on every database connection,
+which adds to the metrics of the request in the current context. Async
+views run their queries in worker threads with their own connections; the
+context (and so the request's metrics) follows them there.
+"""
+import contextvars
+import threading
+import time
+from collections import deque
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.template import TemplateDoesNotExist
+from django.template.backends.django import DjangoTemplates, Template as DjangoTemplate, reraise
+
+
+# Upper bounds (milliseconds) of the request duration histogram
+DURATION_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+METRICS = ('wall_ms', 'queries', 'db_ms', 'template_ms', 'response_bytes')
+
+_current = contextvars.ContextVar('request_metrics', default=None)
+
+
+class RequestMetrics:
+    """Counters for the request being handled"""
+    __slots__ = ('queries', 'db_ms', 'template_ms')
+
+    def __init__(self):
+        self.queries = 0
+        self.db_ms = 0.0
+        self.template_ms = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        # connection.execute_wrapper hook: time every query
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_ms += (time.perf_counter() - started) * 1000
+
+
+def current_metrics():
+    return _current.get()
+
+
+def _count_query(execute, sql, params, many, context):
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    return metrics(execute, sql, params, many, context)
+
+
+def instrument_connection(sender, connection, **kwargs):
+    """connection_created receiver: attach the query counter to every new connection"""
+    if _count_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_count_query)
+
+
+connection_created.connect(instrument_connection)
+
+
+class ViewStats:
+    """Cumulative totals plus a rolling window of recent samples for one view"""
+
+    def __init__(self, window):
+        self.count = 0
+        self.totals = dict.fromkeys(METRICS, 0.0)
+        self.buckets = [0] * len(DURATION_BUCKETS_MS)
+        self.recent = deque(maxlen=window)
+
+    def add(self, sample):
+        self.count += 1
+        for name in METRICS:
+            self.totals[name] += sample[name]
+        for i, bound in enumerate(DURATION_BUCKETS_MS):
+            if sample['wall_ms'] <= bound:
+                self.buckets[i] += 1
+        self.recent.append(sample)
+
+    def summary(self):
+        samples = list(self.recent)
+        walls = sorted(s['wall_ms'] for s in samples)
+        n = len(samples) or 1
+
+        def pct(p):
+            return walls[min(len(walls) - 1, int(len(walls) * p))] if walls else 0
+
+        return {
+            'count': self.count,
+            'window': len(samples),
+            'p50_ms': pct(0.50),
+            'p95_ms': pct(0.95),
+            'p99_ms': pct(0.99),
+            'max_ms': walls[-1] if walls else 0,
+            'avg_queries': sum(s['queries'] for s in samples) / n,
+            'max_queries': max((s['queries'] for s in samples), default=0),
+            'avg_db_ms': sum(s['db_ms'] for s in samples) / n,
+            'avg_template_ms': sum(s['template_ms'] for s in samples) / n,
+            'avg_response_bytes': sum(s['response_bytes'] for s in samples) / n,
+        }
+
+
+class MetricsRegistry:
+    """Thread-safe in-process store of ViewStats keyed by view name"""
+
+    def __init__(self, window=500):
+        self.window = window
+        self.started_at = time.time()
+        self._views = {}
+        self._lock = threading.Lock()
+
+    def record(self, view_name, sample):
+        with self._lock:
+            stats = self._views.get(view_name)
+            if stats is None:
+                stats = self._views[view_name] = ViewStats(self.window)
+            stats.add(sample)
+
+    def summaries(self):
+        with self._lock:
+            return sorted(
+                ({'view': name, **stats.summary()} for name, stats in self._views.items()),
+                key=lambda row: row['p95_ms'] * row['count'],
+                reverse=True,
+            )
+
+    def reset(self):
+        with self._lock:
+            self._views.clear()
+            self.started_at = time.time()
+
+    def prometheus(self, prefix='wedding_portal'):
+        """Render cumulative metrics in the Prometheus text exposition format"""
+        with self._lock:
+            views = [(name, stats.count, dict(stats.totals), list(stats.buckets))
+                     for name, stats in sorted(self._views.items())]
+
+        lines = [
+            f'# HELP {prefix}_request_duration_seconds Wall time of requests by view',
+            f'# TYPE {prefix}_request_duration_seconds histogram',
+        ]
+        for name, count, totals, buckets in views:
+            label = f'view="{_escape_label(name)}"'
+            for bound, value in zip(DURATION_BUCKETS_MS, buckets):
+                lines.append(f'{prefix}_request_duration_seconds_bucket{{{label},le="{bound / 1000:g}"}} {value}')
+            lines.append(f'{prefix}_request_duration_seconds_bucket{{{label},le="+Inf"}} {count}')
+            lines.append(f'{prefix}_request_duration_seconds_sum{{{label}}} {totals["wall_ms"] / 1000:.6f}')
+            lines.append(f'{prefix}_request_duration_seconds_count{{{label}}} {count}')
+
+        counters = (
+            ('db_queries_total', 'Database queries executed by view', 'queries', 1),
+            ('db_time_seconds_total', 'Time spent in database queries by view', 'db_ms', 1000),
+            ('template_render_seconds_total', 'Time spent rendering templates by view', 'template_ms', 1000),
+            ('response_bytes_total', 'Response body bytes by view', 'response_bytes', 1),
+        )
+        for metric, help_text, key, divisor in counters:
+            lines.append(f'# HELP {prefix}_{metric} {help_text}')
+            lines.append(f'# TYPE {prefix}_{metric} counter')
+            for name, count, totals, buckets in views:
+                value = totals[key] / divisor
+                lines.append(f'{prefix}_{metric}{{view="{_escape_label(name)}"}} {value:g}')
+        return '\n'.join(lines) + '\n'
+
+
+def _escape_label(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+registry = MetricsRegistry(window=getattr(settings, 'PERFORMANCE_WINDOW', 500))
+
+
+class PerformanceMiddleware:
+    """Measure each request and add a Server-Timing header; place it first in MIDDLEWARE"""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'PERFORMANCE_INSTRUMENTATION', True)
+        self.server_timing = getattr(settings, 'PERFORMANCE_SERVER_TIMING', 'admin')
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)  # Stay async under ASGI so async views keep the event loop
+        for connection in connections.all(initialized_only=True):
+            instrument_connection(None, connection)  # Opened before this module was imported
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.enabled:
+            return self.get_response(request)
+
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        user = getattr(request, 'user', None) if self.server_timing == 'admin' else None
+        self.finish(request, response, metrics, started, user)
+        return response
+
+    async def __acall__(self, request):
+        if not self.enabled:
+            return await self.get_response(request)
+
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        # request.user is lazy and would query synchronously; auser() is cached per request
+        user = await request.auser() if self.server_timing == 'admin' and hasattr(request, 'auser') else None
+        self.finish(request, response, metrics, started, user)
+        return response
+
+    def finish(self, request, response, metrics, started, user):
+        """Record the request's sample and add the Server-Timing header"""
+        wall_ms = (time.perf_counter() - started) * 1000
+
+        match = getattr(request, 'resolver_match', None)
+        view_name = match.view_name if match else '<unresolved>'
+        if response.streaming:
+            response_bytes = int(response.get('Content-Length') or 0)
+        else:
+            response_bytes = len(response.content)
+
+        registry.record(view_name, {
+            'wall_ms': wall_ms,
+            'queries': metrics.queries,
+            'db_ms': metrics.db_ms,
+            'template_ms': metrics.template_ms,
+            'response_bytes': response_bytes,
+        })
+
+        if self.should_expose(user):
+            response['Server-Timing'] = (
+                f'app;dur={wall_ms:.1f}, '
+                f'db;dur={metrics.db_ms:.1f};desc="{metrics.queries} queries", '
+                f'tpl;dur={metrics.template_ms:.1f}'
+            )
+
+    def should_expose(self, user):
+        if self.server_timing == 'all':
+            return True
+        if self.server_timing == 'admin':
+            return bool(user and user.is_authenticated and user.is_admin())
+        return False
+
+
+class InstrumentedTemplate(DjangoTemplate):
+    """Template wrapper that adds its render time to the current request's metrics"""
+
+    def render(self, context=None, request=None):
+        metrics = _current.get()
+        if metrics is None:
+            return super().render(context, request)
+        started = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            metrics.template_ms += (time.perf_counter() - started) * 1000
+
+
+class InstrumentedDjangoTemplates(DjangoTemplates):
+    """DjangoTemplates backend returning InstrumentedTemplate objects"""
+
+    def from_string(self, template_code):
+        return InstrumentedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        try:
+            return InstrumentedTemplate(self.engine.get_template(template_name), self)
+        except TemplateDoesNotExist as exc:
+            reraise(exc, self)
@@ -0,0 +1,110 @@
+"""
+Logging helpers: structured formatting and a non-blocking queue handler
+
+Application code logs with %-style arguments and `extra` fields, e.g.
+
+    logger.info('Batch update saved', extra={'project': slug, 'fields': len(fields)})
+
+so nothing is formatted unless the record passes its logger's level. Levels
+and handlers are configured through LOGGING in settings.
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+
+# Attributes every LogRecord has; anything else came from `extra`
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+def record_fields(record):
+    """The `extra` fields attached to a log record"""
+    return {key: value for key, value in vars(record).items() if key not in _RECORD_ATTRS}
+
+
+class KeyValueFormatter(logging.Formatter):
+    """Standard format followed by the record's extra fields as key=value pairs"""
+
+    def format(self, record):
+        line = super().format(record)
+        fields = record_fields(record)
+        if not fields:
+            return line
+        pairs = ' '.join(f'{key}={value!r}' if isinstance(value, str) and ' ' in value else f'{key}={value}'
+                         for key, value in fields.items())
+        head, sep, tail = line.partition('\n')  # Keep tracebacks after the fields
+        return f'{head} {pairs}{sep}{tail}'
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line, for log shippers"""
+
+    def format(self, record):
+        payload = {
+            'time': self.formatTime(record, '%Y-%m-%dT%H:%M:%S'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            **{key: value for key, value in record_fields(record).items()},
+        }
+        if record.exc_info:
+            payload['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str)
+
+
+class BackgroundHandler(QueueHandler):
+    """
+    Put records on an in-memory queue and let a background thread pass them
+    to the `targets` handlers, so the request thread never waits on stderr or
+    a file. In LOGGING the targets are given as 'cfg://handlers.<name>'; as
+    dictConfig builds handlers in alphabetical order, their names must sort
+    before this handler's own name.
+    """
+
+    def __init__(self, targets=(), maxsize=10000):
+        super().__init__(queue.Queue(maxsize))
+        # Indexing (rather than iterating) is what makes dictConfig resolve cfg:// references
+        self.targets = [targets[i] for i in range(len(targets))]
+        for target in self.targets:
+            if not isinstance(target, logging.Handler):
+                raise ValueError(f'Target {target!r} must be a handler configured before the queue handler')
+        self._listener = None
+        self._listener_pid = None
+        self._start_lock = threading.Lock()
+
+    def _start(self):
+        with self._start_lock:
+            # A forked worker (gunicorn --preload) inherits the listener object but not its thread
+            if self._listener is None or self._listener_pid != os.getpid():
+                listener = QueueListener(self.queue, *self.targets, respect_handler_level=True)
+                listener.start()
+                self._listener = listener
+                self._listener_pid = os.getpid()
+                # Runs before logging's own exit hook (registered earlier), while the targets are open
+                atexit.register(self.stop)
+
+    def stop(self):
+        """Flush what is still queued to the targets and stop the background thread"""
+        with self._start_lock:
+            if self._listener is not None and self._listener_pid == os.getpid():
+                self._listener.stop()
+            self._listener = None
+            self._listener_pid = None
+        atexit.unregister(self.stop)
+
+    def enqueue(self, record):
+        if self._listener_pid != os.getpid():
+            self._start()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass  # Drop rather than block the request when logging can't keep up
+
+    def close(self):
+        # Also called by dictConfig when it replaces this handler
+        self.stop()
+        super().close()
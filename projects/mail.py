@@ -0,0 +1,51 @@
+"""
+Async email delivery for views served through asgi.py
+
+Django's SMTP backend blocks for the whole SMTP conversation, which with a
+slow relay means seconds per message. asend() talks SMTP with aiosmtplib
+on the event loop instead, so a view waiting for the relay holds no thread.
+Other EMAIL_BACKENDs (console in development, locmem in tests), or a
+missing aiosmtplib, fall back to the backend's own send() in a worker thread.
+"""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+try:
+    import aiosmtplib
+except ImportError:  # Optional; without it SMTP runs in a thread
+    aiosmtplib = None
+
+
+SMTP_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+
+
+def uses_async_smtp():
+    """True when asend() delivers over aiosmtplib rather than a worker thread"""
+    return aiosmtplib is not None and settings.EMAIL_BACKEND == SMTP_BACKEND
+
+
+async def asend(message, fail_silently=False):
+    """Send an EmailMessage; returns the number of messages sent (0 or 1) like EmailMessage.send()"""
+    if not message.recipients():
+        return 0
+    if not uses_async_smtp():
+        return await sync_to_async(message.send, thread_sensitive=False)(fail_silently=fail_silently)
+
+    try:
+        await aiosmtplib.send(
+            message.message(),
+            sender=message.from_email,
+            recipients=message.recipients(),
+            hostname=settings.EMAIL_HOST,
+            port=settings.EMAIL_PORT,
+            username=settings.EMAIL_HOST_USER or None,
+            password=settings.EMAIL_HOST_PASSWORD or None,
+            use_tls=settings.EMAIL_USE_SSL,
+            start_tls=settings.EMAIL_USE_TLS,
+            timeout=settings.EMAIL_TIMEOUT,
+        )
+    except (aiosmtplib.SMTPException, OSError):
+        if fail_silently:
+            return 0
+        raise
+    return 1
@@ -2,13 +2,12 @@
 Management command to backup the database
 Supports multiple formats: JSON, SQL dump, and SQLite file copy
 """
-import os
-import shutil
 from datetime import datetime
 from django.core.management.base import BaseCommand
-from django.core.management import call_command
 from django.conf import settings
+from django.utils import timezone
 from pathlib import Path
+from projects.backups import BACKUP_PREFIX, BackupCatalog, create_backup, get_backup_dir, prune_backups
 
 
 class Command(BaseCommand):
@@ -34,6 +33,16 @@ class Command(BaseCommand):
             default=None,
             help='Custom filename (without extension)'
         )
+        parser.add_argument(
+            '--no-prune',
+            action='store_true',
+            help='Skip the retention policy (settings.BACKUP_RETENTION) after the backup'
+        )
+        parser.add_argument(
+            '--reindex',
+            action='store_true',
+            help='Rebuild the backup catalog from the files on disk before backing up'
+        )
 
     def handle(self, *args, **options):
         backup_format = options['format']
@@ -44,7 +53,7 @@ class Command(BaseCommand):
         if output_dir:
             backup_dir = Path(output_dir)
         else:
-            backup_dir = Path(settings.BASE_DIR) / 'backups'
+            backup_dir = get_backup_dir()
         
         # Create backup directory if it doesn't exist
         backup_dir.mkdir(parents=True, exist_ok=True)
@@ -54,30 +63,25 @@ class Command(BaseCommand):
         if custom_filename:
             base_filename = custom_filename
         else:
-            base_filename = f'wedding_portal_backup_{timestamp}'
+            base_filename = f'{BACKUP_PREFIX}{timestamp}'
         
         self.stdout.write(self.style.SUCCESS(f'\n📦 Starting database backup...'))
         self.stdout.write(f'Backup directory: {backup_dir}\n')
         
+        catalog = BackupCatalog(backup_dir)
+        if options['reindex']:
+            catalog.reindex()
+            self.stdout.write(f'Catalog reindexed: {len(catalog.entries())} backup(s) on disk')
+        
         success_count = 0
         
         # JSON backup (Django dumpdata)
         if backup_format in ['json', 'both']:
-            json_file = backup_dir / f'{base_filename}.json'
-            self.stdout.write(f'Creating JSON backup: {json_file.name}...')
+            self.stdout.write(f'Creating JSON backup: {base_filename}.json...')
             try:
-                with open(json_file, 'w', encoding='utf-8') as f:
-                    call_command(
-                        'dumpdata',
-                        '--natural-foreign',
-                        '--natural-primary',
-                        '--indent', '2',
-                        stdout=f,
-                        exclude=['contenttypes', 'auth.permission', 'sessions.session']
-                    )
-                
-                file_size = json_file.stat().st_size / (1024 * 1024)  # Size in MB
-                self.stdout.write(self.style.SUCCESS(f'  ✓ JSON backup created: {file_size:.2f} MB'))
+                entry = create_backup('json', base_filename=base_filename, catalog=catalog)[0]
+                file_size = entry['size_bytes'] / (1024 * 1024)  # Size in MB
+                self.stdout.write(self.style.SUCCESS(f'  ✓ JSON backup created: {file_size:.2f} MB in {entry["duration_ms"]} ms'))
                 success_count += 1
             except Exception as e:
                 self.stdout.write(self.style.ERROR(f'  ✗ JSON backup failed: {str(e)}'))
@@ -87,41 +91,44 @@ class Command(BaseCommand):
             db_engine = settings.DATABASES['default']['ENGINE']
             
             if 'sqlite' in db_engine:
-                db_path = Path(settings.DATABASES['default']['NAME'])
-                if db_path.exists():
-                    sqlite_file = backup_dir / f'{base_filename}.sqlite3'
-                    self.stdout.write(f'Creating SQLite backup: {sqlite_file.name}...')
-                    try:
-                        shutil.copy2(db_path, sqlite_file)
-                        file_size = sqlite_file.stat().st_size / (1024 * 1024)  # Size in MB
-                        self.stdout.write(self.style.SUCCESS(f'  ✓ SQLite backup created: {file_size:.2f} MB'))
-                        success_count += 1
-                    except Exception as e:
-                        self.stdout.write(self.style.ERROR(f'  ✗ SQLite backup failed: {str(e)}'))
-                else:
-                    self.stdout.write(self.style.WARNING(f'  ⚠ Database file not found: {db_path}'))
+                self.stdout.write(f'Creating SQLite backup: {base_filename}.sqlite3...')
+                try:
+                    entry = create_backup('sqlite', base_filename=base_filename, catalog=catalog)[0]
+                    file_size = entry['size_bytes'] / (1024 * 1024)  # Size in MB
+                    self.stdout.write(self.style.SUCCESS(f'  ✓ SQLite backup created: {file_size:.2f} MB in {entry["duration_ms"]} ms'))
+                    success_count += 1
+                except FileNotFoundError as e:
+                    self.stdout.write(self.style.WARNING(f'  ⚠ {str(e)}'))
+                except Exception as e:
+                    self.stdout.write(self.style.ERROR(f'  ✗ SQLite backup failed: {str(e)}'))
             else:
                 self.stdout.write(self.style.WARNING(f'  ⚠ SQLite backup skipped (database engine: {db_engine})'))
                 if backup_format == 'sqlite':
                     self.stdout.write(self.style.ERROR('  ✗ Cannot create SQLite backup for non-SQLite database'))
         
+        # Retention policy
+        if not options['no_prune'] and success_count:
+            pruned = prune_backups(catalog=catalog)
+            if pruned:
+                self.stdout.write(f'🧹 Retention policy removed {len(pruned)} old backup file(s)')
+        
         # Summary
         self.stdout.write(self.style.SUCCESS(f'\n✅ Backup completed: {success_count} file(s) created'))
         self.stdout.write(f'Location: {backup_dir}\n')
         
         # List recent backups
-        self.list_recent_backups(backup_dir)
+        self.list_recent_backups(catalog)
     
-    def list_recent_backups(self, backup_dir):
+    def list_recent_backups(self, catalog):
         """List the 5 most recent backups"""
         try:
-            backups = sorted(backup_dir.glob('wedding_portal_backup_*'), key=lambda p: p.stat().st_mtime, reverse=True)
+            backups = catalog.entries()
             
             if backups:
                 self.stdout.write(self.style.SUCCESS('Recent backups:'))
                 for i, backup in enumerate(backups[:5], 1):
-                    size = backup.stat().st_size / (1024 * 1024)
-                    mtime = datetime.fromtimestamp(backup.stat().st_mtime)
-                    self.stdout.write(f'  {i}. {backup.name} ({size:.2f} MB) - {mtime.strftime("%Y-%m-%d %H:%M:%S")}')
+                    size = backup['size_bytes'] / (1024 * 1024)
+                    created_at = timezone.localtime(datetime.fromisoformat(backup['created_at']))
+                    self.stdout.write(f'  {i}. {backup["name"]} ({size:.2f} MB) - {created_at.strftime("%Y-%m-%d %H:%M:%S")}')
         except Exception as e:
             self.stdout.write(self.style.WARNING(f'Could not list backups: {str(e)}'))
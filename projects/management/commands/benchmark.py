@@ -0,0 +1,228 @@
+"""
+Management command to benchmark the portal's hot endpoints and record comparable results
+"""
+import itertools
+import json
+import logging
+import math
+import platform
+import statistics
+import tempfile
+import time
+from io import StringIO
+import django
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from projects.models import File, Project, User
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    index = max(0, math.ceil(p / 100 * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+class Command(BaseCommand):
+    help = ('Seed a scratch database at a given scale, drive the hot endpoints through the test client '
+            'and write p50/p95/p99 latency and query counts to JSON')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--projects',
+            type=int,
+            default=200,
+            help='Generated projects to seed (default: 200)'
+        )
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=50,
+            help='Measured requests per scenario (default: 50)'
+        )
+        parser.add_argument(
+            '--output',
+            type=str,
+            default=None,
+            help='Write results to this JSON file (default: benchmark-<timestamp>.json)'
+        )
+        parser.add_argument(
+            '--compare',
+            type=str,
+            default=None,
+            help='Previous results JSON to compare against'
+        )
+        parser.add_argument(
+            '--use-current-db',
+            action='store_true',
+            help='Run against the configured database instead of a scratch test database'
+        )
+
+    def handle(self, *args, **options):
+        if options['verbosity'] < 2:
+            logging.getLogger('projects').setLevel(logging.WARNING)  # Keep per-request INFO logs out of the report
+
+        old_name = None
+        if not options['use_current_db']:
+            self.stdout.write('🧪 Creating scratch database...')
+            old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+
+        try:
+            with tempfile.TemporaryDirectory() as media_root, override_settings(
+                ALLOWED_HOSTS=['*'],
+                EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+                MEDIA_ROOT=media_root if old_name else settings.MEDIA_ROOT,
+            ):
+                self.stdout.write(f'🌱 Seeding {options["projects"]} projects...')
+                call_command('seed_data', projects=options['projects'], stdout=StringIO())
+                results = self.run_scenarios(options['requests'])
+        finally:
+            if old_name:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        report = {
+            'meta': {
+                'created_at': timezone.now().isoformat(),
+                'revision': getattr(settings, 'RELEASE_VERSION', ''),
+                'database': connection.vendor,
+                'cache': settings.CACHES['default']['BACKEND'].rsplit('.', 1)[-1],
+                'projects': options['projects'],
+                'requests': options['requests'],
+                'python': platform.python_version(),
+                'django': django.get_version(),
+            },
+            'results': results,
+        }
+
+        output = options['output'] or f'benchmark-{timezone.now():%Y%m%d-%H%M%S}.json'
+        with open(output, 'w') as f:
+            json.dump(report, f, indent=2)
+        self.stdout.write(self.style.SUCCESS(f'\n✅ Results written to {output}'))
+
+        if options['compare']:
+            self.compare(options['compare'], results)
+
+    def scenarios(self):
+        """(name, user, method, url, payload) generators, one per endpoint and role"""
+        admin = User.objects.filter(role='ADMIN').order_by('pk').first()
+        client = User.objects.filter(email='seed-client-0@example.com').first()
+        if admin is None or client is None:
+            raise CommandError('Seeding did not create the benchmark users.')
+
+        client_projects = list(Project.objects.filter(user=client).values_list('slug', flat=True)[:20])
+        all_projects = list(Project.objects.values_list('slug', flat=True)[:20])
+        client_files = list(File.objects.filter(project__user=client).values_list('pk', flat=True)[:20])
+        counter = itertools.count()
+
+        def update(slugs, field):
+            for slug in itertools.cycle(slugs):
+                yield 'post', reverse('update_project_field', args=[slug]), {
+                    'field_name': field, 'field_value': f'Benchmark value {next(counter)}'
+                }
+
+        def batch(slugs, payload):
+            for slug in itertools.cycle(slugs):
+                n = next(counter)
+                yield 'post', reverse('batch_update_project', args=[slug]), {
+                    key: (f'{value} {n}' if isinstance(value, str) else value) for key, value in payload.items()
+                }
+
+        def get(urls):
+            for url in itertools.cycle(urls):
+                yield 'get', url, None
+
+        return [
+            ('dashboard[admin]', admin, get([reverse('dashboard')])),
+            ('dashboard[client]', client, get([reverse('dashboard')])),
+            ('project_detail[admin]', admin, get([reverse('project_detail', args=[s]) for s in all_projects])),
+            ('project_detail[client]', client, get([reverse('project_detail', args=[s]) for s in client_projects])),
+            ('update_project_field[admin]', admin, update(all_projects, 'notes')),
+            ('update_project_field[client]', client, update(client_projects, 'city')),
+            ('batch_update_project[admin]', admin, batch(all_projects, {'package_4k': True, 'team_operator': 1, 'notes': 'Batch'})),
+            ('batch_update_project[client]', client, batch(client_projects, {'notes': 'Batch', 'city': 'Brasov'})),
+            ('get_field_history[client]', client, get([reverse('get_field_history', args=[s, 'notes']) for s in client_projects])),
+            ('download_file[client]', client, get([reverse('download_file', args=[pk]) for pk in client_files])),
+        ]
+
+    def run_scenarios(self, requests):
+        """
+        Each scenario twice: 'cold' clears the cache before every request, so its
+        query counts are what the database serves; 'warm' keeps it
+        """
+        results = {}
+        for (scenario, user, requests_iter), cache_mode in itertools.product(self.scenarios(), ('cold', 'warm')):
+            name = f'{scenario} {cache_mode}'
+            http = Client()
+            http.force_login(user)
+            latencies, query_counts = [], []
+
+            for i in range(requests + 1):
+                method, url, payload = next(requests_iter)
+                if cache_mode == 'cold':
+                    cache.clear()  # Sessions still load, from the database (cached_db)
+                with CaptureQueriesContext(connection) as queries:
+                    started = time.perf_counter()
+                    if method == 'post':
+                        response = http.post(url, data=json.dumps(payload), content_type='application/json')
+                    else:
+                        response = http.get(url)
+                    if response.streaming:
+                        b''.join(response.streaming_content)
+                    response.close()
+                    elapsed = (time.perf_counter() - started) * 1000
+
+                if response.status_code >= 400:
+                    raise CommandError(f'{name}: {method.upper()} {url} returned {response.status_code}')
+                if i == 0:
+                    continue  # Warm-up request: templates, connection and, for 'warm', caches
+                latencies.append(elapsed)
+                query_counts.append(len(queries.captured_queries))
+
+            latencies.sort()
+            results[name] = {
+                'requests': len(latencies),
+                'p50_ms': round(percentile(latencies, 50), 2),
+                'p95_ms': round(percentile(latencies, 95), 2),
+                'p99_ms': round(percentile(latencies, 99), 2),
+                'mean_ms': round(statistics.mean(latencies), 2),
+                'max_ms': round(latencies[-1], 2),
+                'queries_median': statistics.median(query_counts),
+                'queries_max': max(query_counts),
+            }
+            row = results[name]
+            self.stdout.write(
+                f'  {name:36} p50 {row["p50_ms"]:7.2f}  p95 {row["p95_ms"]:7.2f}  p99 {row["p99_ms"]:7.2f} ms'
+                f'  queries {row["queries_median"]:g} (max {row["queries_max"]})'
+            )
+        return results
+
+    def compare(self, path, results):
+        try:
+            with open(path) as f:
+                previous = json.load(f)['results']
+        except (OSError, ValueError, KeyError) as e:
+            raise CommandError(f'Cannot read {path}: {e}')
+
+        self.stdout.write(f'\n📊 Compared with {path} (p95 ms, median queries):')
+        for name, row in results.items():
+            old = previous.get(name)
+            if not old:
+                self.stdout.write(f'  {name:36} new scenario')
+                continue
+            change = (row['p95_ms'] - old['p95_ms']) / old['p95_ms'] * 100 if old['p95_ms'] else 0
+            line = (f'  {name:36} p95 {old["p95_ms"]:7.2f} → {row["p95_ms"]:7.2f} ({change:+.0f}%)'
+                    f'  queries {old["queries_median"]:g} → {row["queries_median"]:g}')
+            if row['queries_median'] > old['queries_median'] or change > 20:
+                self.stdout.write(self.style.WARNING(line))
+            elif row['queries_median'] < old['queries_median'] or change < -20:
+                self.stdout.write(self.style.SUCCESS(line))
+            else:
+                self.stdout.write(line)
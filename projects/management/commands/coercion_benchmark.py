@@ -0,0 +1,72 @@
+"""
+Management command to measure field coercion throughput: the precompiled
+field schema against per-call model introspection
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from projects.models import Project, PACKAGE_PRESETS
+from projects.schema import FIELDS
+
+
+def legacy_coerce(field, value):
+    """How write paths coerced values before the field schema: inspect the field on every call"""
+    if field.__class__.__name__ == 'BooleanField':
+        if isinstance(value, str):
+            return value.lower() in ('true', '1', 'yes', 'on')
+        return value if isinstance(value, bool) else bool(value)
+
+    if field.__class__.__name__ == 'IntegerField':
+        try:
+            return int(value) if value != '' else 0
+        except (ValueError, TypeError):
+            raise ValueError(f'Invalid integer value for {field.name}')
+
+    if getattr(field, 'choices', None):
+        valid_choices = [choice[0] for choice in field.choices]
+        if value not in valid_choices and value != '':
+            raise ValueError('Invalid choice')
+    return value
+
+
+class Command(BaseCommand):
+    help = 'Compare values coerced per second by the field schema and by per-call field introspection'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=20000,
+            help='Times the payload is coerced per engine (default: 20000)'
+        )
+
+    def handle(self, *args, **options):
+        # A package preset as the page's batch update sends it, plus typical single-field edits
+        payload = dict(PACKAGE_PRESETS['Cinema'])
+        payload.update({'status': 'Editing', 'city': 'Sibiu', 'price': '1500', 'price_currency': 'EUR'})
+        iterations = options['iterations']
+        values = iterations * len(payload)
+        self.stdout.write(f'⏱  Coercing {len(payload)} fields x {iterations} iterations')
+
+        def legacy():
+            for name, value in payload.items():
+                legacy_coerce(Project._meta.get_field(name), value)
+
+        def schema():
+            for name, value in payload.items():
+                FIELDS[name].coerce(value)
+
+        results = {}
+        for label, run in (('introspection', legacy), ('field schema', schema)):
+            run()  # Warm up
+            started = time.perf_counter()
+            for _ in range(iterations):
+                run()
+            elapsed = time.perf_counter() - started
+            results[label] = elapsed
+            self.stdout.write(f'  {label:14} {elapsed:6.3f}s  {values / elapsed:12,.0f} values/s  '
+                              f'{elapsed / values * 1e6:6.2f} µs/value')
+
+        speedup = results['introspection'] / results['field schema']
+        self.stdout.write(self.style.SUCCESS(f'📈 field schema: {speedup:.1f}x the introspection throughput'))
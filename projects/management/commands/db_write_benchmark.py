@@ -0,0 +1,186 @@
+"""
+Management command to measure concurrent write throughput of the configured database
+
+--compare is SQLite-only: it reruns the workload with the old rollback-journal
+pragmas on the same file. To compare SQLite with PostgreSQL, run the command
+once per DATABASE_ENGINE and pass the first run's --output as --baseline.
+The workload always uses the default connection, since the app's signal
+handlers (live events, calendar, cache) write through it.
+"""
+import json
+import statistics
+import threading
+import time
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connection, connections, transaction
+from django.test.utils import override_settings
+from django.utils import timezone
+from projects.db import sqlite_pragma_values
+from projects.models import Project, ProjectModification
+
+User = get_user_model()
+
+# What SQLite did before the tuned profile existed
+SQLITE_BASELINE_PRAGMAS = {'journal_mode': 'delete', 'synchronous': 'full'}
+
+
+class Command(BaseCommand):
+    help = ('Simulate concurrent client notes autosaves (ProjectModification insert + project update) '
+            'on the default database and report write throughput, latency and lock errors. '
+            '--compare is SQLite-only; compare engines with --output on one and --baseline on the other.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=8,
+            help='Concurrent writers, each with its own connection (default: 8)'
+        )
+        parser.add_argument(
+            '--seconds',
+            type=float,
+            default=10,
+            help='Duration of each run in seconds (default: 10)'
+        )
+        parser.add_argument(
+            '--compare',
+            action='store_true',
+            help='SQLite only: also run with the old rollback-journal settings and compare '
+                 '(ignored on other databases)'
+        )
+        parser.add_argument(
+            '--baseline',
+            type=str,
+            default=None,
+            help='Compare with the last profile of a JSON file written by --output, '
+                 'e.g. a SQLite run when benchmarking PostgreSQL'
+        )
+        parser.add_argument(
+            '--output',
+            type=str,
+            default=None,
+            help='Write the results as JSON to this file'
+        )
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options['baseline']:
+            with open(options['baseline']) as f:
+                baseline = json.load(f)[-1]  # The current profile of that run
+
+        vendor = connection.vendor
+        self.stdout.write(f'🗄  Database: {vendor} ({connection.settings_dict["NAME"]})')
+
+        user, project = self.create_fixture()
+        results = []
+        try:
+            if options['compare'] and vendor == 'sqlite':
+                with override_settings(SQLITE_PRAGMAS=SQLITE_BASELINE_PRAGMAS):
+                    connections.close_all()
+                    results.append(self.run('sqlite-baseline', project, user, options))
+                connections.close_all()
+            elif options['compare']:
+                self.stdout.write(self.style.WARNING(
+                    '⚠ --compare only applies to SQLite; running the current profile '
+                    '(use --baseline with a SQLite run\'s --output to compare engines).'
+                ))
+
+            results.append(self.run(f'{vendor}-current', project, user, options))
+        finally:
+            connections.close_all()
+            ProjectModification.objects.filter(project=project).delete()
+            project.delete()
+            user.delete()
+
+        if baseline is None and len(results) == 2:
+            baseline = results[0]
+        if baseline and baseline['writes_per_second']:
+            current = results[-1]
+            speedup = current['writes_per_second'] / baseline['writes_per_second']
+            self.stdout.write(self.style.SUCCESS(
+                f'\n📈 {current["profile"]}: {speedup:.1f}x the write throughput of {baseline["profile"]}'
+            ))
+            if baseline['workers'] != current['workers']:
+                self.stdout.write(self.style.WARNING(
+                    f'⚠ The baseline ran {baseline["workers"]} workers, this run {current["workers"]}.'
+                ))
+
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(results, f, indent=2)
+            self.stdout.write(f'Results written to {options["output"]}')
+
+    def create_fixture(self):
+        stamp = timezone.now().strftime('%Y%m%d%H%M%S%f')
+        user = User.objects.create_user(
+            username=f'db-bench-{stamp}', email=f'db-bench-{stamp}@example.invalid', role='CLIENT'
+        )
+        project = Project.objects.create(
+            name=f'DB benchmark {stamp}', client_name='Benchmark',
+            event_date=timezone.now(), type='NUNTA', user=user,
+        )
+        return user, project
+
+    def run(self, label, project, user, options):
+        deadline = time.monotonic() + options['seconds']
+        latencies = []
+        errors = []
+        lock = threading.Lock()
+
+        def writer(worker_id):
+            local_latencies = []
+            local_errors = 0
+            n = 0
+            try:
+                while time.monotonic() < deadline:
+                    n += 1
+                    value = f'worker {worker_id} edit {n}'
+                    started = time.perf_counter()
+                    try:
+                        with transaction.atomic():
+                            ProjectModification.objects.create(
+                                project=project, field_name='notes', old_value='',
+                                new_value=value, created_by=user, status='AUTO_APPLIED',
+                            )
+                            Project.objects.filter(pk=project.pk).update(notes=value, updated_at=timezone.now())
+                    except OperationalError:
+                        local_errors += 1
+                        continue
+                    local_latencies.append((time.perf_counter() - started) * 1000)
+            finally:
+                connection.close()  # Each thread owns its own connection
+                with lock:
+                    latencies.extend(local_latencies)
+                    errors.append(local_errors)
+
+        pragmas = sqlite_pragma_values(connection) if connection.vendor == 'sqlite' else {}
+        threads = [threading.Thread(target=writer, args=(i,)) for i in range(options['workers'])]
+        started = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - started
+
+        latencies.sort()
+        result = {
+            'profile': label,
+            'pragmas': pragmas,
+            'workers': options['workers'],
+            'seconds': round(elapsed, 2),
+            'writes': len(latencies),
+            'writes_per_second': round(len(latencies) / elapsed, 1) if elapsed else 0,
+            'lock_errors': sum(errors),
+            'p50_ms': round(statistics.median(latencies), 2) if latencies else None,
+            'p95_ms': round(latencies[int(len(latencies) * 0.95) - 1], 2) if len(latencies) >= 20 else None,
+            'max_ms': round(latencies[-1], 2) if latencies else None,
+        }
+
+        self.stdout.write(f'\n▶ {label}' + (f' {pragmas}' if pragmas else ''))
+        style = self.style.ERROR if result['lock_errors'] else self.style.SUCCESS
+        self.stdout.write(style(
+            f'  {result["writes"]} writes in {result["seconds"]}s = {result["writes_per_second"]} writes/s, '
+            f'p50 {result["p50_ms"]} ms, p95 {result["p95_ms"]} ms, {result["lock_errors"]} lock errors'
+        ))
+        return result
@@ -0,0 +1,148 @@
+"""
+Management command to move existing media (and optionally backups) to the configured storage
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.core.management.base import BaseCommand, CommandError
+from projects.backups import BackupCatalog, offload_backup
+from projects.models import File, FileBlob, FilePreview
+from projects.storage import get_backup_storage
+
+
+class Command(BaseCommand):
+    help = 'Copy media files from the local MEDIA_ROOT to the configured default storage (e.g. S3) in parallel'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--source-dir',
+            type=str,
+            default=None,
+            help='Local directory to copy from (default: MEDIA_ROOT)'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=8,
+            help='Number of parallel transfers (default: 8)'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='List what would be copied without transferring anything'
+        )
+        parser.add_argument(
+            '--delete-source',
+            action='store_true',
+            help='Delete local files after they were copied and verified'
+        )
+        parser.add_argument(
+            '--include-backups',
+            action='store_true',
+            help='Also offload catalogued backups to the backups storage'
+        )
+
+    def collect_names(self):
+        """Every storage name referenced by the database"""
+        names = set()
+        names.update(FileBlob.objects.values_list('file', flat=True))
+        names.update(File.objects.filter(blob__isnull=True).values_list('file', flat=True))
+        for poster, proxy in FilePreview.objects.values_list('poster', 'proxy'):
+            names.update([poster, proxy])
+        names.discard('')
+        names.discard(None)
+        return sorted(names)
+
+    def copy_one(self, source, target, name, delete_source):
+        """Copy a single file; returns (name, status, bytes)"""
+        if not source.exists(name):
+            return name, 'missing', 0
+
+        size = source.size(name)
+        if target.exists(name):
+            if target.size(name) == size:
+                if delete_source:
+                    source.delete(name)
+                return name, 'skipped', 0
+            target.delete(name)
+
+        with source.open(name, 'rb') as f:
+            saved_name = target.save(name, f)
+        if saved_name != name:
+            return name, f'renamed to {saved_name}', size
+        if target.size(name) != size:
+            return name, 'size mismatch', size
+
+        if delete_source:
+            source.delete(name)
+        return name, 'copied', size
+
+    def handle(self, *args, **options):
+        source_dir = Path(options['source_dir'] or settings.MEDIA_ROOT)
+        source = FileSystemStorage(location=source_dir)
+        target = default_storage
+
+        if isinstance(target, FileSystemStorage) and Path(target.location).resolve() == source_dir.resolve():
+            raise CommandError('Default storage is the local MEDIA_ROOT; set STORAGE_BACKEND=s3 first.')
+
+        names = self.collect_names()
+        self.stdout.write(f'📦 {len(names)} media files referenced, copying from {source_dir} '
+                          f'with {options["workers"]} workers...')
+
+        if options['dry_run']:
+            for name in names:
+                self.stdout.write(f'  {name}')
+        else:
+            started = time.monotonic()
+            totals = {'copied': 0, 'skipped': 0, 'missing': 0, 'failed': 0}
+            copied_bytes = 0
+
+            # Transfers are pure storage I/O (no DB access), so threads are safe here
+            with ThreadPoolExecutor(max_workers=options['workers']) as pool:
+                futures = {
+                    pool.submit(self.copy_one, source, target, name, options['delete_source']): name
+                    for name in names
+                }
+                for future in as_completed(futures):
+                    name = futures[future]
+                    try:
+                        name, status, size = future.result()
+                    except Exception as e:
+                        status, size = f'error: {e}', 0
+                    if status in totals:
+                        totals[status] += 1
+                    else:
+                        totals['failed'] += 1
+                        self.stdout.write(self.style.ERROR(f'  ✗ {name}: {status}'))
+                        continue
+                    copied_bytes += size
+                    if status == 'missing':
+                        self.stdout.write(self.style.WARNING(f'  ⚠ {name}: not found locally'))
+
+            elapsed = time.monotonic() - started
+            self.stdout.write(self.style.SUCCESS(
+                f'\n✅ Copied {totals["copied"]} ({copied_bytes / (1024 * 1024):.1f} MB in {elapsed:.1f}s), '
+                f'skipped {totals["skipped"]} already present, {totals["missing"]} missing, {totals["failed"]} failed.'
+            ))
+
+        if options['include_backups']:
+            self.offload_backups(options['dry_run'])
+
+    def offload_backups(self, dry_run):
+        storage = get_backup_storage()
+        if storage is None:
+            self.stdout.write(self.style.WARNING('⚠ No backups storage configured; skipping backups.'))
+            return
+
+        catalog = BackupCatalog()
+        pending = [entry for entry in catalog.entries() if not entry.get('remote')]
+        self.stdout.write(f'\n🗄  {len(pending)} backups to offload...')
+        for entry in pending:
+            if dry_run:
+                self.stdout.write(f'  {entry["name"]}')
+                continue
+            entry['remote'] = offload_backup(catalog.backup_dir / entry['name'], storage=storage)
+            catalog.add(entry)
+            self.stdout.write(self.style.SUCCESS(f'  ✓ {entry["name"]}'))
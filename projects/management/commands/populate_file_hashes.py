@@ -0,0 +1,84 @@
+"""
+Management command to hash existing uploads and merge duplicate content
+"""
+import hashlib
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F
+from projects.models import File, FileBlob
+
+
+class Command(BaseCommand):
+    help = 'Compute SHA-256 hashes for files uploaded before hashing existed and deduplicate identical content'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report duplicates, do not change anything'
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        files = File.objects.filter(blob__isnull=True).order_by('created_at')
+        count = files.count()
+
+        if count == 0:
+            self.stdout.write(self.style.SUCCESS('All files are already hashed.'))
+            return
+
+        self.stdout.write(f'Hashing {count} files...')
+
+        hashed = 0
+        duplicates = 0
+        reclaimed_bytes = 0
+        seen = {}  # sha256 -> first stored name (dry run only)
+
+        for file in files.iterator():
+            if not file.file or not file.file.storage.exists(file.file.name):
+                self.stdout.write(self.style.WARNING(f'  ⚠ {file.display_name}: stored file missing, skipping'))
+                continue
+
+            digest = hashlib.sha256()
+            with file.file.open('rb') as f:
+                for chunk in f.chunks():
+                    digest.update(chunk)
+            sha256 = digest.hexdigest()
+
+            existing = FileBlob.objects.filter(sha256=sha256).first()
+            original_name = existing.file.name if existing else seen.get(sha256)
+            if original_name and original_name != file.file.name:
+                duplicates += 1
+                reclaimed_bytes += file.size_bytes
+                self.stdout.write(f'  ↺ {file.display_name}: duplicate of {original_name}')
+
+            if dry_run:
+                seen.setdefault(sha256, file.file.name)
+                continue
+
+            with transaction.atomic():
+                old_name = file.file.name
+                if existing:
+                    FileBlob.objects.filter(pk=existing.pk).update(ref_count=F('ref_count') + 1)
+                    blob = existing
+                else:
+                    # Adopt the file's current path as the blob, no copy needed
+                    blob = FileBlob.objects.create(
+                        sha256=sha256, file=old_name, size_bytes=file.size_bytes, ref_count=1
+                    )
+
+                File.objects.filter(pk=file.pk).update(blob=blob, sha256=sha256, file=blob.file.name)
+
+                if blob.file.name != old_name:
+                    storage = file.file.storage
+                    transaction.on_commit(lambda storage=storage, name=old_name: storage.delete(name))
+            hashed += 1
+
+        if dry_run:
+            self.stdout.write(self.style.SUCCESS(
+                f'\nDry run: {duplicates} duplicate files ({reclaimed_bytes / (1024 * 1024):.2f} MB) would be merged.'
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f'\nHashed {hashed} files, merged {duplicates} duplicates ({reclaimed_bytes / (1024 * 1024):.2f} MB reclaimed).'
+            ))
@@ -0,0 +1,64 @@
+"""
+Management command (worker) to generate video posters and preview proxies
+"""
+import time
+from django.core.management.base import BaseCommand
+from projects.media import claim_pending_previews, ffmpeg_binary, generate_preview
+
+
+class Command(BaseCommand):
+    help = 'Generate poster thumbnails and low-bitrate preview proxies for uploaded videos (requires ffmpeg)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=10,
+            help='Maximum number of videos to process per batch (default: 10)'
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running and poll for new uploads'
+        )
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=30,
+            help='Seconds between polls in --loop mode (default: 30)'
+        )
+        parser.add_argument(
+            '--retry',
+            action='store_true',
+            help='Also retry previews that previously failed or were skipped'
+        )
+
+    def handle(self, *args, **options):
+        statuses = ('PENDING', 'FAILED', 'SKIPPED') if options['retry'] else ('PENDING',)
+
+        if not ffmpeg_binary():
+            self.stdout.write(self.style.WARNING(
+                '⚠ ffmpeg not found: pending previews will be marked as skipped. '
+                'Install ffmpeg (or set FFMPEG_BINARY) and rerun with --retry.'
+            ))
+
+        while True:
+            previews = claim_pending_previews(options['limit'], statuses=statuses)
+            for preview in previews:
+                self.stdout.write(f'🎬 Processing {preview.file.display_name}...')
+                started = time.monotonic()
+                status = generate_preview(preview)
+                elapsed = time.monotonic() - started
+                if status == 'READY':
+                    self.stdout.write(self.style.SUCCESS(f'  ✓ Preview ready ({elapsed:.1f}s)'))
+                elif status == 'SKIPPED':
+                    self.stdout.write(self.style.WARNING(f'  ⚠ Skipped: {preview.error}'))
+                else:
+                    self.stdout.write(self.style.ERROR(f'  ✗ Failed: {preview.error}'))
+
+            if not options['loop']:
+                self.stdout.write(self.style.SUCCESS(f'Processed {len(previews)} video(s).'))
+                return
+            # Only sleep when the queue is drained
+            if len(previews) < options['limit']:
+                time.sleep(options['interval'])
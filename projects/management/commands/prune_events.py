@@ -0,0 +1,29 @@
+"""
+Management command to delete old live-update events (see projects/events.py)
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from projects.models import ProjectEvent
+
+
+class Command(BaseCommand):
+    help = 'Delete live-update events older than EVENT_RETENTION_HOURS'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--hours',
+            type=int,
+            default=settings.EVENT_RETENTION_HOURS,
+            help='Keep events from the last N hours (default: EVENT_RETENTION_HOURS)',
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=options['hours'])
+        deleted, _ = ProjectEvent.objects.filter(created_at__lt=cutoff).delete()
+        self.stdout.write(self.style.SUCCESS(
+            f'🧹 Deleted {deleted} events older than {options["hours"]} hours.'
+        ))
@@ -0,0 +1,14 @@
+"""
+Management command to rebuild the production calendar from the projects
+"""
+from django.core.management.base import BaseCommand
+from projects.timeline import rebuild_calendar
+
+
+class Command(BaseCommand):
+    help = 'Recompute the calendar entries (event days and editing due dates) of every active project'
+
+    def handle(self, *args, **options):
+        self.stdout.write('Rebuilding production calendar...')
+        entries = rebuild_calendar()
+        self.stdout.write(self.style.SUCCESS(f'✅ Wrote {entries} calendar entries.'))
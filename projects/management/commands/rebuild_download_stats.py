@@ -0,0 +1,16 @@
+"""
+Management command to rebuild the download rollup tables from FileDownloadEvent
+"""
+from django.core.management.base import BaseCommand
+from projects.analytics import rebuild_download_stats
+
+
+class Command(BaseCommand):
+    help = 'Recompute per-file, per-project and monthly download stats from the download event log'
+
+    def handle(self, *args, **options):
+        self.stdout.write('Rebuilding download stats...')
+        files, projects, months = rebuild_download_stats()
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Rebuilt stats for {files} files, {projects} projects and {months} project-months.'
+        ))
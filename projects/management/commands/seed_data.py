@@ -1,16 +1,74 @@
+import hashlib
+import random
 from django.core.management.base import BaseCommand
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.db.models import F
 from django.utils import timezone
 from datetime import timedelta
-from projects.models import Project
+from projects.analytics import rebuild_download_stats
+from projects.cache import invalidate
+from projects.models import FieldHistory, File, FileBlob, FileDownloadEvent, Project, ProjectModification
+from projects.timeline import rebuild_calendar
 
 User = get_user_model()
 
 
 class Command(BaseCommand):
-    help = 'Seeds the database with initial data'
+    help = 'Seeds the database with initial data, optionally with generated projects at scale for benchmarks'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--projects',
+            type=int,
+            default=0,
+            help='Generated projects to ensure exist in addition to the samples (default: 0)'
+        )
+        parser.add_argument(
+            '--clients',
+            type=int,
+            default=10,
+            help='Client accounts the generated projects are spread over (default: 10)'
+        )
+        parser.add_argument(
+            '--modifications',
+            type=int,
+            default=10,
+            help='Modifications per generated project (default: 10)'
+        )
+        parser.add_argument(
+            '--history',
+            type=int,
+            default=5,
+            help='Field history entries per generated project (default: 5)'
+        )
+        parser.add_argument(
+            '--files',
+            type=int,
+            default=2,
+            help='Files per generated project (default: 2)'
+        )
+        parser.add_argument(
+            '--downloads',
+            type=int,
+            default=3,
+            help='Download events per generated file (default: 3)'
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=42,
+            help='Random seed, so generated data is identical between runs (default: 42)'
+        )
 
     def handle(self, *args, **options):
+        self.seed_samples()
+        if options['projects'] > 0:
+            self.seed_scale(options)
+
+    def seed_samples(self):
         self.stdout.write('Seeding database...')
         
         # Create admin user
@@ -122,3 +180,118 @@ class Command(BaseCommand):
                 self.stdout.write(self.style.SUCCESS(f'Created project: {project.name}'))
         
         self.stdout.write(self.style.SUCCESS('Database seeding completed!'))
+
+    @transaction.atomic
+    def seed_scale(self, options):
+        """Bulk-create generated projects with modifications, history, files and downloads"""
+        rng = random.Random(options['seed'])
+        admin = User.objects.filter(role='ADMIN').order_by('pk').first()
+        existing = Project.objects.filter(slug__contains='(seed-').count()
+        missing = options['projects'] - existing
+        if missing <= 0:
+            self.stdout.write(f'{existing} generated projects already present.')
+            return
+
+        self.stdout.write(f'Generating {missing} projects...')
+        password = make_password('client123')
+        clients = []
+        for i in range(max(options['clients'], 1)):
+            client, _ = User.objects.get_or_create(
+                email=f'seed-client-{i}@example.com',
+                defaults={
+                    'username': f'seed-client-{i}', 'first_name': f'Client{i}', 'last_name': 'Seed',
+                    'role': 'CLIENT', 'password': password,
+                }
+            )
+            clients.append(client)
+
+        now = timezone.now()
+        types = [choice for choice, _ in Project.PROJECT_TYPE_CHOICES]
+        statuses = [choice for choice, _ in Project.STATUS_CHOICES]
+        edit_statuses = [choice for choice, _ in Project.EDIT_STATUS_CHOICES]
+        packages = [choice for choice, _ in Project.PACKAGE_TYPE_CHOICES]
+        paragraph = 'Lorem ipsum dolor sit amet, consectetur adipiscing elit. ' * 8
+
+        projects = []
+        for n in range(existing, existing + missing):
+            project_type = rng.choice(types)
+            event_date = now + timedelta(days=rng.randint(-365, 365), hours=rng.randint(9, 18))
+            client = clients[n % len(clients)]
+            projects.append(Project(
+                name=f'{project_type.title()} - Seed {n:05d}',
+                slug=f'{event_date:%Y-%m-%d}-{project_type.lower()}(seed-{n:05d})',
+                user=client,
+                client_name=client.get_full_name(),
+                client_email=client.email,
+                type=project_type,
+                status=rng.choice(statuses),
+                edit_status=rng.choice(edit_statuses),
+                event_date=event_date,
+                due_date=(event_date + timedelta(days=90)).date(),
+                city=rng.choice(['Bucharest', 'Cluj-Napoca', 'Timisoara', 'Iasi', 'Brasov']),
+                package_type=rng.choice(packages),
+                prep=paragraph, church=paragraph, session=paragraph, restaurant=paragraph,
+                details_extra=paragraph, editing_preferences=paragraph, notes=paragraph,
+            ))
+        projects = Project.objects.bulk_create(projects, batch_size=500)
+
+        fields = ['notes', 'city', 'church', 'restaurant', 'editing_preferences', 'package_type']
+        modification_statuses = ['PENDING', 'APPROVED', 'REJECTED', 'AUTO_APPLIED']
+        modifications, history = [], []
+        for project in projects:
+            active = {}  # Only the latest pending request per field stays active
+            for i in range(options['modifications']):
+                status = rng.choice(modification_statuses)
+                reviewed = status in ('APPROVED', 'REJECTED')
+                modification = ProjectModification(
+                    project=project, field_name=rng.choice(fields), old_value=paragraph[:120],
+                    new_value=f'Change {i} {paragraph[:80]}', status=status, created_by=project.user,
+                    approved_by=admin if reviewed else None, approved_at=now if reviewed else None,
+                    notes='Does not match the package' if status == 'REJECTED' else None,
+                )
+                if status == 'PENDING':
+                    if modification.field_name in active:
+                        active[modification.field_name].status = 'SUPERSEDED'
+                    active[modification.field_name] = modification
+                modifications.append(modification)
+            for i in range(options['history']):
+                history.append(FieldHistory(
+                    project=project, field_name=rng.choice(['notes', 'filming_details']),
+                    old_value=paragraph[:200], new_value=f'Revision {i} {paragraph[:200]}',
+                    edited_by=rng.choice([project.user, admin]),
+                ))
+        ProjectModification.objects.bulk_create(modifications, batch_size=1000)
+        FieldHistory.objects.bulk_create(history, batch_size=1000)
+
+        files = []
+        if options['files'] > 0:
+            # Every generated file shares one small blob, exactly as deduplicated uploads do
+            content = b'wedding-portal benchmark payload\n' * 2048
+            sha256 = hashlib.sha256(content).hexdigest()
+            blob, _ = FileBlob.objects.acquire(ContentFile(content, name='seed.bin'), sha256)
+            for project in projects:
+                for i in range(options['files']):
+                    files.append(File(
+                        project=project, display_name=f'Export {i + 1}.mp4', file=blob.file.name,
+                        size_bytes=blob.size_bytes, sha256=sha256, blob=blob, uploaded_by=admin,
+                    ))
+            files = File.objects.bulk_create(files, batch_size=1000)
+            FileBlob.objects.filter(pk=blob.pk).update(ref_count=F('ref_count') + len(files) - 1)
+
+        events = []
+        for file in files:
+            for i in range(options['downloads']):
+                events.append(FileDownloadEvent(
+                    file=file, project=file.project,
+                    downloaded_by=file.project.user if i % 2 == 0 else admin,
+                ))
+        FileDownloadEvent.objects.bulk_create(events, batch_size=1000)
+        if events:
+            rebuild_download_stats()
+
+        rebuild_calendar()
+        invalidate('projects', 'users')  # bulk_create sends no signals
+        self.stdout.write(self.style.SUCCESS(
+            f'Generated {len(projects)} projects, {len(modifications)} modifications, {len(history)} history entries, '
+            f'{len(files)} files and {len(events)} downloads.'
+        ))
@@ -0,0 +1,91 @@
+"""
+Management command to compare dashboard throughput across session/auth configurations
+"""
+import time
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from projects.models import User
+
+PROFILES = {
+    # What every request did before cached sessions: session SELECT + user SELECT
+    'db': {
+        'SESSION_ENGINE': 'django.contrib.sessions.backends.db',
+        'AUTHENTICATION_BACKENDS': ['django.contrib.auth.backends.ModelBackend'],
+    },
+    'cached_db': {
+        'SESSION_ENGINE': 'django.contrib.sessions.backends.cached_db',
+        'AUTHENTICATION_BACKENDS': ['projects.auth.CachedModelBackend'],
+    },
+    'signed_cookies': {
+        'SESSION_ENGINE': 'django.contrib.sessions.backends.signed_cookies',
+        'AUTHENTICATION_BACKENDS': ['projects.auth.CachedModelBackend'],
+    },
+}
+
+
+class Command(BaseCommand):
+    help = 'Measure dashboard requests per second and queries per request for each session backend'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=300,
+            help='Requests per profile (default: 300)'
+        )
+        parser.add_argument(
+            '--email',
+            type=str,
+            default=None,
+            help='User to request the dashboard as (default: first admin)'
+        )
+        parser.add_argument(
+            '--profiles',
+            nargs='+',
+            choices=list(PROFILES),
+            default=list(PROFILES),
+            help='Profiles to run (default: all)'
+        )
+
+    def handle(self, *args, **options):
+        if options['email']:
+            user = User.objects.filter(email=options['email']).first()
+        else:
+            user = User.objects.filter(role='ADMIN').first()
+        if user is None:
+            raise CommandError('No user to benchmark with; run seed_data or pass --email.')
+
+        url = reverse('dashboard')
+        self.stdout.write(f'⏱  {options["requests"]} requests to {url} as {user.email} '
+                          f'(cache: {settings.CACHES["default"]["BACKEND"].rsplit(".", 1)[-1]})')
+
+        results = {}
+        for name in options['profiles']:
+            with override_settings(ALLOWED_HOSTS=['*'], **PROFILES[name]):
+                cache.clear()
+                client = Client()
+                client.force_login(user)
+                client.get(url)  # Warm up the cache, middleware and templates
+
+                with CaptureQueriesContext(connection) as queries:
+                    started = time.perf_counter()
+                    for _ in range(options['requests']):
+                        response = client.get(url)
+                        if response.status_code != 200:
+                            raise CommandError(f'{name}: dashboard returned {response.status_code}')
+                    elapsed = time.perf_counter() - started
+
+            rps = options['requests'] / elapsed
+            per_request = len(queries.captured_queries) / options['requests']
+            results[name] = rps
+            self.stdout.write(f'  {name:15} {rps:8.1f} req/s  {per_request:5.1f} queries/request')
+
+        if 'db' in results:
+            for name, rps in results.items():
+                if name != 'db':
+                    self.stdout.write(self.style.SUCCESS(f'📈 {name}: {rps / results["db"]:.2f}x the db baseline'))
@@ -0,0 +1,175 @@
+"""
+Management command to compare notify_client concurrency under WSGI threads and ASGI
+against a deliberately slow local SMTP server
+"""
+import asyncio
+import json
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient, Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from projects.mail import uses_async_smtp
+from projects.models import Project, User
+
+
+class SlowSMTPServer:
+    """Minimal SMTP server on localhost that waits `delay` seconds before accepting each message"""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.messages = 0
+        self.active = 0
+        self.peak = 0
+        self.loop = asyncio.new_event_loop()
+        self.server = self.loop.run_until_complete(asyncio.start_server(self.session, '127.0.0.1', 0))
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+
+    async def session(self, reader, writer):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+
+        async def reply(line):
+            writer.write(line.encode() + b'\r\n')
+            await writer.drain()
+
+        try:
+            await reply('220 localhost slow SMTP stub')
+            while line := await reader.readline():
+                command = line.decode(errors='replace').strip().upper()
+                if command.startswith('EHLO'):
+                    await reply('250-localhost')
+                    await reply('250 8BITMIME')
+                elif command == 'DATA':
+                    await reply('354 End data with <CR><LF>.<CR><LF>')
+                    while await reader.readline() not in (b'.\r\n', b''):
+                        pass
+                    await asyncio.sleep(self.delay)  # The slow relay
+                    self.messages += 1
+                    await reply('250 OK queued')
+                elif command == 'QUIT':
+                    await reply('221 Bye')
+                    break
+                else:  # HELO, MAIL, RCPT, RSET, NOOP
+                    await reply('250 OK')
+        finally:
+            self.active -= 1
+            writer.close()
+
+
+class Command(BaseCommand):
+    help = 'Measure concurrent notify_client requests (SMTP-bound) under WSGI worker threads and under ASGI'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=20,
+            help='Concurrent notification requests per mode (default: 20)'
+        )
+        parser.add_argument(
+            '--delay',
+            type=float,
+            default=1.0,
+            help='Seconds the SMTP stub waits before accepting each message (default: 1.0)'
+        )
+        parser.add_argument(
+            '--threads',
+            type=int,
+            default=4,
+            help='Worker threads for the WSGI run, e.g. gunicorn --threads (default: 4)'
+        )
+        parser.add_argument(
+            '--modes',
+            nargs='+',
+            choices=['wsgi', 'asgi'],
+            default=['wsgi', 'asgi'],
+            help='Modes to run (default: both)'
+        )
+
+    def handle(self, *args, **options):
+        admin = User.objects.filter(role='ADMIN').first()
+        slugs = list(Project.objects.exclude(slug=None).values_list('slug', flat=True)[:options['requests']])
+        if admin is None or not slugs:
+            raise CommandError('Need an admin and at least one project; run seed_data first.')
+        # Spread requests over different projects so they don't queue on one row's write
+        urls = [reverse('notify_client', args=[slugs[i % len(slugs)]]) for i in range(options['requests'])]
+        body = json.dumps({'force': True})
+
+        with SlowSMTPServer(options['delay']) as smtp, override_settings(
+            ALLOWED_HOSTS=['*'],
+            EMAIL_BACKEND='django.core.mail.backends.smtp.EmailBackend',
+            EMAIL_HOST='127.0.0.1',
+            EMAIL_PORT=smtp.port,
+            EMAIL_HOST_USER='',
+            EMAIL_HOST_PASSWORD='',
+            EMAIL_USE_TLS=False,
+            EMAIL_USE_SSL=False,
+        ):
+            transport = 'aiosmtplib' if uses_async_smtp() else 'smtplib in a worker thread (aiosmtplib not installed)'
+            self.stdout.write(f'⏱  {len(urls)} concurrent notify_client requests, SMTP delay {options["delay"]:g}s, '
+                              f'ASGI transport: {transport}')
+
+            results = {}
+            for mode in options['modes']:
+                smtp.messages = smtp.peak = 0
+                started = time.perf_counter()
+                if mode == 'wsgi':
+                    statuses = self.run_wsgi(admin, urls, body, options['threads'])
+                    label = f'wsgi ({options["threads"]} threads)'
+                    ideal = math.ceil(len(urls) / options['threads']) * options['delay']
+                else:
+                    statuses = asyncio.run(self.run_asgi(admin, urls, body))
+                    label = 'asgi'
+                    ideal = options['delay']
+                elapsed = time.perf_counter() - started
+
+                failed = sum(status != 200 for status in statuses)
+                if failed:
+                    raise CommandError(f'{mode}: {failed} of {len(urls)} requests failed')
+                results[mode] = elapsed
+                self.stdout.write(
+                    f'  {label:18} {elapsed:6.2f}s  {len(urls) / elapsed:6.1f} req/s  '
+                    f'peak {smtp.peak} SMTP sessions  (SMTP-bound minimum {ideal:.2f}s)'
+                )
+
+        if len(results) == 2:
+            self.stdout.write(self.style.SUCCESS(f'📈 asgi: {results["wsgi"] / results["asgi"]:.1f}x the wsgi throughput'))
+
+    @staticmethod
+    def run_wsgi(admin, urls, body, threads):
+        """Each thread is a sync worker: it holds its request until SMTP answers"""
+        local = threading.local()
+
+        def request(url):
+            if not hasattr(local, 'client'):
+                local.client = Client()
+                local.client.force_login(admin)
+            return local.client.post(url, body, content_type='application/json').status_code
+
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            return list(pool.map(request, urls))
+
+    @staticmethod
+    async def run_asgi(admin, urls, body):
+        """All requests in flight at once on one event loop, as under uvicorn"""
+        client = AsyncClient()
+        await client.aforce_login(admin)
+        responses = await asyncio.gather(*(
+            client.post(url, body, content_type='application/json') for url in urls
+        ))
+        return [response.status_code for response in responses]
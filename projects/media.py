@@ -0,0 +1,248 @@
+"""
+Video preview pipeline: poster thumbnails and low-bitrate proxies via ffmpeg
+
+ffmpeg is optional. When it is not installed, previews are marked SKIPPED
+and the project page falls back to the plain download link.
+"""
+import json
+import mimetypes
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+from contextlib import contextmanager
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.files import File as DjangoFile
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import F, Q
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.http import content_disposition_header
+
+from .models import FilePreview
+
+
+VIDEO_EXTENSIONS = {'.mp4', '.mov', '.m4v', '.mkv', '.avi', '.mts', '.m2ts', '.webm', '.mxf'}
+RANGE_RE = re.compile(r'bytes=(\d*)-(\d*)$')
+
+
+def ffmpeg_binary():
+    """Return the ffmpeg executable path, or None if it is not installed"""
+    return shutil.which(getattr(settings, 'FFMPEG_BINARY', 'ffmpeg'))
+
+
+def ffprobe_binary():
+    return shutil.which(getattr(settings, 'FFPROBE_BINARY', 'ffprobe'))
+
+
+def is_video(name):
+    """Guess from the file name whether an upload is a video"""
+    ext = os.path.splitext(name or '')[1].lower()
+    if ext in VIDEO_EXTENSIONS:
+        return True
+    content_type, _ = mimetypes.guess_type(name or '')
+    return bool(content_type and content_type.startswith('video/'))
+
+
+@contextmanager
+def local_path(field_file):
+    """Yield a local filesystem path for a stored file, copying it out of remote storage if needed"""
+    try:
+        path = field_file.path
+    except NotImplementedError:
+        path = None
+    if path:
+        yield path
+        return
+
+    suffix = os.path.splitext(field_file.name)[1]
+    with tempfile.NamedTemporaryFile(suffix=suffix) as temp:
+        with field_file.open('rb') as src:
+            for chunk in src.chunks():
+                temp.write(chunk)
+        temp.flush()
+        yield temp.name
+
+
+def probe_duration(path):
+    """Return the media duration in seconds, or None if ffprobe is unavailable or fails"""
+    ffprobe = ffprobe_binary()
+    if not ffprobe:
+        return None
+    try:
+        result = subprocess.run(
+            [ffprobe, '-v', 'error', '-show_entries', 'format=duration', '-of', 'json', path],
+            capture_output=True, text=True, timeout=60, check=True,
+        )
+        return float(json.loads(result.stdout)['format']['duration'])
+    except (subprocess.SubprocessError, KeyError, ValueError, OSError):
+        return None
+
+
+def _run_ffmpeg(args, timeout):
+    result = subprocess.run(args, capture_output=True, text=True, timeout=timeout)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else 'ffmpeg failed')
+
+
+def generate_preview(preview):
+    """
+    Produce the poster and proxy for one FilePreview and update its status.
+    Returns the final status.
+    """
+    ffmpeg = ffmpeg_binary()
+    if not ffmpeg:
+        preview.status = 'SKIPPED'
+        preview.error = 'ffmpeg is not available on this host'
+        preview.processed_at = timezone.now()
+        preview.save(update_fields=['status', 'error', 'processed_at'])
+        return preview.status
+
+    height = getattr(settings, 'MEDIA_PREVIEW_HEIGHT', 480)
+    bitrate = getattr(settings, 'MEDIA_PREVIEW_BITRATE', '800k')
+    timeout = getattr(settings, 'MEDIA_PREVIEW_TIMEOUT', 3600)
+    base_name = f'{preview.file_id}_{preview.file.sha256[:12] if preview.file.sha256 else "preview"}'
+
+    try:
+        with local_path(preview.file.file) as source, tempfile.TemporaryDirectory() as work_dir:
+            duration = probe_duration(source)
+            poster_path = os.path.join(work_dir, f'{base_name}.jpg')
+            proxy_path = os.path.join(work_dir, f'{base_name}.mp4')
+
+            # Grab a frame a little into the video (first frames are often black)
+            seek = min(5.0, duration / 3) if duration else 1.0
+            _run_ffmpeg([
+                ffmpeg, '-y', '-v', 'error', '-ss', f'{seek:.2f}', '-i', source,
+                '-frames:v', '1', '-vf', f'scale=-2:{height}', poster_path,
+            ], timeout=300)
+
+            _run_ffmpeg([
+                ffmpeg, '-y', '-v', 'error', '-i', source,
+                '-vf', f'scale=-2:{height}', '-c:v', 'libx264', '-preset', 'veryfast',
+                '-b:v', bitrate, '-maxrate', bitrate, '-bufsize', '2M',
+                '-c:a', 'aac', '-b:a', '96k', '-movflags', '+faststart', proxy_path,
+            ], timeout=timeout)
+
+            for old_file in (preview.poster, preview.proxy):
+                if old_file:
+                    old_file.delete(save=False)
+            with open(poster_path, 'rb') as f:
+                preview.poster.save(os.path.basename(poster_path), DjangoFile(f), save=False)
+            with open(proxy_path, 'rb') as f:
+                preview.proxy.save(os.path.basename(proxy_path), DjangoFile(f), save=False)
+
+        preview.duration_seconds = duration
+        preview.status = 'READY'
+        preview.error = None
+    except Exception as e:
+        preview.status = 'FAILED'
+        preview.error = str(e)[:2000]
+
+    preview.processed_at = timezone.now()
+    preview.save()
+    return preview.status
+
+
+def claim_pending_previews(limit, statuses=('PENDING',)):
+    """
+    Atomically mark up to `limit` previews as PROCESSING and return them.
+    Previews left PROCESSING longer than MEDIA_PREVIEW_CLAIM_TIMEOUT (their
+    worker died or was killed) are claimed again too.
+    """
+    timeout = getattr(settings, 'MEDIA_PREVIEW_CLAIM_TIMEOUT', 2 * 3600)
+    stale = Q(status='PROCESSING') & (
+        Q(claimed_at__lt=timezone.now() - timedelta(seconds=timeout))
+        | Q(claimed_at__isnull=True)  # Claimed before claims were timestamped
+    )
+    claimable = Q(status__in=statuses) | stale
+    claimed = []
+    candidates = FilePreview.objects.filter(claimable).order_by('created_at').values_list('pk', flat=True)[:limit]
+    for pk in list(candidates):
+        # Conditional update so concurrent workers never process the same file
+        updated = FilePreview.objects.filter(claimable, pk=pk).update(
+            status='PROCESSING', claimed_at=timezone.now(), attempts=F('attempts') + 1
+        )
+        if updated:
+            claimed.append(pk)
+    return list(FilePreview.objects.filter(pk__in=claimed).select_related('file'))
+
+
+async def _aread_chunks(handle, length, chunk_size):
+    read = sync_to_async(handle.read, thread_sensitive=False)
+    remaining = length
+    try:
+        while remaining > 0:
+            data = await read(min(chunk_size, remaining))
+            if not data:
+                break
+            remaining -= len(data)
+            yield data
+    finally:
+        handle.close()
+
+
+def _read_chunks(handle, length, chunk_size):
+    remaining = length
+    try:
+        while remaining > 0:
+            data = handle.read(min(chunk_size, remaining))
+            if not data:
+                break
+            remaining -= len(data)
+            yield data
+    finally:
+        handle.close()
+
+
+def file_body(request, handle, length, chunk_size=256 * 1024):
+    """
+    Response body yielding `length` bytes from an open file handle.
+    Under ASGI it is an async iterator reading chunks in worker threads:
+    Django would otherwise read a sync iterator into memory in one go.
+    """
+    if isinstance(request, ASGIRequest):
+        return _aread_chunks(handle, length, chunk_size)
+    return _read_chunks(handle, length, chunk_size)
+
+
+def ranged_file_response(request, field_file, content_type, filename=None):
+    """
+    Serve a stored file with single-range HTTP Range support so browsers can
+    seek in video and resume downloads. With `filename` it is sent as an attachment.
+    """
+    size = field_file.size
+    range_header = request.headers.get('Range', '')
+    match = RANGE_RE.match(range_header.strip())
+
+    start, end, status = 0, size - 1, 200
+    if match:
+        start_str, end_str = match.groups()
+        if start_str:
+            start = int(start_str)
+            end = min(int(end_str), size - 1) if end_str else size - 1
+        else:
+            # Suffix range: last N bytes
+            start = max(size - int(end_str or 0), 0)
+        status = 206
+
+        if start > end or start >= size:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+
+    handle = field_file.open('rb')
+    handle.seek(start)
+    length = end - start + 1
+
+    response = StreamingHttpResponse(file_body(request, handle, length), status=status, content_type=content_type)
+    response['Content-Length'] = str(length)
+    if status == 206:
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    response['Accept-Ranges'] = 'bytes'
+    if filename:
+        response['Content-Disposition'] = content_disposition_header(True, filename)
+    return response
@@ -0,0 +1,81 @@
+# Generated by Django 5.0.2 on 2026-10-18 22:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0024_file_content_hash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FileDownloadStats',
+            fields=[
+                ('file', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='download_stats', serialize=False, to='projects.file')),
+                ('download_count', models.PositiveIntegerField(default=0)),
+                ('client_download_count', models.PositiveIntegerField(default=0)),
+                ('distinct_downloaders', models.PositiveIntegerField(default=0)),
+                ('first_downloaded_at', models.DateTimeField(blank=True, null=True)),
+                ('last_downloaded_at', models.DateTimeField(blank=True, null=True)),
+                ('last_client_download_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'File Download Stats',
+                'verbose_name_plural': 'File Download Stats',
+            },
+        ),
+        migrations.CreateModel(
+            name='ProjectDownloadMonth',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(help_text='First day of the month')),
+                ('download_count', models.PositiveIntegerField(default=0)),
+                ('client_download_count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['-month'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ProjectDownloadStats',
+            fields=[
+                ('project', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='download_stats', serialize=False, to='projects.project')),
+                ('download_count', models.PositiveIntegerField(default=0)),
+                ('client_download_count', models.PositiveIntegerField(default=0)),
+                ('files_downloaded_by_client', models.PositiveIntegerField(default=0)),
+                ('distinct_downloaders', models.PositiveIntegerField(default=0)),
+                ('first_downloaded_at', models.DateTimeField(blank=True, null=True)),
+                ('last_downloaded_at', models.DateTimeField(blank=True, null=True)),
+                ('last_client_download_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Project Download Stats',
+                'verbose_name_plural': 'Project Download Stats',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='filedownloadevent',
+            index=models.Index(fields=['file', 'downloaded_by'], name='projects_fi_file_id_54e635_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='filedownloadevent',
+            index=models.Index(fields=['project', 'downloaded_by'], name='projects_fi_project_3aff22_idx'),
+        ),
+        migrations.AddField(
+            model_name='filedownloadstats',
+            name='project',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='file_download_stats', to='projects.project'),
+        ),
+        migrations.AddField(
+            model_name='projectdownloadmonth',
+            name='project',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='download_months', to='projects.project'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='projectdownloadmonth',
+            unique_together={('project', 'month')},
+        ),
+    ]
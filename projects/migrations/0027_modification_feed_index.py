@@ -0,0 +1,17 @@
+# Generated by Django 5.0.2 on 2026-10-18 23:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0026_filepreview'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='projectmodification',
+            index=models.Index(fields=['project', 'status', 'created_at'], name='projects_pr_project_4364de_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.0.2 on 2026-10-18 23:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0027_modification_feed_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='fieldhistory',
+            index=models.Index(fields=['project', 'field_name', 'created_at'], name='projects_fi_project_a14ffe_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='projectmodification',
+            index=models.Index(fields=['project', 'field_name', 'created_at'], name='projects_pr_project_b38207_idx'),
+        ),
+    ]
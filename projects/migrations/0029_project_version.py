@@ -0,0 +1,18 @@
+# Generated by Django 5.0.2 on 2026-10-18 23:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0028_autosave_coalescing_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='version',
+            field=models.PositiveIntegerField(default=1, help_text='Row version for optimistic locking'),
+        ),
+    ]
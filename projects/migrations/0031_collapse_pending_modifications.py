@@ -0,0 +1,41 @@
+# Generated by Django 5.0.2 on 2026-10-18 23:32
+
+from django.db import migrations, models
+
+
+def supersede_earlier_pending(apps, schema_editor):
+    """Keep only the latest pending request per (project, field); the constraint requires it"""
+    ProjectModification = apps.get_model('projects', 'ProjectModification')
+    pending = ProjectModification.objects.filter(status='PENDING').order_by('-created_at', '-id')
+    seen, superseded = set(), []
+    for pk, project_id, field_name in pending.values_list('pk', 'project_id', 'field_name'):
+        if (project_id, field_name) in seen:
+            superseded.append(pk)
+        seen.add((project_id, field_name))
+    ProjectModification.objects.filter(pk__in=superseded).update(status='SUPERSEDED')
+
+
+def restore_superseded(apps, schema_editor):
+    """SUPERSEDED is not a status before this migration; such requests return to PENDING"""
+    ProjectModification = apps.get_model('projects', 'ProjectModification')
+    ProjectModification.objects.filter(status='SUPERSEDED').update(status='PENDING')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0030_project_events'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='projectmodification',
+            name='status',
+            field=models.CharField(choices=[('PENDING', 'Pending'), ('APPROVED', 'Approved'), ('REJECTED', 'Rejected'), ('AUTO_APPLIED', 'Auto Applied'), ('SUPERSEDED', 'Superseded')], default='PENDING', max_length=20),
+        ),
+        migrations.RunPython(supersede_earlier_pending, restore_superseded),
+        migrations.AddConstraint(
+            model_name='projectmodification',
+            constraint=models.UniqueConstraint(condition=models.Q(('status', 'PENDING')), fields=('project', 'field_name'), name='one_pending_modification_per_field'),
+        ),
+    ]
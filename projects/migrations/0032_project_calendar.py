@@ -0,0 +1,54 @@
+# Generated by Django 5.0.2 on 2026-10-18 23:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def fill_calendar(apps, schema_editor):
+    """Entries for the active projects that exist already"""
+    Project = apps.get_model('projects', 'Project')
+    ProjectCalendarEntry = apps.get_model('projects', 'ProjectCalendarEntry')
+    entries = []
+    for project in Project.objects.filter(is_archived=False).iterator():
+        copied = {
+            'project_id': project.pk, 'name': project.name, 'slug': project.slug, 'type': project.type,
+            'status': project.status, 'edit_status': project.edit_status,
+        }
+        entries.append(ProjectCalendarEntry(
+            kind='EVENT', day=timezone.localdate(project.event_date), starts_at=project.event_date, **copied
+        ))
+        if project.due_date:
+            entries.append(ProjectCalendarEntry(kind='DUE', day=project.due_date, **copied))
+    ProjectCalendarEntry.objects.bulk_create(entries, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0031_collapse_pending_modifications'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectCalendarEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('EVENT', 'Event'), ('DUE', 'Editing due')], max_length=10)),
+                ('day', models.DateField(help_text='Local date of the event or the due date')),
+                ('starts_at', models.DateTimeField(blank=True, help_text='Event start; empty for due dates', null=True)),
+                ('name', models.CharField(max_length=255)),
+                ('slug', models.SlugField(blank=True, max_length=255, null=True)),
+                ('type', models.CharField(max_length=10)),
+                ('status', models.CharField(max_length=50)),
+                ('edit_status', models.CharField(max_length=50)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='calendar_entries', to='projects.project')),
+            ],
+            options={
+                'ordering': ['day', 'kind'],
+                'indexes': [models.Index(fields=['day', 'kind'], name='projects_pr_day_698dcb_idx')],
+                'unique_together': {('project', 'kind')},
+            },
+        ),
+        migrations.RunPython(fill_calendar, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.0.2 on 2026-10-18 23:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0032_project_calendar'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(condition=models.Q(('is_archived', False), models.Q(('edit_status', 'Completed'), _negated=True)), fields=['due_date'], name='project_editing_queue'),
+        ),
+    ]
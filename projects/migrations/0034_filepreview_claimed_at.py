@@ -0,0 +1,18 @@
+# Generated by Django 5.0.2 on 2026-10-19 00:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0033_project_editing_queue'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='filepreview',
+            name='claimed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -1,8 +1,17 @@
+import json
+import logging
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from django.contrib.auth.models import AbstractUser, BaseUserManager
 from django.utils import timezone
 from django.utils.text import slugify
+from django.utils.translation import gettext_lazy as _
 import re
+from .cache import cached, invalidate
+from .policy import BOOKKEEPING_FIELDS
+from .uploads import blob_upload_path
+
+logger = logging.getLogger(__name__)
 
 
 class CustomUserManager(BaseUserManager):
@@ -45,8 +54,41 @@ class User(AbstractUser):
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['first_name']  # Remove username from required fields
     
+    # Shown on project cards: changing them invalidates the cached project lists (signals.py)
+    DISPLAY_FIELDS = ('first_name', 'last_name', 'email')
+    
+    # Session auth hashes (current, then SECRET_KEY_FALLBACKS) of users served
+    # from the cache (auth.py), which is never given the password hash
+    cached_session_hashes = None
+    
     objects = CustomUserManager()
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the loaded names so post_save can tell whether they changed
+        instance.loaded_display = instance.display_snapshot()
+        return instance
+    
+    def display_snapshot(self):
+        """Current values of the loaded DISPLAY_FIELDS"""
+        return {name: self.__dict__[name] for name in self.DISPLAY_FIELDS if name in self.__dict__}
+    
+    def _uses_cached_session_hashes(self):
+        # Until set_password() (or a read of the deferred column) loads a password
+        return bool(self.cached_session_hashes) and 'password' not in self.__dict__
+    
+    def get_session_auth_hash(self):
+        if self._uses_cached_session_hashes():
+            return self.cached_session_hashes[0]
+        return super().get_session_auth_hash()
+    
+    def get_session_auth_fallback_hash(self):
+        if self._uses_cached_session_hashes():
+            yield from self.cached_session_hashes[1:]
+        else:
+            yield from super().get_session_auth_fallback_hash()
+    
     def is_admin(self):
         return self.role == 'ADMIN'
     
@@ -71,6 +113,116 @@ class User(AbstractUser):
         super().save(*args, **kwargs)
 
 
+@cached('users')
+def get_admin_emails():
+    """Email addresses of all admin users (notification recipients)"""
+    return list(User.objects.filter(role='ADMIN').exclude(email='').values_list('email', flat=True))
+
+
+# Client guidance texts, keyed by Project.current_guidance_message
+GUIDANCE_MESSAGES = {
+    'initial': _("Please review all the details carefully and add or improve your preferences in the specific areas. Your input helps us create the perfect video for your special day."),
+    'planning': _("The project is now in planning phase. Please ensure all your preferences are clearly stated in each section."),
+    'filming': _("Filming is scheduled. Review the production details and add any last-minute requests or special moments you want captured."),
+    'editing': _("Your video is being edited. Check the editing preferences and package details to ensure they match your vision."),
+    'review': _("Your video is ready for review. Please provide detailed feedback in the appropriate sections."),
+    'completed': _("Your project is complete! Thank you for choosing us. Feel free to leave any final feedback."),
+}
+
+
+@cached('guidance', timeout=None, per_language=True)
+def get_guidance_messages():
+    """Guidance texts resolved in the active language"""
+    return {message_type: str(text) for message_type, text in GUIDANCE_MESSAGES.items()}
+
+
+# Package presets applied client-side when a package type is picked
+PACKAGE_PRESETS = {
+    'Clasic': {
+        'package_type': 'Clasic',
+        'package_4k': True, 'package_fullhd': False, 'package_cameras': 1,
+        'montage_highlights': True, 'montage_movie': True, 'montage_bonus_primary': False, 'montage_bonus_full': False,
+        'montage_movie_duration': '2h-3h', 'montage_cinema_duration': '1h30min',
+        'equipment_audio_recorder': True, 'equipment_stabilizer': True, 'equipment_external_light': False,
+        'team_videographer': 1, 'team_operator': 0, 'team_assistant': 0,
+        'delivery_online': True, 'delivery_usb': False
+    },
+    'Highlights': {
+        'package_type': 'Highlights',
+        'package_4k': True, 'package_fullhd': False, 'package_cameras': 2,
+        'montage_highlights': True, 'montage_movie': False, 'montage_bonus_primary': False, 'montage_bonus_full': True,
+        'montage_movie_duration': '', 'montage_cinema_duration': '1h',
+        'equipment_audio_recorder': True, 'equipment_stabilizer': True, 'equipment_external_light': True,
+        'team_videographer': 1, 'team_operator': 0, 'team_assistant': 1,
+        'delivery_online': True, 'delivery_usb': False
+    },
+    'Duo': {
+        'package_type': 'Duo',
+        'package_4k': True, 'package_fullhd': False, 'package_cameras': 2,
+        'montage_highlights': True, 'montage_movie': True, 'montage_bonus_primary': False, 'montage_bonus_full': False,
+        'montage_movie_duration': '3h-4h', 'montage_cinema_duration': '1h30min',
+        'equipment_audio_recorder': True, 'equipment_stabilizer': True, 'equipment_external_light': False,
+        'team_videographer': 1, 'team_operator': 1, 'team_assistant': 0,
+        'delivery_online': True, 'delivery_usb': False
+    },
+    'Cinema': {
+        'package_type': 'Cinema',
+        'package_4k': True, 'package_fullhd': False, 'package_cameras': 2,
+        'montage_highlights': True, 'montage_movie': False, 'montage_bonus_primary': True, 'montage_bonus_full': True,
+        'montage_movie_duration': '', 'montage_cinema_duration': '1h30min',
+        'equipment_audio_recorder': True, 'equipment_stabilizer': True, 'equipment_external_light': True,
+        'team_videographer': 2, 'team_operator': 0, 'team_assistant': 0,
+        'delivery_online': True, 'delivery_usb': False
+    },
+    'Creative': {
+        'package_type': 'Creative',
+        'package_4k': True, 'package_fullhd': False, 'package_cameras': 3,
+        'montage_highlights': True, 'montage_movie': True, 'montage_bonus_primary': False, 'montage_bonus_full': True,
+        'montage_movie_duration': '3h-4h', 'montage_cinema_duration': '1h30min',
+        'equipment_audio_recorder': True, 'equipment_stabilizer': True, 'equipment_external_light': True,
+        'team_videographer': 2, 'team_operator': 1, 'team_assistant': 0,
+        'delivery_online': True, 'delivery_usb': True
+    },
+    'Botez': {
+        'package_type': 'Botez',
+        'package_4k': True, 'package_fullhd': False, 'package_cameras': 1,
+        'montage_highlights': True, 'montage_movie': True, 'montage_bonus_primary': False, 'montage_bonus_full': False,
+        'montage_movie_duration': '2h-3h', 'montage_cinema_duration': '1h30min',
+        'equipment_audio_recorder': True, 'equipment_stabilizer': True, 'equipment_external_light': False,
+        'team_videographer': 1, 'team_operator': 0, 'team_assistant': 0,
+        'delivery_online': True, 'delivery_usb': False
+    },
+    'Custom': {
+        'package_type': 'Custom',
+        'package_4k': True, 'package_fullhd': False, 'package_cameras': 1,
+        'montage_highlights': False, 'montage_movie': False, 'montage_bonus_primary': False, 'montage_bonus_full': False,
+        'montage_movie_duration': '', 'montage_cinema_duration': '1h30min',
+        'equipment_audio_recorder': False, 'equipment_stabilizer': False, 'equipment_external_light': False,
+        'team_videographer': 1, 'team_operator': 0, 'team_assistant': 0,
+        'delivery_online': True, 'delivery_usb': False
+    }
+}
+
+
+@cached('packages', timeout=None)
+def get_package_presets_json():
+    """PACKAGE_PRESETS serialized for the project page"""
+    return json.dumps(PACKAGE_PRESETS)
+
+
+class ProjectQuerySet(models.QuerySet):
+    """Project queries shared by the views"""
+    
+    def for_list(self):
+        """
+        Projects for dashboard and archive cards: only Project.LIST_FIELDS and
+        the owner's name, so the long text columns are never read for lists
+        """
+        return self.select_related('user').only(
+            *self.model.LIST_FIELDS, 'user__username', 'user__first_name', 'user__last_name'
+        )
+
+
 class Project(models.Model):
     """Wedding video project model"""
     PROJECT_TYPE_CHOICES = [
@@ -95,6 +247,36 @@ class Project(models.Model):
         ('Completed', 'Completed'),
     ]
     
+    # Production progress shown on the dashboard and pushed as live events
+    PROGRESS_FIELDS = ('status', 'edit_status', 'editing_progress')
+    
+    # Columns copied into the production calendar, or deciding whether a project is on it (see projects.timeline)
+    CALENDAR_FIELDS = ('name', 'slug', 'type', 'status', 'edit_status', 'event_date', 'due_date', 'is_archived')
+    
+    # Due date classes per urgency bucket (None: no due date)
+    DUE_DATE_COLORS = {
+        'overdue': 'text-danger fw-bold',
+        'week': 'text-danger',
+        'two_weeks': 'text-warning',
+        'month': 'text-warning-light',
+        'later': 'text-muted',
+        None: 'text-muted',
+    }
+    DUE_DATE_BADGE_COLORS = {
+        'overdue': 'bg-danger',
+        'week': 'bg-danger',
+        'two_weeks': 'bg-warning text-dark',
+        'month': 'bg-warning text-dark',
+        'later': 'bg-secondary',
+        None: 'bg-secondary',
+    }
+    
+    # Columns the project cards of list pages show (see ProjectQuerySet.for_list)
+    LIST_FIELDS = (
+        'name', 'slug', 'user', 'client_name', 'type', 'event_date', 'due_date',
+        'status', 'is_archived', 'has_unsent_changes',
+    )
+    
     # Basic fields
     name = models.CharField(max_length=255)
     slug = models.SlugField(max_length=255, unique=True, blank=True, null=True)
@@ -216,12 +398,40 @@ class Project(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    # Optimistic locking: bumped on every write, checked by compare_and_set
+    version = models.PositiveIntegerField(default=1, help_text="Row version for optimistic locking")
+    
+    objects = ProjectQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Active editing work by due date, summed by the workload planner (projects.planner)
+            models.Index(
+                fields=['due_date'], name='project_editing_queue',
+                condition=models.Q(is_archived=False) & ~models.Q(edit_status='Completed'),
+            ),
+        ]
     
     def __str__(self):
         return f"{self.name} - {self.user.username}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the loaded progress and calendar values so post_save can tell whether they changed
+        instance.loaded_progress = instance.progress_snapshot()
+        instance.loaded_calendar = instance.calendar_snapshot()
+        return instance
+    
+    def progress_snapshot(self):
+        """Current values of the loaded PROGRESS_FIELDS"""
+        return {name: self.__dict__[name] for name in self.PROGRESS_FIELDS if name in self.__dict__}
+    
+    def calendar_snapshot(self):
+        """Current values of the loaded CALENDAR_FIELDS"""
+        return {name: self.__dict__[name] for name in self.CALENDAR_FIELDS if name in self.__dict__}
+    
     def generate_slug(self):
         """Generate unique slug based on event date, type, and creation time"""
         # Format: 2026-05-29-nunta(20250915-t-093405)
@@ -261,12 +471,7 @@ class Project(models.Model):
         from django.conf import settings
         from django.utils import timezone
         
-        # Get all admin users
-        admin_users = User.objects.filter(role='ADMIN')
-        if not admin_users.exists():
-            return False
-        
-        admin_emails = [admin.email for admin in admin_users if admin.email]
+        admin_emails = get_admin_emails()
         if not admin_emails:
             return False
         
@@ -296,25 +501,88 @@ class Project(models.Model):
             return True
             
         except Exception as e:
-            print(f"Failed to send admin notification: {e}")
+            logger.warning('Failed to send admin notification: %s', e, extra={'project': self.slug})
+            return False
+    
+    @classmethod
+    def name_for(cls, project_type, title_video):
+        """Project name derived from the video title, or None without a title"""
+        if not title_video or not title_video.strip():
+            return None
+        # Format: "Type - Video Title" (e.g., "Nunta - Ioana si Ion")
+        type_display = dict(cls.PROJECT_TYPE_CHOICES).get(project_type, project_type)
+        return f"{type_display} - {title_video.strip()}"
+    
+    def compare_and_set(self, changes, expected_version=None, expected_values=None):
+        """
+        Optimistic write: apply `changes` in one conditional UPDATE, without row
+        locks. The row must still be at `expected_version` and/or still hold
+        `expected_values` (field-level compare-and-set). On success the
+        instance takes the new values and version and True is returned; False
+        means another writer changed the row first. Changes to bookkeeping
+        fields only (see policy.BOOKKEEPING_FIELDS) keep the version.
+        """
+        changes = dict(changes)
+        if 'title_video' in changes or 'type' in changes:
+            new_name = self.name_for(changes.get('type', self.type), changes.get('title_video', self.title_video))
+            if new_name:
+                changes['name'] = new_name
+        
+        conditions = models.Q(pk=self.pk)
+        if expected_version is not None:
+            conditions &= models.Q(version=expected_version)
+        for field_name, value in (expected_values or {}).items():
+            conditions &= _value_matches(self._meta.get_field(field_name), value)
+        
+        bump_version = not BOOKKEEPING_FIELDS.issuperset(changes)
+        if bump_version:
+            changes['version'] = models.F('version') + 1
+        now = timezone.now()
+        updated = Project.objects.filter(conditions).update(**changes, updated_at=now)
+        if not updated:
             return False
+        
+        changes.pop('version', None)
+        for field_name, value in changes.items():
+            setattr(self, field_name, value)
+        self.updated_at = now
+        if bump_version:
+            self._advance_version(expected_version if expected_version is not None else self.version)
+        self.loaded_progress = self.progress_snapshot()  # Published by the caller, not by post_save
+        invalidate('projects')  # queryset.update() sends no signals
+        calendar = self.calendar_snapshot()
+        if getattr(self, 'loaded_calendar', None) != calendar:
+            from .timeline import refresh_calendar
+            refresh_calendar([self.pk])
+            self.loaded_calendar = calendar
+        return True
     
     def save(self, *args, **kwargs):
         """Override save to generate slug, update project name, and set default due date"""
         
         # Auto-update project name based on video title
-        if self.title_video and self.title_video.strip():
-            # Format: "Type - Video Title" (e.g., "Nunta - Ioana si Ion")
-            type_display = dict(self.PROJECT_TYPE_CHOICES).get(self.type, self.type)
-            new_name = f"{type_display} - {self.title_video.strip()}"
-            if self.name != new_name:
-                self.name = new_name
+        new_name = self.name_for(self.type, self.title_video)
+        if new_name and self.name != new_name:
+            self.name = new_name
         
         # Set default due date to 3 months after event date if not set
         if not self.due_date and self.event_date:
             from dateutil.relativedelta import relativedelta
             self.due_date = (self.event_date + relativedelta(months=3)).date()
         
+        # Every content write moves the version so concurrent compare_and_set writers
+        # notice; bookkeeping-only writes don't. It is incremented in SQL so it never
+        # goes backwards.
+        update_fields = kwargs.get('update_fields')
+        bump_version = not self._state.adding and not (
+            update_fields is not None and BOOKKEEPING_FIELDS.issuperset(update_fields)
+        )
+        if bump_version:
+            previous_version = self.__dict__.get('version')
+            self.version = models.F('version') + 1
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'version'}
+        
         if not self.slug:
             # Need to save first to get created_at timestamp
             if not self.pk:
@@ -324,6 +592,20 @@ class Project(models.Model):
             super().save(update_fields=['slug'])
         else:
             super().save(*args, **kwargs)
+        
+        if bump_version:
+            self._advance_version(previous_version)
+    
+    def _advance_version(self, previous_version):
+        """
+        Record the version after a write that incremented it in SQL. previous + 1
+        is a lower bound (another writer may have bumped it too), which is safe:
+        a low version only makes the next compare_and_set fail, never succeed.
+        """
+        if isinstance(previous_version, int):
+            self.version = previous_version + 1
+        else:
+            del self.version  # Not loaded; read on next access
     
     def get_ceremony_fields_ordered(self):
         """Return main details field for all project types"""
@@ -393,14 +675,7 @@ class Project(models.Model):
     
     def get_client_guidance_message(self):
         """Get the appropriate guidance message based on project status"""
-        messages = {
-            'initial': "Please review all the details carefully and add or improve your preferences in the specific areas. Your input helps us create the perfect video for your special day.",
-            'planning': "The project is now in planning phase. Please ensure all your preferences are clearly stated in each section.",
-            'filming': "Filming is scheduled. Review the production details and add any last-minute requests or special moments you want captured.",
-            'editing': "Your video is being edited. Check the editing preferences and package details to ensure they match your vision.",
-            'review': "Your video is ready for review. Please provide detailed feedback in the appropriate sections.",
-            'completed': "Your project is complete! Thank you for choosing us. Feel free to leave any final feedback.",
-        }
+        messages = get_guidance_messages()
         
         # Determine message type based on status
         if self.status == 'Planning':
@@ -428,51 +703,33 @@ class Project(models.Model):
         message_text, message_type = self.get_client_guidance_message()
         return message_type not in self.dismissed_guidance_messages
     
+    def get_due_date_urgency(self):
+        """
+        Urgency bucket of due_date (see timeline.URGENCY_BUCKETS). List queries
+        annotate it as due_urgency, computed in SQL; otherwise it is computed here.
+        """
+        if 'due_urgency' in self.__dict__:
+            return self.due_urgency
+        from .timeline import urgency_for
+        return urgency_for(self.due_date)
+    
     def get_due_date_color(self):
-        """Calculate color for due date based on proximity (for admin view)"""
-        if not self.due_date:
-            return 'text-muted'
-        
-        from django.utils import timezone
-        today = timezone.now().date()
-        days_until_due = (self.due_date - today).days
-        
-        # Color gradient based on days remaining
-        if days_until_due < 0:
-            # Overdue - dark red
-            return 'text-danger fw-bold'
-        elif days_until_due <= 7:
-            # Less than a week - red
-            return 'text-danger'
-        elif days_until_due <= 14:
-            # Less than 2 weeks - orange/warning
-            return 'text-warning'
-        elif days_until_due <= 30:
-            # Less than a month - light orange
-            return 'text-warning-light'
-        else:
-            # More than a month - normal
-            return 'text-muted'
+        """Text color class for due date based on proximity (for admin view)"""
+        return self.DUE_DATE_COLORS[self.get_due_date_urgency()]
     
     def get_due_date_badge_color(self):
         """Get Bootstrap badge color class for due date"""
-        if not self.due_date:
-            return 'bg-secondary'
-        
-        from django.utils import timezone
-        today = timezone.now().date()
-        days_until_due = (self.due_date - today).days
-        
-        if days_until_due < 0:
-            return 'bg-danger'
-        elif days_until_due <= 7:
-            return 'bg-danger'
-        elif days_until_due <= 14:
-            return 'bg-warning text-dark'
-        elif days_until_due <= 30:
-            return 'bg-warning text-dark'
-        else:
-            return 'bg-secondary'
+        return self.DUE_DATE_BADGE_COLORS[self.get_due_date_urgency()]
+
+
+def _value_matches(field, value):
+    """Q matching rows whose `field` still holds `value`; empty text matches NULL too"""
+    if value is None or value == '':
+        condition = models.Q(**{f'{field.name}__isnull': True}) if field.null else models.Q()
+        if isinstance(field, (models.CharField, models.TextField)):
+            condition |= models.Q(**{field.name: ''})
+        return condition
+    return models.Q(**{field.name: value})
 
 
 class ProjectModification(models.Model):
@@ -482,6 +739,7 @@ class ProjectModification(models.Model):
         ('APPROVED', 'Approved'),
         ('REJECTED', 'Rejected'),
         ('AUTO_APPLIED', 'Auto Applied'),
+        ('SUPERSEDED', 'Superseded'),
     ]
     
     project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='modifications')
@@ -497,17 +755,107 @@ class ProjectModification(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Status-filtered, newest-first feeds per project (e.g. the client's rejected requests)
+            models.Index(fields=['project', 'status', 'created_at']),
+            # Latest row per field, for autosave coalescing
+            models.Index(fields=['project', 'field_name', 'created_at']),
+        ]
+        constraints = [
+            # One active change request per field; earlier ones are SUPERSEDED (see pending.py).
+            # Its partial index also serves the admin's count of pending requests.
+            models.UniqueConstraint(
+                fields=['project', 'field_name'],
+                condition=models.Q(status='PENDING'),
+                name='one_pending_modification_per_field',
+            ),
+        ]
     
     def __str__(self):
         return f"{self.project.name} - {self.field_name} - {self.status}"
 
 
+class FileBlobManager(models.Manager):
+    """
+    Reference-counted access to content-addressed blobs. acquire() and
+    release() lock the blob's row, so a release can't delete a blob that
+    an upload of the same content is taking a reference to.
+    """
+    
+    def _take(self, sha256):
+        # Call inside a transaction; None when no blob holds this content
+        blob = self.select_for_update().filter(sha256=sha256).first()
+        if blob is not None:
+            self.filter(pk=blob.pk).update(ref_count=models.F('ref_count') + 1)
+            blob.ref_count += 1
+        return blob
+    
+    def acquire(self, uploaded_file, sha256):
+        """
+        Return the blob holding this content, storing it only if it is new.
+        Returns (blob, created).
+        """
+        from django.db import IntegrityError, transaction
+        
+        with transaction.atomic():
+            blob = self._take(sha256)
+        if blob is not None:
+            return blob, False
+        
+        blob = self.model(sha256=sha256, size_bytes=uploaded_file.size, ref_count=1)
+        blob.file.save(uploaded_file.name, uploaded_file, save=False)
+        try:
+            with transaction.atomic():
+                blob.save()
+            return blob, True
+        except IntegrityError:
+            # Another upload stored the same content first - reuse it
+            blob.file.delete(save=False)
+        with transaction.atomic():
+            existing = self._take(sha256)
+        if existing is None:
+            # ...and it was released again meanwhile: store ours after all
+            return self.acquire(uploaded_file, sha256)
+        return existing, False
+    
+    def release(self, blob_id):
+        """Drop one reference; delete the blob and its stored file when unused"""
+        from django.db import transaction
+        
+        with transaction.atomic():
+            blob = self.select_for_update().filter(pk=blob_id).first()
+            if blob is None:
+                return
+            if blob.ref_count > 1:
+                self.filter(pk=blob_id).update(ref_count=models.F('ref_count') - 1)
+                return
+            storage, name = blob.file.storage, blob.file.name
+            blob.delete()
+            transaction.on_commit(lambda: storage.delete(name))
+
+
+class FileBlob(models.Model):
+    """Stored file content shared by every File with the same SHA-256"""
+    sha256 = models.CharField(max_length=64, unique=True)
+    file = models.FileField(upload_to=blob_upload_path, max_length=255)
+    size_bytes = models.BigIntegerField()
+    ref_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    objects = FileBlobManager()
+    
+    def __str__(self):
+        return f"{self.sha256[:12]} ({self.ref_count} refs)"
+
+
 class File(models.Model):
     """Uploaded files for projects"""
     project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='files')
     display_name = models.CharField(max_length=255)
     file = models.FileField(upload_to='project_files/%Y/%m/%d/')
     size_bytes = models.BigIntegerField()
+    sha256 = models.CharField(max_length=64, blank=True, null=True, db_index=True)
+    blob = models.ForeignKey(FileBlob, on_delete=models.PROTECT, null=True, blank=True, related_name='files')
     uploaded_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
     
@@ -517,6 +865,18 @@ class File(models.Model):
     def __str__(self):
         return f"{self.display_name} - {self.project.name}"
     
+    def attach_upload(self, uploaded_file, sha256):
+        """
+        Point this file at the shared blob for the uploaded content.
+        Returns True if identical content was already stored.
+        """
+        blob, created = FileBlob.objects.acquire(uploaded_file, sha256)
+        self.blob = blob
+        self.sha256 = sha256
+        self.size_bytes = blob.size_bytes
+        self.file = blob.file.name
+        return not created
+    
     def get_size_display(self):
         """Return human-readable file size"""
         size = self.size_bytes
@@ -527,6 +887,35 @@ class File(models.Model):
         return f"{size:.1f} PB"
 
 
+class FilePreview(models.Model):
+    """Poster thumbnail and low-bitrate preview proxy generated for a video File"""
+    STATUS_CHOICES = [
+        ('PENDING', 'Pending'),
+        ('PROCESSING', 'Processing'),
+        ('READY', 'Ready'),
+        ('FAILED', 'Failed'),
+        ('SKIPPED', 'Skipped'),
+    ]
+    
+    file = models.OneToOneField(File, on_delete=models.CASCADE, primary_key=True, related_name='preview')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='PENDING', db_index=True)
+    poster = models.FileField(upload_to='project_files/previews/%Y/%m/', blank=True)
+    proxy = models.FileField(upload_to='project_files/previews/%Y/%m/', blank=True)
+    duration_seconds = models.FloatField(blank=True, null=True)
+    attempts = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    claimed_at = models.DateTimeField(blank=True, null=True)  # When a worker last took it (PROCESSING)
+    processed_at = models.DateTimeField(blank=True, null=True)
+    
+    def __str__(self):
+        return f"Preview: {self.file.display_name} ({self.status})"
+    
+    @property
+    def is_ready(self):
+        return self.status == 'READY' and bool(self.proxy)
+
+
 class FileDownloadEvent(models.Model):
     """Track file downloads"""
     file = models.ForeignKey(File, on_delete=models.CASCADE, related_name='downloads')
@@ -537,11 +926,97 @@ class FileDownloadEvent(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['file', 'downloaded_by']),
+            models.Index(fields=['project', 'downloaded_by']),
+        ]
     
     def __str__(self):
         return f"Download: {self.file.display_name} at {self.created_at}"
 
 
+class FileDownloadStats(models.Model):
+    """Per-file download rollup, maintained on every download"""
+    file = models.OneToOneField(File, on_delete=models.CASCADE, primary_key=True, related_name='download_stats')
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='file_download_stats')
+    download_count = models.PositiveIntegerField(default=0)
+    client_download_count = models.PositiveIntegerField(default=0)
+    distinct_downloaders = models.PositiveIntegerField(default=0)
+    first_downloaded_at = models.DateTimeField(blank=True, null=True)
+    last_downloaded_at = models.DateTimeField(blank=True, null=True)
+    last_client_download_at = models.DateTimeField(blank=True, null=True)
+    
+    class Meta:
+        verbose_name = "File Download Stats"
+        verbose_name_plural = "File Download Stats"
+    
+    def __str__(self):
+        return f"{self.file.display_name}: {self.download_count} downloads"
+
+
+class ProjectDownloadStats(models.Model):
+    """Per-project download rollup, maintained on every download"""
+    project = models.OneToOneField(Project, on_delete=models.CASCADE, primary_key=True, related_name='download_stats')
+    download_count = models.PositiveIntegerField(default=0)
+    client_download_count = models.PositiveIntegerField(default=0)
+    files_downloaded_by_client = models.PositiveIntegerField(default=0)
+    distinct_downloaders = models.PositiveIntegerField(default=0)
+    first_downloaded_at = models.DateTimeField(blank=True, null=True)
+    last_downloaded_at = models.DateTimeField(blank=True, null=True)
+    last_client_download_at = models.DateTimeField(blank=True, null=True)
+    
+    class Meta:
+        verbose_name = "Project Download Stats"
+        verbose_name_plural = "Project Download Stats"
+    
+    def __str__(self):
+        return f"{self.project.name}: {self.download_count} downloads"
+
+
+class ProjectDownloadMonth(models.Model):
+    """Downloads per project per calendar month"""
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='download_months')
+    month = models.DateField(help_text="First day of the month")
+    download_count = models.PositiveIntegerField(default=0)
+    client_download_count = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        ordering = ['-month']
+        unique_together = [('project', 'month')]
+    
+    def __str__(self):
+        return f"{self.project.name} {self.month:%Y-%m}: {self.download_count}"
+
+
+class ProjectCalendarEntry(models.Model):
+    """A project's event day or editing due date on the production calendar (see projects.timeline)"""
+    KIND_CHOICES = [
+        ('EVENT', 'Event'),
+        ('DUE', 'Editing due'),
+    ]
+    
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='calendar_entries')
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    day = models.DateField(help_text="Local date of the event or the due date")
+    starts_at = models.DateTimeField(blank=True, null=True, help_text="Event start; empty for due dates")
+    # Copied from the project so calendar pages read this table alone
+    name = models.CharField(max_length=255)
+    slug = models.SlugField(max_length=255, blank=True, null=True)
+    type = models.CharField(max_length=10)
+    status = models.CharField(max_length=50)
+    edit_status = models.CharField(max_length=50)
+    
+    class Meta:
+        ordering = ['day', 'kind']
+        unique_together = [('project', 'kind')]
+        indexes = [
+            models.Index(fields=['day', 'kind']),
+        ]
+    
+    def __str__(self):
+        return f"{self.name} {self.get_kind_display()} {self.day}"
+
+
 class FieldHistory(models.Model):
     """Track history of field changes with editor information"""
     project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='field_history')
@@ -553,9 +1028,36 @@ class FieldHistory(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['project', 'field_name', 'created_at']),
+        ]
         verbose_name = "Field History"
         verbose_name_plural = "Field Histories"
     
     def __str__(self):
         editor_name = self.edited_by.get_full_name() if self.edited_by and self.edited_by.get_full_name() else (self.edited_by.email if self.edited_by else 'Unknown')
         return f"{self.project.name} - {self.field_name} by {editor_name}"
+
+
+class ProjectEvent(models.Model):
+    """Project change feed for live page updates (see projects.events)"""
+    AUDIENCE_CHOICES = [
+        ('ALL', 'Admins and client'),
+        ('ADMIN', 'Admins only'),
+    ]
+    
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='events')
+    kind = models.CharField(max_length=50, help_text="e.g. field.updated, modification.approved, file.added")
+    audience = models.CharField(max_length=10, choices=AUDIENCE_CHOICES, default='ALL')
+    actor = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    data = models.JSONField(default=dict, blank=True, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['project', 'id']),
+        ]
+    
+    def __str__(self):
+        return f"{self.kind} on {self.project_id} at {self.created_at}"
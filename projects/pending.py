@@ -0,0 +1,92 @@
+"""
+Collapsing of pending change requests
+
+A client may ask for the same field to change several times before an admin
+reviews it. Only the latest request per (project, field) is active: recording
+a new one marks the earlier PENDING rows SUPERSEDED in the same transaction,
+so the review queue holds one item per field and approving it writes once.
+The one_pending_modification_per_field constraint guarantees this in the
+database.
+
+A request for the value the field already has withdraws the earlier requests
+without leaving a new one.
+
+SQLite ignores select_for_update(), so a concurrent submission for the same
+field can still commit between the read and the insert. The insert then trips
+the constraint, and the submission is read and written again in a savepoint.
+"""
+from django.db import IntegrityError, transaction
+
+from .cache import invalidate
+from .events import publish_pending
+from .models import Project, ProjectModification
+
+
+# Times a submission is read and written before giving up on a busy field
+SUBMIT_ATTEMPTS = 3
+
+
+class PendingConflict(Exception):
+    """Concurrent submissions kept replacing the same requests; nothing was recorded"""
+
+    def __init__(self, fields):
+        super().__init__(fields)
+        self.fields = fields
+
+
+def submit_pending(project, changes, user):
+    """
+    Record client change requests, `changes` mapping field name -> (old value,
+    new value) as text. Returns the new PENDING modifications; fields whose
+    requested value is the current one get none. Raises PendingConflict if
+    concurrent submissions for the same fields keep winning the race.
+    """
+    if not changes:
+        return []
+
+    for attempt in range(1, SUBMIT_ATTEMPTS + 1):
+        try:
+            # A savepoint when called inside a transaction, so a failed attempt leaves it usable
+            with transaction.atomic():
+                created = _replace_pending(project, changes, user)
+            break
+        except IntegrityError:
+            if attempt == SUBMIT_ATTEMPTS:
+                raise PendingConflict(sorted(changes))
+    invalidate('projects')
+    return created
+
+
+def _active_requests(project, fields):
+    """Field name -> ids of the PENDING requests for `fields`"""
+    active = {}
+    requests = ProjectModification.objects.filter(project=project, field_name__in=fields, status='PENDING')
+    for pk, field_name in requests.values_list('pk', 'field_name'):
+        active.setdefault(field_name, []).append(pk)
+    return active
+
+
+def _replace_pending(project, changes, user):
+    """Supersede the active requests for the `changes` fields and record the new ones"""
+    # Lock the project so concurrent submissions for it can't both stay active
+    list(Project.objects.select_for_update().filter(pk=project.pk).values_list('pk', flat=True))
+    superseded = _active_requests(project, changes)
+    if superseded:
+        ProjectModification.objects.filter(
+            pk__in=[pk for ids in superseded.values() for pk in ids]
+        ).update(status='SUPERSEDED')
+
+    created = ProjectModification.objects.bulk_create([
+        ProjectModification(
+            project=project,
+            field_name=field_name,
+            old_value=old_value,
+            new_value=new_value,
+            created_by=user,
+            status='PENDING'
+        )
+        for field_name, (old_value, new_value) in changes.items()
+        if old_value != new_value
+    ])
+    publish_pending(created, {project.pk: superseded}, user)  # bulk writes send no signals
+    return created
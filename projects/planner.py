@@ -0,0 +1,102 @@
+"""
+Editing workload planner: estimated editing hours per project, by due week
+
+A project's editing estimate is derived from its montages (and the chosen
+durations) and camera count as an SQL expression, so the weekly load of every
+active project is summed by the database in one grouped query instead of
+loading projects. Only the part not yet done (editing_progress) counts, and it
+is due in the week of due_date; overdue work is due this week.
+
+weekly_load() compares each week with settings.EDITING_CAPACITY_HOURS:
+
+- over_capacity: the week alone needs more hours than a week has,
+- at_risk: the work due by the end of the week needs more hours than the
+  weeks from now until then have, i.e. earlier weeks can't absorb it.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Case, Count, DateField, F, FloatField, Q, Sum, Value, When
+from django.db.models.functions import TruncWeek
+from django.utils import timezone
+
+from .models import Project
+
+
+# Editing hours per deliverable; change them to match the studio's pace
+BASE_HOURS = 4  # Ingest, colour and export, whatever the montages
+HIGHLIGHTS_HOURS = 8
+MOVIE_HOURS = {'30min': 6, '1h': 10, '1h30min': 14, '2h-3h': 20, '3h-4h': 28}
+MOVIE_DEFAULT_HOURS = 20  # 'Other' or no duration chosen
+PRIMARY_EDIT_HOURS = 6
+CINEMA_HOURS = {'1h': 12, '1h30min': 16}
+CINEMA_DEFAULT_HOURS = 16
+EXTRA_CAMERA_HOURS = 4  # Syncing and multicam cuts, per camera after the first
+
+# Projects whose editing still has to be planned (see Project.Meta's editing_queue index)
+EDITING_QUEUE = Q(is_archived=False) & ~Q(edit_status='Completed')
+
+
+def _when(flag, hours):
+    return Case(When(**{flag: True}, then=hours), default=Value(0))
+
+
+def _by_duration(field, hours, default):
+    return Case(
+        *(When(**{field: duration}, then=Value(value)) for duration, value in hours.items()),
+        default=Value(default),
+    )
+
+
+def estimated_hours():
+    """SQL expression: editing hours a project's montages and cameras take in total"""
+    return (
+        Value(BASE_HOURS)
+        + _when('montage_highlights', Value(HIGHLIGHTS_HOURS))
+        + _when('montage_movie', _by_duration('montage_movie_duration', MOVIE_HOURS, MOVIE_DEFAULT_HOURS))
+        + _when('montage_bonus_primary', Value(PRIMARY_EDIT_HOURS))
+        + _when('montage_bonus_full', _by_duration('montage_cinema_duration', CINEMA_HOURS, CINEMA_DEFAULT_HOURS))
+        + (F('package_cameras') - 1) * EXTRA_CAMERA_HOURS
+    )
+
+
+def remaining_hours():
+    """SQL expression: the estimated hours not covered by editing_progress yet"""
+    return estimated_hours() * (100 - F('editing_progress')) / Value(100.0, output_field=FloatField())
+
+
+def weekly_load(today=None, weeks=None, capacity=None):
+    """
+    The next `weeks` weeks from the one containing `today`, as dicts: week
+    (its Monday), hours, projects, over_capacity, at_risk. Weeks without
+    work are included with 0 hours.
+    """
+    today = today or timezone.localdate()
+    weeks = weeks or settings.WORKLOAD_WEEKS
+    capacity = settings.EDITING_CAPACITY_HOURS if capacity is None else capacity
+    first = today - timedelta(days=today.weekday())
+    end = first + timedelta(weeks=weeks)
+
+    due = Case(When(due_date__lt=first, then=Value(first)), default=F('due_date'), output_field=DateField())
+    rows = Project.objects.filter(EDITING_QUEUE, due_date__lt=end).annotate(
+        week=TruncWeek(due, output_field=DateField()),
+    ).values('week').annotate(
+        hours=Sum(remaining_hours(), output_field=FloatField()),
+        projects=Count('id'),
+    ).order_by()
+    by_week = {row['week']: row for row in rows}
+
+    load, due_total = [], 0.0
+    for i in range(weeks):
+        week = first + timedelta(weeks=i)
+        row = by_week.get(week, {})
+        hours = round(row.get('hours') or 0.0, 1)
+        due_total += hours
+        load.append({
+            'week': week,
+            'hours': hours,
+            'projects': row.get('projects', 0),
+            'over_capacity': hours > capacity,
+            'at_risk': due_total > capacity * (i + 1),
+        })
+    return load
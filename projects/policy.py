@@ -0,0 +1,84 @@
+"""
+Field policy: which Project fields each role sees, edits and requests
+
+The sets are defined once here and shared by the write paths (schema.py,
+views), live updates (events.py) and templates, instead of being redefined
+as lists inside each view. field_groups() gives templates the fields a role
+may see, edit and change directly, computed once per role.
+client_projection() selects only the columns clients may see, so admin-only
+text is never read from the database for them.
+"""
+from functools import cache
+
+
+# Fields clients never see
+ADMIN_ONLY_FIELDS = frozenset({
+    'critical_production_notes',
+    'price',
+    'price_currency',
+    'price_other_details',
+})
+
+# Fields clients see but only admins change
+ADMIN_MANAGED_FIELDS = frozenset({
+    'status', 'edit_status', 'editing_progress', 'due_date',
+    'videographer_filming_notes', 'videographer_editing_notes',
+})
+
+# Admin edits to these are not news for the client (no has_unsent_changes)
+QUIET_FIELDS = ADMIN_ONLY_FIELDS | {'videographer_filming_notes', 'videographer_editing_notes'}
+
+# Fields clients may change without admin approval
+BYPASS_APPROVAL_FIELDS = frozenset({'filming_details', 'notes'})
+
+# Fields whose edits are also kept in FieldHistory
+HISTORY_FIELDS = frozenset({'filming_details', 'notes'})
+
+# Ceremony fields whose order a project can customise
+CEREMONY_FIELDS = frozenset({'civil_union_details', 'prep', 'church', 'session', 'restaurant'})
+
+# Notification flags and page state: writes touching only these don't move
+# Project.version, so they never make someone's edit conflict
+BOOKKEEPING_FIELDS = frozenset({
+    'updated_at', 'admin_notified_of_changes', 'has_unsent_changes',
+    'last_admin_notification_date', 'last_client_notification_date',
+    'current_guidance_message', 'dismissed_guidance_messages',
+})
+
+# Maintained by the server, never written through the edit endpoints
+SERVER_MANAGED_FIELDS = BOOKKEEPING_FIELDS | {'id', 'slug', 'user', 'version', 'created_at'}
+
+# Bookkeeping columns that are not worth pushing to pages
+UNPUBLISHED_FIELDS = SERVER_MANAGED_FIELDS - {'id', 'slug', 'user', 'created_at'}
+
+
+@cache
+def field_groups(role):
+    """
+    Field name sets for templates, for a user role ('ADMIN' or 'CLIENT'):
+    visible, editable (in the page) and direct (applied without approval)
+    """
+    from .schema import FIELDS
+
+    if role == 'ADMIN':
+        editable = frozenset(FIELDS)
+        return {'visible': editable, 'editable': editable, 'direct': editable}
+    visible = frozenset(FIELDS) - ADMIN_ONLY_FIELDS
+    return {
+        'visible': visible,
+        'editable': visible - ADMIN_MANAGED_FIELDS,
+        'direct': BYPASS_APPROVAL_FIELDS,
+    }
+
+
+@cache
+def client_columns():
+    """Project columns clients may see"""
+    from .models import Project
+
+    return tuple(field.name for field in Project._meta.concrete_fields if field.name not in ADMIN_ONLY_FIELDS)
+
+
+def client_projection(queryset):
+    """`queryset` of projects without the admin-only columns"""
+    return queryset.only(*client_columns())
@@ -0,0 +1,172 @@
+"""
+Reviewing client change requests, one or many at a time
+
+apply_reviews() approves and rejects a set of PENDING modifications in one
+transaction:
+
+- approved values are written with one UPDATE per project
+  (Project.compare_and_set, which also derives the name and bumps the version),
+- the modifications are updated with one bulk_update,
+- live-update events are stored with one INSERT (bulk_update sends no signals).
+
+rejection_emails() then builds one email per client covering all of their
+rejected requests, instead of one email per field.
+"""
+from django.conf import settings
+from django.core.mail import EmailMessage
+from django.db import transaction
+from django.utils import timezone
+
+from .cache import invalidate
+from .events import publish_reviews
+from .models import ProjectModification, get_admin_emails
+from .schema import FIELDS
+
+
+REVIEW_FIELDS = ['status', 'approved_by', 'approved_at', 'notes']
+
+
+class ReviewError(Exception):
+    """The review can't be applied as requested; nothing was changed"""
+
+    def __init__(self, message, ids=()):
+        super().__init__(message)
+        self.ids = sorted(ids)
+
+
+def applied_value(modification):
+    """The modification's stored (text) value converted for its project field"""
+    spec = FIELDS.get(modification.field_name)
+    if spec is None:
+        raise ReviewError(f'Invalid value for {modification.field_name}', [modification.pk])
+    try:
+        value = spec.coerce(modification.new_value)
+    except ValueError:
+        raise ReviewError(f'Invalid value for {modification.field_name}', [modification.pk])
+    if value is None and not spec.field.null:
+        raise ReviewError(f'{modification.field_name} cannot be empty', [modification.pk])
+    return value
+
+
+def apply_reviews(reviewer, approve_ids=(), reject_ids=(), reasons=None):
+    """
+    Approve `approve_ids` and reject `reject_ids` atomically. `reasons` is the
+    rejection reason, one string for all or a dict of id -> reason. Returns
+    (approved, rejected) lists of modifications. Raises ReviewError, changing
+    nothing, if an id is unknown or no longer pending or a value can't be applied.
+    """
+    approve_ids, reject_ids = set(approve_ids), set(reject_ids)
+    if approve_ids & reject_ids:
+        raise ReviewError('Modifications cannot be both approved and rejected', approve_ids & reject_ids)
+    if not isinstance(reasons, dict):
+        reasons = dict.fromkeys(reject_ids, reasons)
+    reasons = {pk: (reasons.get(pk) or reasons.get(str(pk)) or '').strip() for pk in reject_ids}
+    missing = [pk for pk, reason in reasons.items() if not reason]
+    if missing:
+        raise ReviewError('Rejection reason is required', missing)
+
+    now = timezone.now()
+    with transaction.atomic():
+        modifications = list(
+            ProjectModification.objects.select_for_update(of=('self',))
+            .select_related('project')
+            .filter(pk__in=approve_ids | reject_ids, status='PENDING')
+            .order_by('created_at', 'id')  # Later requests for the same field win
+        )
+        stale = (approve_ids | reject_ids) - {modification.pk for modification in modifications}
+        if stale:
+            raise ReviewError('Some modifications are no longer pending', stale)
+
+        approved, rejected, changes = [], [], {}
+        for modification in modifications:
+            if modification.pk in approve_ids:
+                _, fields = changes.setdefault(modification.project_id, (modification.project, {}))
+                fields[modification.field_name] = applied_value(modification)
+                modification.status = 'APPROVED'
+                approved.append(modification)
+            else:
+                modification.status = 'REJECTED'
+                modification.notes = reasons[modification.pk]
+                rejected.append(modification)
+            modification.approved_by = reviewer
+            modification.approved_at = now
+
+        for project, fields in changes.values():
+            # Approved changes are news for the client
+            project.compare_and_set({**fields, 'has_unsent_changes': True})
+        ProjectModification.objects.bulk_update(modifications, REVIEW_FIELDS)
+        publish_reviews(modifications, reviewer)
+    invalidate('projects')  # bulk_update sends no signals
+    return approved, rejected
+
+
+def rejection_emails(rejected, reviewer):
+    """One email per client listing all of their rejected requests, CC admins"""
+    by_client = {}
+    for modification in rejected:
+        if modification.project.client_email:
+            by_client.setdefault(modification.project.client_email, []).append(modification)
+    if not by_client:
+        return []
+
+    admin_emails = get_admin_emails()
+    reviewer_name = reviewer.get_full_name() or reviewer.email
+    return [
+        EmailMessage(
+            subject=_rejection_subject(modifications),
+            body=_rejection_body(modifications, reviewer_name),
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            to=[client_email],
+            cc=admin_emails,
+        )
+        for client_email, modifications in by_client.items()
+    ]
+
+
+def _rejection_subject(modifications):
+    projects = {modification.project.name for modification in modifications}
+    label = 'Change Request Rejected' if len(modifications) == 1 else 'Change Requests Rejected'
+    return f'{label} - {projects.pop()}' if len(projects) == 1 else label
+
+
+def _rejection_body(modifications, reviewer_name):
+    first = modifications[0].project
+    if len(modifications) == 1:
+        intro = f'Your change request for the project "{first.name}" has been reviewed and rejected.'
+    else:
+        intro = f'The following {len(modifications)} change requests have been reviewed and rejected.'
+
+    by_project = {}
+    for modification in sorted(modifications, key=lambda m: (m.project_id, m.created_at)):
+        by_project.setdefault(modification.project, []).append(modification)
+    sections = []
+    for project, rejected in by_project.items():
+        sections.append(
+            f'Project Details:\n'
+            f'- Project: {project.name}\n'
+            f'- Event Date: {project.event_date.strftime("%B %d, %Y")}\n'
+            + '\n\n'.join(
+                f'- Field: {modification.field_name.replace("_", " ").title()}\n'
+                f'- Your Requested Change: {modification.new_value}\n\n'
+                f'Rejection Reason:\n{modification.notes}'
+                for modification in rejected
+            )
+        )
+    details = '\n\n'.join(sections)
+
+    return f'''Dear {first.client_name or 'Client'},
+
+{intro}
+
+{details}
+
+What's Next:
+Please review the feedback above and feel free to submit a new change request with the necessary corrections. If you have any questions, please don't hesitate to contact us.
+
+Best regards,
+{reviewer_name}
+Wedding Video Portal Team
+
+---
+This is an automated message from the Wedding Video Portal system.
+'''
@@ -0,0 +1,189 @@
+"""
+Field schema: how submitted values are converted for each editable Project field
+
+build_schema() runs once when the app is ready (ProjectsConfig.ready) and
+reads Project._meta, so write paths look a field up in FIELDS instead of
+inspecting the model field and rebuilding its choices on every request.
+Each FieldSpec carries a precompiled coercer and the field's visibility
+(from the sets in policy.py):
+
+- 'bypass': clients' edits apply immediately, without approval,
+- 'admin_only': never shown to clients,
+- 'client': shown to clients; their edits need approval.
+
+Coercers raise ValueError for values the field can't take.
+"""
+import json
+from datetime import date, datetime
+
+from django.db import models
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .policy import ADMIN_ONLY_FIELDS, BYPASS_APPROVAL_FIELDS, SERVER_MANAGED_FIELDS
+
+
+_TRUE_STRINGS = frozenset({'true', '1', 'yes', 'on'})
+
+# Field name -> FieldSpec for every editable Project field
+FIELDS = {}
+
+
+class FieldSpec:
+    """An editable Project field: its coercer and who sees it"""
+    __slots__ = ('name', 'field', 'coerce', 'visibility')
+
+    def __init__(self, name, field, coerce, visibility):
+        self.name = name
+        self.field = field
+        self.coerce = coerce
+        self.visibility = visibility
+
+    def text(self, value):
+        """A coerced value as stored in the audit trail; coerce() reads it back"""
+        if value is None:
+            return ''
+        if isinstance(self.field, models.JSONField):
+            return json.dumps(value)
+        return str(value)
+
+    def __repr__(self):
+        return f'<FieldSpec {self.name} ({self.visibility})>'
+
+
+def _boolean(name, null):
+    def coerce(value):
+        if isinstance(value, str):
+            return value.lower() in _TRUE_STRINGS
+        return value if isinstance(value, bool) else bool(value)
+    return coerce
+
+
+def _integer(name, null, choices=None):
+    empty = None if null else 0
+    valid = frozenset(key for key, _ in choices) if choices else None
+
+    def coerce(value):
+        if value in ('', None):
+            return empty
+        try:
+            value = int(value)
+        except (ValueError, TypeError):
+            raise ValueError(f'Invalid integer value for {name}')
+        if valid is not None and value not in valid:
+            raise ValueError('Invalid choice')
+        return value
+    return coerce
+
+
+def _choice(name, null, choices):
+    valid = frozenset(key for key, _ in choices) | ({None} if null else set())
+
+    def coerce(value):
+        try:
+            if value != '' and value not in valid:
+                raise ValueError('Invalid choice')
+        except TypeError:  # Unhashable JSON: a list or object
+            raise ValueError('Invalid choice')
+        return value
+    return coerce
+
+
+def _date(name, null):
+    def coerce(value):
+        if value in ('', None):
+            if null:
+                return None
+            raise ValueError(f'{name} cannot be empty')
+        if isinstance(value, datetime):
+            return value.date()
+        if isinstance(value, date):
+            return value
+        try:
+            parsed = parse_date(value) or parse_datetime(value)
+        except (ValueError, TypeError):
+            parsed = None
+        if parsed is None:
+            raise ValueError(f'Invalid date format for {name}')
+        return parsed.date() if isinstance(parsed, datetime) else parsed
+    return coerce
+
+
+def _datetime(name, null):
+    def coerce(value):
+        if value in ('', None):
+            if null:
+                return None
+            raise ValueError(f'{name} cannot be empty')
+        if not isinstance(value, datetime):
+            try:
+                # 'YYYY-MM-DD' means midnight; also 'YYYY-MM-DDTHH:MM' (datetime-local) and ISO 8601
+                parsed = parse_datetime(value)
+                if parsed is None and (day := parse_date(value)) is not None:
+                    parsed = datetime(day.year, day.month, day.day)
+            except (ValueError, TypeError):
+                parsed = None
+            if parsed is None:
+                raise ValueError(f'Invalid date format for {name}')
+            value = parsed
+        if timezone.is_naive(value):
+            # Dates are entered in the studio's timezone
+            value = timezone.make_aware(value, timezone.get_current_timezone())
+        return value
+    return coerce
+
+
+def _json(name, null):
+    def coerce(value):
+        if isinstance(value, str):
+            try:
+                return json.loads(value)
+            except ValueError:
+                raise ValueError(f'Invalid JSON for {name}')
+        return value
+    return coerce
+
+
+def _text(name, null):
+    def coerce(value):
+        # Numbers are stored as their text; lists and objects would be stored as a Python repr
+        if value is not None and not isinstance(value, (str, int, float)):
+            raise ValueError(f'Invalid text value for {name}')
+        return value
+    return coerce
+
+
+def _coercer(field):
+    if isinstance(field, models.BooleanField):
+        return _boolean(field.name, field.null)
+    if isinstance(field, models.IntegerField):  # Includes the positive/small/big variants
+        return _integer(field.name, field.null, field.flatchoices)
+    if field.choices:
+        return _choice(field.name, field.null, field.flatchoices)
+    if isinstance(field, models.DateTimeField):  # Before DateField, its parent class
+        return _datetime(field.name, field.null)
+    if isinstance(field, models.DateField):
+        return _date(field.name, field.null)
+    if isinstance(field, models.JSONField):
+        return _json(field.name, field.null)
+    return _text(field.name, field.null)
+
+
+def _visibility(name):
+    if name in BYPASS_APPROVAL_FIELDS:
+        return 'bypass'
+    if name in ADMIN_ONLY_FIELDS:
+        return 'admin_only'
+    return 'client'
+
+
+def build_schema():
+    """Fill FIELDS from the Project model; called once from ProjectsConfig.ready()"""
+    from .models import Project
+
+    FIELDS.clear()
+    for field in Project._meta.concrete_fields:
+        if field.name in SERVER_MANAGED_FIELDS or field.primary_key:
+            continue
+        FIELDS[field.name] = FieldSpec(field.name, field, _coercer(field), _visibility(field.name))
+    return FIELDS
@@ -0,0 +1,104 @@
+"""
+Model signal handlers for the projects app
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import invalidate
+from .events import publish, publish_pending, publish_reviews
+from .media import is_video
+from .models import File, FileBlob, FilePreview, Project, ProjectModification, User
+from .timeline import refresh_calendar
+
+
+@receiver(post_delete, sender=File)
+def release_file_blob(sender, instance, **kwargs):
+    """Drop the deleted file's reference to its shared blob"""
+    if instance.blob_id:
+        FileBlob.objects.release(instance.blob_id)
+
+
+@receiver(post_save, sender=File)
+def queue_file_preview(sender, instance, created, **kwargs):
+    """Queue preview generation for newly uploaded videos (see process_media)"""
+    if created and is_video(instance.display_name or instance.file.name):
+        FilePreview.objects.get_or_create(file=instance)
+
+
+@receiver(post_delete, sender=FilePreview)
+def delete_preview_files(sender, instance, **kwargs):
+    """Remove generated poster and proxy from storage"""
+    for field_file in (instance.poster, instance.proxy):
+        if field_file:
+            field_file.delete(save=False)
+
+
+@receiver([post_save, post_delete], sender=Project)
+@receiver([post_save, post_delete], sender=ProjectModification)
+def invalidate_project_cache(sender, **kwargs):
+    """Dashboard lists and pending modifications are cached in the 'projects' namespace"""
+    invalidate('projects')
+
+
+@receiver(post_save, sender=Project)
+def refresh_project_calendar(sender, instance, created, **kwargs):
+    """Calendar entries follow the project's dates, name and status (see timeline.py)"""
+    current = instance.calendar_snapshot()
+    if created or getattr(instance, 'loaded_calendar', None) != current:
+        refresh_calendar([instance.pk])
+    instance.loaded_calendar = current
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_cache(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Admin recipients and request users are cached per 'users'; dashboard cards
+    show user names, so 'projects' only when a name or email changed. Sign-ins
+    (a last_login-only save) change neither.
+    """
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    current = instance.display_snapshot()
+    if not created and getattr(instance, 'loaded_display', None) != current:
+        invalidate('users', 'projects')
+    else:
+        invalidate('users')
+    instance.loaded_display = current
+
+
+@receiver(post_delete, sender=User)
+def invalidate_deleted_user_cache(sender, **kwargs):
+    invalidate('users', 'projects')
+
+
+@receiver(post_save, sender=ProjectModification)
+def publish_modification_event(sender, instance, created, **kwargs):
+    """Live updates: new change requests for admins, reviews for everyone"""
+    if created and instance.status == 'PENDING':
+        publish_pending([instance], actor=instance.created_by)
+    elif not created and instance.status in ('APPROVED', 'REJECTED'):
+        publish_reviews([instance], instance.approved_by)
+
+
+@receiver(post_save, sender=File)
+def publish_file_event(sender, instance, created, **kwargs):
+    """Live updates: a file was added to the project"""
+    if created:
+        publish(instance.project, 'file.added', {
+            'file_id': instance.pk,
+            'name': instance.display_name,
+            'size_bytes': instance.size_bytes,
+        }, actor=instance.uploaded_by)
+
+
+@receiver(post_save, sender=Project)
+def publish_progress_event(sender, instance, created, **kwargs):
+    """Live updates: status or editing progress changed through save()"""
+    loaded = getattr(instance, 'loaded_progress', None)
+    if created or loaded is None:
+        return
+    current = instance.progress_snapshot()
+    changed = {name: value for name, value in current.items() if loaded.get(name, value) != value}
+    instance.loaded_progress = current
+    if changed:
+        publish(instance, 'progress.changed', changed)
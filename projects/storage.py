@@ -0,0 +1,62 @@
+"""
+Storage helpers: S3-compatible backend, presigned URLs and backup offload
+
+The backend is selected with STORAGE_BACKEND in settings. With 'local'
+everything stays under MEDIA_ROOT and is streamed by Django; with 's3' files
+live in an S3-compatible bucket (AWS, MinIO, ...) and downloads are served
+through short-lived presigned URLs.
+"""
+from django.conf import settings
+from django.core.files.storage import InvalidStorageError, storages
+from django.utils.http import content_disposition_header
+
+try:
+    from boto3.s3.transfer import TransferConfig
+    from storages.backends.s3 import S3Storage
+except ImportError:  # Only required when STORAGE_BACKEND = 's3'
+    S3Storage = None
+
+
+MB = 1024 * 1024
+
+
+if S3Storage is not None:
+    class MediaS3Storage(S3Storage):
+        """S3 storage with multipart transfers sized for multi-GB video exports"""
+
+        def __init__(self, **options):
+            super().__init__(**options)
+            self.transfer_config = TransferConfig(
+                multipart_threshold=getattr(settings, 'S3_MULTIPART_THRESHOLD_MB', 64) * MB,
+                multipart_chunksize=getattr(settings, 'S3_MULTIPART_CHUNK_MB', 64) * MB,
+                max_concurrency=getattr(settings, 'S3_MAX_CONCURRENCY', 8),
+                use_threads=True,
+            )
+
+
+def is_remote(storage):
+    """True for object storage that can hand out presigned URLs"""
+    return S3Storage is not None and isinstance(storage, S3Storage)
+
+
+def presigned_url(storage, name, filename=None, expire=None):
+    """
+    Return a time-limited direct URL for a file in remote storage, or None
+    when the file is on local storage and must be streamed by Django.
+    Passing `filename` makes the browser save it as an attachment.
+    """
+    if not is_remote(storage):
+        return None
+
+    parameters = {}
+    if filename:
+        parameters['ResponseContentDisposition'] = content_disposition_header(True, filename)
+    return storage.url(name, parameters=parameters, expire=expire)
+
+
+def get_backup_storage():
+    """Return the storage backups are offloaded to, or None if only local backups are kept"""
+    try:
+        return storages['backups']
+    except InvalidStorageError:
+        return None
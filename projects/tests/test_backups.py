@@ -0,0 +1,139 @@
+"""
+Backup catalog and grandfather-father-son retention
+
+select_backups_to_prune() keeps the newest run of each of the last N days,
+ISO weeks and months, in the studio's time zone. BackupCatalog changes re-read
+the manifest under its lock, so catalogs opened on the same directory (e.g.
+the backup command and the admin page) keep each other's entries. SQLite
+backups include commits still in the write-ahead log.
+"""
+import shutil
+import sqlite3
+import tempfile
+from pathlib import Path
+from datetime import datetime, timezone as dt_timezone
+
+from django.test import SimpleTestCase
+from django.utils import timezone
+
+from projects.backups import (
+    BACKUP_PREFIX, MANIFEST_LOCK_NAME, MANIFEST_NAME, BackupCatalog, _write_sqlite_backup, file_checksum,
+    select_backups_to_prune,
+)
+
+
+def entry(created_at, ext='json', name=None):
+    return {
+        'name': name or f'{BACKUP_PREFIX}{created_at:%Y%m%d_%H%M%S}.{ext}',
+        'type': ext.upper(),
+        'size_bytes': 1,
+        'checksum': '',
+        'duration_ms': None,
+        'created_at': created_at.isoformat(),
+    }
+
+
+def utc(*args):
+    return datetime(*args, tzinfo=dt_timezone.utc)
+
+
+def pruned_times(entries, **policy):
+    retention = {'daily': 0, 'weekly': 0, 'monthly': 0, **policy}
+    return sorted(e['created_at'] for e in select_backups_to_prune(entries, retention))
+
+
+class RetentionTests(SimpleTestCase):
+
+    def setUp(self):
+        self.enterContext(timezone.override('UTC'))
+
+    def test_daily_keeps_the_newest_run_of_each_recent_day(self):
+        runs = [utc(2026, 3, 1, 8), utc(2026, 3, 1, 20), utc(2026, 3, 2, 8), utc(2026, 3, 3, 8), utc(2026, 3, 4, 2),
+                utc(2026, 3, 4, 23, 59)]
+        pruned = pruned_times([entry(run) for run in runs], daily=3)
+        self.assertEqual(pruned, [run.isoformat() for run in (runs[0], runs[1], runs[4])])
+
+    def test_weekly_buckets_split_between_sunday_and_monday(self):
+        # Sunday 1 March 2026 closes ISO week 9; Monday 2 March opens week 10
+        runs = [utc(2026, 2, 23, 9), utc(2026, 2, 28, 10), utc(2026, 3, 1, 23), utc(2026, 3, 2, 1)]
+        pruned = pruned_times([entry(run) for run in runs], weekly=2)
+        self.assertEqual(pruned, [run.isoformat() for run in runs[:2]])
+
+    def test_monthly_buckets_split_at_the_first_of_the_month(self):
+        runs = [utc(2026, 2, 28, 12), utc(2026, 3, 15, 12), utc(2026, 3, 31, 23), utc(2026, 4, 1, 0, 30)]
+        pruned = pruned_times([entry(run) for run in runs], monthly=2)
+        self.assertEqual(pruned, [run.isoformat() for run in runs[:2]])
+
+    def test_periods_keep_the_union_of_their_runs(self):
+        runs = [utc(2026, 1, 10, 12), utc(2026, 2, 10, 12), utc(2026, 3, 2, 12), utc(2026, 3, 9, 12), utc(2026, 3, 10, 12)]
+        pruned = pruned_times([entry(run) for run in runs], daily=1, weekly=2, monthly=2)
+        # Day: 10 March; weeks: 10 March, 2 March; months: March (10th), February
+        self.assertEqual(pruned, [run.isoformat() for run in (runs[0], runs[3])])
+
+    def test_buckets_follow_the_local_date(self):
+        # 22:30 UTC on 31 July is already 1 August in Bucharest
+        runs = [utc(2026, 7, 31, 10), utc(2026, 7, 31, 22, 30)]
+        self.assertEqual(len(pruned_times([entry(run) for run in runs], monthly=2)), 1)
+        with timezone.override('Europe/Bucharest'):
+            self.assertEqual(pruned_times([entry(run) for run in runs], monthly=2), [])
+
+    def test_runs_are_pruned_whole_and_manual_backups_never(self):
+        old, new = utc(2026, 3, 1, 8), utc(2026, 3, 2, 8)
+        entries = [entry(old), entry(old, 'sqlite3'), entry(new), entry(new, 'sqlite3'),
+                   entry(old, name='before_upgrade.json')]
+        pruned = select_backups_to_prune(entries, {'daily': 1, 'weekly': 0, 'monthly': 0})
+        self.assertEqual(sorted(e['name'] for e in pruned), sorted(e['name'] for e in entries[:2]))
+
+
+class BackupCatalogTests(SimpleTestCase):
+
+    def setUp(self):
+        self.backup_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.backup_dir, ignore_errors=True)
+
+    def test_catalogs_on_one_directory_keep_each_others_entries(self):
+        command, page = BackupCatalog(self.backup_dir), BackupCatalog(self.backup_dir)
+        first, second = entry(utc(2026, 3, 1, 8)), entry(utc(2026, 3, 2, 8))
+        self.assertEqual(page.entries(), [])  # Loaded before the command's backup
+
+        command.add(first)
+        page.add(second)
+        command.remove('missing.json')
+        self.assertEqual([e['name'] for e in BackupCatalog(self.backup_dir).entries()],
+                         [second['name'], first['name']])
+
+        page.remove(first['name'])
+        self.assertEqual([e['name'] for e in BackupCatalog(self.backup_dir).entries()], [second['name']])
+
+    def test_manifest_is_replaced_without_leftover_temp_files(self):
+        catalog = BackupCatalog(self.backup_dir)
+        for day in range(1, 4):
+            catalog.add(entry(utc(2026, 3, day, 8)))
+        names = sorted(path.name for path in catalog.backup_dir.iterdir() if path.name != MANIFEST_LOCK_NAME)
+        self.assertEqual(names, [MANIFEST_NAME])
+
+
+class SQLiteBackupTests(SimpleTestCase):
+
+    def setUp(self):
+        self.work_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.work_dir, ignore_errors=True)
+
+    def test_backup_includes_commits_still_in_the_wal(self):
+        db_path, backup_path = self.work_dir / 'db.sqlite3', self.work_dir / 'backup.sqlite3'
+        connection = sqlite3.connect(db_path)
+        self.addCleanup(connection.close)
+        connection.execute('PRAGMA journal_mode=wal')
+        connection.execute('CREATE TABLE note (text TEXT)')
+        connection.execute("INSERT INTO note VALUES ('first dance at 21:00')")
+        connection.commit()
+        self.assertTrue((self.work_dir / 'db.sqlite3-wal').stat().st_size)  # Not checkpointed yet
+
+        checksum = _write_sqlite_backup(db_path, backup_path)  # The connection is still open
+
+        self.assertEqual(checksum, file_checksum(backup_path))
+        self.assertFalse((self.work_dir / 'backup.sqlite3-wal').exists())
+        backup = sqlite3.connect(backup_path)
+        self.addCleanup(backup.close)
+        self.assertEqual(backup.execute('SELECT text FROM note').fetchall(), [('first dance at 21:00',)])
+        self.assertEqual(backup.execute('PRAGMA journal_mode').fetchone(), ('delete',))
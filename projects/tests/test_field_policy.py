@@ -0,0 +1,90 @@
+"""
+Clients only write, and only see, the fields their policy allows
+
+Change requests for admin-only or admin-managed fields are refused (403) by
+both edit endpoints, so none is stored; rejected requests for admin-only
+fields stored earlier don't reveal the field's value in the client's feed.
+"""
+import json
+import logging
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from projects.models import Project, ProjectModification, User
+
+
+SECRET = 'Couple still owes the deposit'
+
+
+@override_settings(ALLOWED_HOSTS=['testserver'])
+class ClientFieldPolicyTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Views log every write at INFO, and Django every 403 at WARNING
+        cls.loggers = {name: logging.getLogger(name) for name in ('projects', 'django.request')}
+        cls.log_levels = {name: logger.level for name, logger in cls.loggers.items()}
+        for logger in cls.loggers.values():
+            logger.setLevel(logging.ERROR)
+
+    @classmethod
+    def tearDownClass(cls):
+        for name, logger in cls.loggers.items():
+            logger.setLevel(cls.log_levels[name])
+        super().tearDownClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user('admin@example.com', 'pw', first_name='Ana', role='ADMIN')
+        cls.client_user = User.objects.create_user('client@example.com', 'pw', first_name='Ion', role='CLIENT')
+        cls.project = Project.objects.create(
+            user=cls.client_user, type='NUNTA', title_video='Ana si Ion',
+            event_date=timezone.now() + timedelta(days=30), city='Cluj', critical_production_notes=SECRET,
+        )
+
+    def setUp(self):
+        self.client.force_login(self.client_user)
+
+    def post_json(self, url_name, payload):
+        return self.client.post(
+            reverse(url_name, args=[self.project.slug]), json.dumps(payload), content_type='application/json'
+        )
+
+    def test_autosave_of_a_field_outside_the_client_policy_is_forbidden(self):
+        for field_name, value in (('critical_production_notes', 'Mine'), ('price', 100), ('status', 'Completed')):
+            with self.subTest(field=field_name):
+                response = self.post_json('update_project_field', {'field_name': field_name, 'field_value': value})
+                self.assertEqual(response.status_code, 403)
+        self.assertFalse(ProjectModification.objects.exists())
+
+    def test_autosave_of_a_client_field_is_submitted(self):
+        response = self.post_json('update_project_field', {'field_name': 'city', 'field_value': 'Sibiu'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()['pending_approval'])
+
+    def test_batch_with_a_field_outside_the_client_policy_is_forbidden(self):
+        response = self.post_json('batch_update_project', {'city': 'Sibiu', 'critical_production_notes': 'Mine'})
+        self.assertEqual(response.status_code, 403)
+        self.assertIn('critical_production_notes', response.json()['error'])
+        self.assertFalse(ProjectModification.objects.exists())
+
+    def test_rejected_admin_only_request_hides_its_original_value(self):
+        for field_name, old_value in (('critical_production_notes', SECRET), ('city', 'Cluj')):
+            ProjectModification.objects.create(
+                project=self.project, field_name=field_name, old_value=old_value, new_value='Mine',
+                status='REJECTED', created_by=self.client_user, approved_by=self.admin, approved_at=timezone.now(),
+            )
+
+        response = self.client.get(reverse('rejected_modifications_feed', args=[self.project.slug]))
+        self.assertEqual(response.status_code, 200)
+        old_values = {mod['field_name']: mod['old_value'] for mod in response.json()['modifications']}
+        self.assertEqual(old_values, {'critical_production_notes': None, 'city': 'Cluj'})
+
+        response = self.client.get(reverse('project_detail', args=[self.project.slug]))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Original Value', count=1)  # Only for the city request
+        self.assertNotContains(response, SECRET)
@@ -0,0 +1,58 @@
+"""
+Reference counting of shared file content
+
+Files with the same SHA-256 share one FileBlob. Releasing a reference keeps
+the blob while another file uses it; the last release deletes the row and,
+once the transaction commits, the stored file.
+"""
+import hashlib
+import shutil
+import tempfile
+
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+
+from projects.models import FileBlob
+
+
+class FileBlobRefCountTests(TestCase):
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def acquire(self, content):
+        return FileBlob.objects.acquire(ContentFile(content, name='clip.bin'), hashlib.sha256(content).hexdigest())
+
+    def test_shared_blob_survives_until_its_last_release(self):
+        blob, created = self.acquire(b'same footage')
+        self.assertTrue(created)
+        shared, created = self.acquire(b'same footage')
+        self.assertFalse(created)
+        self.assertEqual((shared.pk, shared.ref_count), (blob.pk, 2))
+        storage, name = blob.file.storage, blob.file.name
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            FileBlob.objects.release(blob.pk)
+        self.assertEqual(callbacks, [])
+        self.assertEqual(FileBlob.objects.get(pk=blob.pk).ref_count, 1)
+        self.assertTrue(storage.exists(name))
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            FileBlob.objects.release(blob.pk)
+        self.assertEqual(len(callbacks), 1)
+        self.assertFalse(FileBlob.objects.filter(pk=blob.pk).exists())
+        self.assertFalse(storage.exists(name))
+
+        # Released twice over, e.g. by a retried delete: nothing left to do
+        FileBlob.objects.release(blob.pk)
+
+    def test_content_stored_again_after_its_last_release(self):
+        blob, _ = self.acquire(b'first cut')
+        FileBlob.objects.release(blob.pk)
+        again, created = self.acquire(b'first cut')
+        self.assertTrue(created)
+        self.assertEqual(again.ref_count, 1)
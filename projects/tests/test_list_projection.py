@@ -0,0 +1,78 @@
+"""
+List views must not read long text columns
+
+Dashboard and archive cards show a few short columns, so their projects are
+loaded through Project.objects.for_list(). A list view fails when any of its
+queries selects a TextField column, e.g. after a card starts showing one
+(the deferred column is then loaded with a query per project).
+"""
+import logging
+from io import StringIO
+
+from django.apps import apps
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection, models
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from projects.models import Project, User
+
+
+# (url name, role, query string)
+LIST_VIEWS = [
+    ('dashboard', 'admin', {}),
+    ('dashboard', 'admin', {'include_archived': 'on', 'search': 'a'}),
+    ('dashboard', 'client', {}),
+    ('archived_projects', 'admin', {}),
+]
+
+
+def text_columns():
+    """Every TextField of the app as it appears in SQL"""
+    return {
+        f'"{model._meta.db_table}"."{field.column}"'
+        for model in apps.get_app_config('projects').get_models()
+        for field in model._meta.concrete_fields
+        if isinstance(field, models.TextField)
+    }
+
+
+@override_settings(ALLOWED_HOSTS=['testserver'])
+class ListProjectionTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        logger = logging.getLogger('projects')
+        level = logger.level
+        logger.setLevel(logging.WARNING)
+        try:
+            call_command('seed_data', stdout=StringIO(), projects=4, clients=2, modifications=3, history=1, files=0, downloads=0)
+        finally:
+            logger.setLevel(level)
+        # Archive a project so the archive page renders a card too
+        archived = Project.objects.filter(slug__contains='(seed-').order_by('pk')[:1]
+        Project.objects.filter(pk__in=archived).update(is_archived=True)
+        cls.admin = User.objects.filter(role='ADMIN').order_by('pk').first()
+        cls.client_user = User.objects.get(email='seed-client-0@example.com')
+
+    def test_list_views_select_no_text_columns(self):
+        columns = text_columns()
+        users = {'admin': self.admin, 'client': self.client_user}
+        for url_name, role, params in LIST_VIEWS:
+            with self.subTest(view=url_name, role=role, params=params):
+                self.client.force_login(users[role])
+                cache.clear()  # The dashboard list is cached
+                with CaptureQueriesContext(connection) as queries:
+                    response = self.client.get(reverse(url_name), params)
+                self.assertEqual(response.status_code, 200)
+                self.assertTrue(response.context['projects'])
+
+                for query in queries.captured_queries:
+                    sql = query['sql']
+                    if not sql.startswith('SELECT'):
+                        continue
+                    selected = sql.split(' FROM ', 1)[0]
+                    found = sorted(column for column in columns if column in selected)
+                    self.assertFalse(found, f'{url_name}[{role}] selects text columns {found}:\n{sql}')
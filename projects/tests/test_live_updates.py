@@ -0,0 +1,51 @@
+"""
+Live updates are only streamed when the site is served through ASGI
+
+Under WSGI every open stream would hold a worker thread for SSE_MAX_SECONDS,
+so pages don't subscribe and the stream endpoint answers 204 (which also
+stops EventSource from reconnecting), unless SSE_WSGI opts in.
+"""
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from projects.models import Project, User
+
+
+@override_settings(ALLOWED_HOSTS=['testserver'])
+class LiveUpdatesTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.client_user = User.objects.create_user('client@example.com', 'pw', first_name='Ion', role='CLIENT')
+        cls.project = Project.objects.create(
+            user=cls.client_user, type='NUNTA', title_video='Ana si Ion', event_date=timezone.now() + timedelta(days=30),
+        )
+
+    def setUp(self):
+        self.client.force_login(self.client_user)
+        self.async_client.force_login(self.client_user)
+
+    def test_wsgi_pages_do_not_subscribe_and_the_stream_answers_204(self):
+        for url in (reverse('dashboard'), reverse('project_detail', args=[self.project.slug])):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertFalse(response.context['live_updates'])
+        response = self.client.get(reverse('project_events', args=[self.project.slug]))
+        self.assertEqual(response.status_code, 204)
+
+    @override_settings(SSE_WSGI=True)
+    def test_wsgi_streams_when_opted_in(self):
+        self.assertTrue(self.client.get(reverse('dashboard')).context['live_updates'])
+        response = self.client.get(reverse('project_events', args=[self.project.slug]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        response.close()  # Without reading the stream, which runs for SSE_MAX_SECONDS
+
+    async def test_asgi_pages_subscribe(self):
+        response = await self.async_client.get(reverse('dashboard'))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context['live_updates'])
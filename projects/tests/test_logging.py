@@ -0,0 +1,48 @@
+"""
+LOGGING in settings must configure on every supported Python
+
+From 3.12 dictConfig treats QueueHandler subclasses specially, so the
+background queue handler is built through a '()' factory with its own
+`targets` argument. Records must still reach the console handler.
+"""
+import logging
+import logging.config
+from io import StringIO
+
+from django.conf import settings
+from django.test import SimpleTestCase
+
+from projects.log import BackgroundHandler
+
+
+class LoggingConfigTests(SimpleTestCase):
+
+    def setUp(self):
+        logging.config.dictConfig(settings.LOGGING)
+        self.addCleanup(logging.config.dictConfig, settings.LOGGING)  # Fresh handlers for later tests
+
+    def test_records_reach_the_console_through_the_queue(self):
+        logger = logging.getLogger('projects')
+        [handler] = logger.handlers
+        self.assertIsInstance(handler, BackgroundHandler)
+        self.assertEqual(logging.getLogger().handlers, [handler])  # One queue shared with the root logger
+        [console] = handler.targets
+        self.assertIsInstance(console, logging.StreamHandler)
+
+        stream = StringIO()
+        console.setStream(stream)
+        logger.warning('Backup failed', extra={'backup': 'daily'})
+        handler.stop()  # Drains the queue
+        self.assertIn('Backup failed', stream.getvalue())
+        self.assertIn('backup=daily', stream.getvalue())
+
+    def test_listener_restarts_after_stop(self):
+        handler = logging.getLogger('projects').handlers[0]
+        stream = StringIO()
+        handler.targets[0].setStream(stream)
+        logger = logging.getLogger('projects')
+        logger.warning('First')
+        handler.stop()
+        logger.warning('Second')
+        handler.stop()
+        self.assertEqual(stream.getvalue().count('WARNING'), 2)
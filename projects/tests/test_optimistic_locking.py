@@ -0,0 +1,130 @@
+"""
+Optimistic locking of project edits
+
+Autosaves and batch saves send the version the page loaded and the values it
+showed for the fields being saved. A stale version alone must not reject a
+save whose fields nobody else changed (field-level compare-and-set); a field
+someone else changed meanwhile answers 409. Bookkeeping writes (notification
+flags, guidance state) don't move the version at all.
+"""
+import json
+import logging
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from projects.models import Project, User
+
+
+@override_settings(ALLOWED_HOSTS=['testserver'])
+class OptimisticLockingTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Views log every write at INFO, and Django every 409 at WARNING
+        cls.loggers = {name: logging.getLogger(name) for name in ('projects', 'django.request')}
+        cls.log_levels = {name: logger.level for name, logger in cls.loggers.items()}
+        for logger in cls.loggers.values():
+            logger.setLevel(logging.ERROR)
+
+    @classmethod
+    def tearDownClass(cls):
+        for name, logger in cls.loggers.items():
+            logger.setLevel(cls.log_levels[name])
+        super().tearDownClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user('admin@example.com', 'pw', first_name='Ana', role='ADMIN')
+        cls.client_user = User.objects.create_user('client@example.com', 'pw', first_name='Ion', role='CLIENT')
+        cls.project = Project.objects.create(
+            user=cls.client_user, type='NUNTA', title_video='Ana si Ion',
+            event_date=timezone.now() + timedelta(days=30), notes='Loaded notes', city='Cluj',
+        )
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+        self.project.refresh_from_db()
+
+    def post_json(self, url_name, payload, user=None):
+        if user is not None:
+            self.client.force_login(user)
+        return self.client.post(
+            reverse(url_name, args=[self.project.slug]), json.dumps(payload), content_type='application/json'
+        )
+
+    def autosave(self, field_name, value, version, **extra):
+        return self.post_json('update_project_field', {
+            'field_name': field_name, 'field_value': value, 'version': version, **extra,
+        })
+
+    def test_autosave_at_current_version(self):
+        response = self.autosave('notes', 'First', self.project.version)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['version'], self.project.version + 1)
+
+    def test_bookkeeping_writes_keep_the_version(self):
+        version = self.project.version
+        self.assertEqual(self.post_json('dismiss_guidance', {'message_type': 'initial'}, self.client_user).status_code, 200)
+        self.assertEqual(self.post_json('clear_notification', {}, self.admin).status_code, 200)
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.version, version)
+
+        # So an autosave carrying only the version still goes through
+        response = self.autosave('notes', 'After dismissing', version)
+        self.assertEqual(response.status_code, 200)
+
+    def test_stale_version_merges_when_the_field_is_unchanged(self):
+        version = self.project.version
+        self.assertEqual(self.autosave('city', 'Sibiu', version).status_code, 200)  # Someone else's edit
+
+        response = self.autosave('notes', 'Mine', version, expected_value='Loaded notes')
+        self.assertEqual(response.status_code, 200)
+        self.project.refresh_from_db()
+        self.assertEqual((self.project.city, self.project.notes), ('Sibiu', 'Mine'))
+
+    def test_stale_version_conflicts_when_the_field_changed(self):
+        version = self.project.version
+        self.assertEqual(self.autosave('notes', 'Theirs', version).status_code, 200)
+
+        response = self.autosave('notes', 'Mine', version, expected_value='Loaded notes')
+        self.assertEqual(response.status_code, 409)
+        data = response.json()
+        self.assertTrue(data['conflict'])
+        self.assertEqual(data['version'], version + 1)
+        self.assertEqual(data['current_values'], {'notes': 'Theirs'})
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.notes, 'Theirs')
+
+    def test_stale_version_without_expected_value_conflicts(self):
+        version = self.project.version
+        self.assertEqual(self.autosave('city', 'Sibiu', version).status_code, 200)
+        self.assertEqual(self.autosave('notes', 'Mine', version).status_code, 409)
+
+    def test_batch_merges_when_its_fields_are_unchanged(self):
+        version = self.project.version
+        self.assertEqual(self.autosave('city', 'Sibiu', version).status_code, 200)
+
+        response = self.post_json('batch_update_project', {
+            'notes': 'Batch', 'team_operator': 2,
+            '_version': version, '_expected': {'notes': 'Loaded notes', 'team_operator': 0},
+        })
+        self.assertEqual(response.status_code, 200)
+        self.project.refresh_from_db()
+        self.assertEqual((self.project.city, self.project.notes, self.project.team_operator), ('Sibiu', 'Batch', 2))
+
+    def test_batch_conflicts_when_one_of_its_fields_changed(self):
+        version = self.project.version
+        self.assertEqual(self.autosave('notes', 'Theirs', version).status_code, 200)
+
+        response = self.post_json('batch_update_project', {
+            'notes': 'Batch', 'team_operator': 2,
+            '_version': version, '_expected': {'notes': 'Loaded notes', 'team_operator': 0},
+        })
+        self.assertEqual(response.status_code, 409)
+        self.assertTrue(response.json()['conflict'])
+        self.project.refresh_from_db()
+        self.assertEqual((self.project.notes, self.project.team_operator), ('Theirs', 0))
@@ -0,0 +1,97 @@
+"""
+Change requests submitted concurrently for the same field
+
+SQLite ignores select_for_update(), so another submission can record a PENDING
+request between submit_pending()'s read and its insert. The insert then trips
+one_pending_modification_per_field; the submission is read and written again,
+superseding the rival, and answered with a 409 only if every attempt loses.
+"""
+import json
+import logging
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from projects import pending
+from projects.models import Project, ProjectModification, User
+from projects.pending import SUBMIT_ATTEMPTS
+
+
+@override_settings(ALLOWED_HOSTS=['testserver'])
+class ConcurrentSubmissionTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Views log every write at INFO, and Django every 409 at WARNING
+        cls.loggers = {name: logging.getLogger(name) for name in ('projects', 'django.request')}
+        cls.log_levels = {name: logger.level for name, logger in cls.loggers.items()}
+        for logger in cls.loggers.values():
+            logger.setLevel(logging.ERROR)
+
+    @classmethod
+    def tearDownClass(cls):
+        for name, logger in cls.loggers.items():
+            logger.setLevel(cls.log_levels[name])
+        super().tearDownClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.client_user = User.objects.create_user('client@example.com', 'pw', first_name='Ion', role='CLIENT')
+        cls.project = Project.objects.create(
+            user=cls.client_user, type='NUNTA', title_video='Ana si Ion',
+            event_date=timezone.now() + timedelta(days=30), city='Cluj',
+        )
+
+    def setUp(self):
+        self.client.force_login(self.client_user)
+
+    def rival_after_read(self, stale_reads):
+        """
+        Record a rival PENDING city request that the first `stale_reads` reads
+        miss, as if it committed between each of those reads and the insert
+        """
+        ProjectModification.objects.create(
+            project=self.project, field_name='city', old_value='Cluj', new_value='Rival',
+            created_by=self.client_user, status='PENDING',
+        )
+        active_requests = pending._active_requests
+        reads = []
+
+        def read(*args):
+            reads.append(args)
+            return {} if len(reads) <= stale_reads else active_requests(*args)
+
+        return mock.patch('projects.pending._active_requests', side_effect=read)
+
+    def post_json(self, url_name, payload):
+        return self.client.post(
+            reverse(url_name, args=[self.project.slug]), json.dumps(payload), content_type='application/json'
+        )
+
+    def city_requests(self):
+        return list(ProjectModification.objects.filter(field_name='city').order_by('pk').values_list('new_value', 'status'))
+
+    def test_submission_retries_after_losing_the_race(self):
+        with self.rival_after_read(1):
+            response = self.post_json('update_project_field', {'field_name': 'city', 'field_value': 'Sibiu'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()['pending_approval'])
+        self.assertEqual(self.city_requests(), [('Rival', 'SUPERSEDED'), ('Sibiu', 'PENDING')])
+
+    def test_autosave_answers_409_when_every_attempt_loses(self):
+        with self.rival_after_read(SUBMIT_ATTEMPTS):
+            response = self.post_json('update_project_field', {'field_name': 'city', 'field_value': 'Sibiu'})
+        self.assertEqual(response.status_code, 409)
+        self.assertTrue(response.json()['conflict'])
+        self.assertEqual(self.city_requests(), [('Rival', 'PENDING')])
+
+    def test_batch_answers_409_instead_of_claiming_submission(self):
+        with self.rival_after_read(SUBMIT_ATTEMPTS):
+            response = self.post_json('batch_update_project', {'city': 'Sibiu'})
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['current_values'], {'city': 'Cluj'})
+        self.assertEqual(self.city_requests(), [('Rival', 'PENDING')])
@@ -0,0 +1,268 @@
+"""
+Query-count regression tests
+
+Each view in SCENARIOS is requested as admin and/or client against seeded
+data at two sizes. That is every view except sign-in and sign-out, the backup
+restore/download/delete actions, change_client_data and delete_project. A
+view fails when:
+
+- its query count grows with the amount of data (an N+1 loop), or
+- it runs more queries than recorded in query_baseline.json. The failure
+  shows a diff between the recorded SQL and the SQL the view runs now.
+
+After an intentional change, regenerate the baseline and commit it:
+
+    UPDATE_QUERY_BASELINE=1 python manage.py test projects.tests.test_query_counts
+"""
+import difflib
+import json
+import logging
+import os
+import re
+import shutil
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from projects.forms import ProjectDetailForm
+from projects.models import File, FileDownloadEvent, FilePreview, Project, ProjectModification, User
+
+
+BASELINE_PATH = Path(__file__).with_name('query_baseline.json')
+
+# seed_data options for the two dataset sizes; the large one has more
+# projects *and* more rows per project so both kinds of N+1 show up
+SIZES = {
+    'small': {'projects': 4, 'clients': 2, 'modifications': 3, 'history': 2, 'files': 1, 'downloads': 1},
+    'large': {'projects': 16, 'clients': 2, 'modifications': 12, 'history': 8, 'files': 4, 'downloads': 3},
+}
+
+# (name, role, method, url name, url args, payload)
+# url args are attribute names resolved on the fixture (see Fixture); a
+# callable payload is called with the fixture; a get payload is the query string.
+# A 'stream' is a get whose body isn't read: the event stream runs for
+# SSE_MAX_SECONDS, so only the queries made before it starts are counted
+SCENARIOS = [
+    ('dashboard', 'admin', 'get', 'dashboard', (), None),
+    ('dashboard', 'client', 'get', 'dashboard', (), None),
+    ('project_detail', 'admin', 'get', 'project_detail', ('slug',), None),
+    ('project_detail', 'client', 'get', 'project_detail', ('slug',), None),
+    ('archived_projects', 'admin', 'get', 'archived_projects', (), None),
+    ('delivery_status', 'admin', 'get', 'delivery_status', (), None),
+    ('calendar_month', 'admin', 'get', 'calendar_month', ('year', 'month'), {'months': 12}),
+    ('calendar_week', 'admin', 'get', 'calendar_week', ('year', 'week'), None),
+    ('create_project', 'admin', 'get', 'create_project', (), None),
+    ('performance_stats', 'admin', 'get', 'performance_stats', (), None),
+    ('get_field_history', 'admin', 'get', 'get_field_history', ('slug', 'history_field'), None),
+    ('get_field_history', 'client', 'get', 'get_field_history', ('slug', 'history_field'), None),
+    ('download_file', 'admin', 'get', 'download_file', ('file_id',), None),
+    ('download_file', 'client', 'get', 'download_file', ('file_id',), None),
+    ('file_preview', 'admin', 'get', 'file_preview', ('file_id', 'preview_kind'), None),
+    ('file_preview', 'client', 'get', 'file_preview', ('file_id', 'preview_kind'), None),
+    ('project_events', 'admin', 'stream', 'project_events', ('slug',), None),
+    ('project_events', 'client', 'stream', 'project_events', ('slug',), None),
+    ('performance_metrics', 'admin', 'get', 'performance_metrics', (), None),
+    ('backup_database', 'admin', 'get', 'backup_management', (), None),
+    ('update_project_field', 'admin', 'json', 'update_project_field', ('slug',),
+     {'field_name': 'notes', 'field_value': 'Admin note'}),
+    ('update_project_field', 'client', 'json', 'update_project_field', ('slug',),
+     {'field_name': 'city', 'field_value': 'Sibiu'}),
+    ('batch_update_project', 'admin', 'json', 'batch_update_project', ('slug',),
+     {'package_4k': True, 'team_operator': 1, 'notes': 'Batch'}),
+    ('batch_update_project', 'client', 'json', 'batch_update_project', ('slug',),
+     {'notes': 'Client batch', 'city': 'Brasov'}),
+    ('update_field_order', 'admin', 'json', 'update_field_order', ('slug',),
+     {'field_order': ['prep', 'church', 'session', 'restaurant']}),
+    ('project_detail_form', 'client', 'post', 'project_detail', ('slug',),
+     lambda fixture: {**fixture.form_values, 'update_project': '1', 'city': 'Sibiu', 'notes': 'Client note'}),
+    ('rejected_modifications_feed', 'client', 'get', 'rejected_modifications_feed', ('slug',), None),
+    ('dismiss_guidance', 'client', 'json', 'dismiss_guidance', ('slug',), {'message_type': 'initial'}),
+    ('approve_modification', 'admin', 'post', 'approve_modification', ('modification_id',), {'action': 'approve'}),
+    ('review_modifications', 'admin', 'json', 'review_modifications', (),
+     lambda fixture: {'approve': fixture.review_ids[:2], 'reject': fixture.review_ids[2:], 'notes': 'Not possible'}),
+    ('clear_notification', 'admin', 'post', 'clear_notification', ('slug',), {}),
+    ('archive_project', 'admin', 'get', 'archive_project', ('archive_slug',), None),
+    ('notify_client', 'admin', 'json', 'notify_client', ('slug',), {'force': True}),
+    # Last: it changes the client's password, which ends the client's session
+    ('send_credentials', 'admin', 'json', 'send_credentials', ('slug',), {}),
+]
+
+_LITERALS = [
+    (re.compile(r"'(?:[^']|'')*'"), "'?'"),
+    (re.compile(r'\b\d+(\.\d+)?\b'), '?'),
+    (re.compile(r'\(\?(, \?)+\)'), '(?, ...)'),
+]
+
+
+def normalize_sql(sql):
+    """Replace literals so the same query shape compares equal across runs and sizes"""
+    for pattern, replacement in _LITERALS:
+        sql = pattern.sub(replacement, sql)
+    return sql
+
+
+def scenario_key(name, role):
+    return f'{name}[{role}]'
+
+
+class Fixture:
+    """The rows the scenarios act on, chosen from the seeded data"""
+
+    def __init__(self):
+        self.admin = User.objects.filter(role='ADMIN').order_by('pk').first()
+        self.client_user = User.objects.get(email='seed-client-0@example.com')
+        projects = Project.objects.filter(user=self.client_user, slug__contains='(seed-').order_by('pk')
+        self.project, self.archive_target = projects[0], projects[1]
+        self.slug = self.project.slug
+        self.archive_slug = self.archive_target.slug
+        self.history_field = 'notes'
+        # The calendar from the measured project's event on
+        event_day = timezone.localdate(self.project.event_date)
+        self.year, self.month = event_day.year, event_day.month
+        self.week = event_day.isocalendar().week
+        # The project page form as loaded (unchecked boxes are not submitted)
+        self.form_values = {
+            name: value for name, value in ProjectDetailForm(instance=self.project).initial.items()
+            if value is not None and value is not False
+        }
+
+        # Cycle every status over the measured project's modifications so each
+        # template branch renders a number of rows that grows with the size
+        # (only the latest pending request per field stays active)
+        statuses = ['PENDING', 'APPROVED', 'REJECTED', 'AUTO_APPLIED']
+        modifications = list(self.project.modifications.order_by('pk'))
+        active = {}
+        for i, modification in enumerate(modifications):
+            modification.status = statuses[i % len(statuses)]
+            reviewed = modification.status in ('APPROVED', 'REJECTED')
+            modification.approved_by = self.admin if reviewed else None
+            if modification.status == 'PENDING':
+                if modification.field_name in active:
+                    active[modification.field_name].status = 'SUPERSEDED'
+                active[modification.field_name] = modification
+        ProjectModification.objects.bulk_update(modifications, ['status', 'approved_by'])
+
+        # First downloads take a different branch than repeats, so start clean
+        self.file_id = File.objects.filter(project=self.project).values_list('pk', flat=True).first()
+        FileDownloadEvent.objects.filter(file_id=self.file_id).delete()
+        self.preview_kind = 'poster'
+        FilePreview.objects.update_or_create(file_id=self.file_id, defaults={
+            'status': 'READY', 'poster': ContentFile(b'poster', name='poster.jpg'),
+        })
+        # Requests to review, on fields the seeded ones don't use
+        self.modification_id = ProjectModification.objects.create(
+            project=self.project, field_name='prep', old_value='', new_value='Hotel Continental',
+            created_by=self.client_user, status='PENDING',
+        ).pk
+        self.review_ids = [
+            ProjectModification.objects.create(
+                project=self.project, field_name=field_name, old_value='', new_value=value,
+                created_by=self.client_user, status='PENDING',
+            ).pk
+            for field_name, value in (('session', 'City park'), ('details_extra', 'Drone shots'), ('main_details', 'Two ceremonies'))
+        ]
+
+
+@override_settings(ALLOWED_HOSTS=['testserver'], SSE_WSGI=True)
+class QueryCountTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.media_root = tempfile.mkdtemp()
+        cls.media_override = override_settings(MEDIA_ROOT=cls.media_root)
+        cls.media_override.enable()
+        # The backup page reads its catalog from here rather than the project's backups/
+        cls.backup_dir_patch = mock.patch(
+            'projects.backups.get_backup_dir', return_value=Path(cls.media_root) / 'backups'
+        )
+        cls.backup_dir_patch.start()
+        cls.logger = logging.getLogger('projects')
+        cls.log_level = cls.logger.level
+        cls.logger.setLevel(logging.WARNING)  # Views log every write at INFO
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.logger.setLevel(cls.log_level)
+        cls.backup_dir_patch.stop()
+        cls.media_override.disable()
+        shutil.rmtree(cls.media_root, ignore_errors=True)
+        super().tearDownClass()
+
+    def measure_size(self, size):
+        """Seed one dataset size inside a rolled-back savepoint and capture each scenario's SQL"""
+        captured = {}
+        with transaction.atomic():
+            call_command('seed_data', stdout=StringIO(), **SIZES[size])
+            fixture = Fixture()
+            clients = {'admin': self.client_class(), 'client': self.client_class()}
+            clients['admin'].force_login(fixture.admin)
+            clients['client'].force_login(fixture.client_user)
+
+            for name, role, method, url_name, arg_names, payload in SCENARIOS:
+                url = reverse(url_name, args=[getattr(fixture, arg) for arg in arg_names])
+                http = clients[role]
+                if callable(payload):
+                    payload = payload(fixture)
+                cache.clear()  # Measure the uncached path so counts are deterministic
+                with CaptureQueriesContext(connection) as queries:
+                    if method == 'json':
+                        response = http.post(url, data=json.dumps(payload), content_type='application/json')
+                    elif method == 'post':
+                        response = http.post(url, data=payload)
+                    else:
+                        response = http.get(url, payload)
+                    if response.streaming and method != 'stream':
+                        b''.join(response.streaming_content)
+                    response.close()
+
+                self.assertLess(response.status_code, 400, f'{scenario_key(name, role)} returned {response.status_code}')
+                captured[scenario_key(name, role)] = [
+                    normalize_sql(query['sql']) for query in queries.captured_queries
+                    # Savepoints come from the test transaction, not the view
+                    if not query['sql'].startswith(('SAVEPOINT', 'RELEASE SAVEPOINT', 'ROLLBACK TO SAVEPOINT'))
+                ]
+            transaction.set_rollback(True)
+        return captured
+
+    def test_query_counts(self):
+        small = self.measure_size('small')
+        large = self.measure_size('large')
+
+        if os.environ.get('UPDATE_QUERY_BASELINE'):
+            BASELINE_PATH.write_text(json.dumps(
+                {key: {'count': len(sql), 'sql': sql} for key, sql in sorted(large.items())},
+                indent=2
+            ) + '\n')
+
+        baseline = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+
+        for key, sql in large.items():
+            with self.subTest(view=key):
+                self.assertEqual(
+                    len(sql), len(small[key]),
+                    f'{key} runs {len(small[key])} queries on the small dataset but {len(sql)} on the large one '
+                    f'(N+1?):\n' + self.sql_diff(small[key], sql, 'small', 'large')
+                )
+
+                recorded = baseline.get(key)
+                self.assertIsNotNone(recorded, f'{key} has no baseline; run with UPDATE_QUERY_BASELINE=1')
+                self.assertLessEqual(
+                    len(sql), recorded['count'],
+                    f'{key} now runs {len(sql)} queries, baseline is {recorded["count"]}:\n'
+                    + self.sql_diff(recorded['sql'], sql, 'baseline', 'current')
+                )
+
+    @staticmethod
+    def sql_diff(old, new, old_label, new_label):
+        return '\n'.join(difflib.unified_diff(old, new, old_label, new_label, lineterm=''))
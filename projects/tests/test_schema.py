@@ -0,0 +1,86 @@
+"""
+Coercion of submitted values through the field schema
+
+Every coercer answers values its field can't take with ValueError, which the
+edit endpoints turn into a 400. That includes JSON lists and objects sent for
+scalar fields: they must neither escape as a TypeError nor be stored as text.
+"""
+import json
+import logging
+from datetime import timedelta
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from projects.models import Project, User
+from projects.schema import FIELDS
+
+
+NON_SCALARS = ([1], {}, {'a': 1}, [])
+
+
+class CoercerTests(SimpleTestCase):
+
+    def test_scalar_fields_reject_lists_and_objects(self):
+        for field_name in ('city', 'notes', 'type', 'status', 'editing_progress', 'package_cameras'):
+            for value in NON_SCALARS:
+                with self.subTest(field=field_name, value=value):
+                    with self.assertRaises(ValueError):
+                        FIELDS[field_name].coerce(value)
+
+    def test_choices_and_text_keep_their_scalars(self):
+        self.assertEqual(FIELDS['type'].coerce('NUNTA'), 'NUNTA')
+        self.assertEqual(FIELDS['type'].coerce(''), '')
+        with self.assertRaises(ValueError):
+            FIELDS['type'].coerce('PARTY')
+        self.assertEqual(FIELDS['city'].coerce('Sibiu'), 'Sibiu')
+        self.assertEqual(FIELDS['city'].coerce(''), '')
+        self.assertEqual(FIELDS['title_video'].coerce(2026), 2026)
+
+    def test_json_fields_still_take_lists(self):
+        self.assertEqual(FIELDS['ceremony_field_order'].coerce(['prep', 'church']), ['prep', 'church'])
+        self.assertEqual(FIELDS['ceremony_field_order'].coerce('["prep"]'), ['prep'])
+
+
+@override_settings(ALLOWED_HOSTS=['testserver'])
+class NonScalarSubmissionTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Views log every write at INFO, and Django every 400 at WARNING
+        cls.loggers = {name: logging.getLogger(name) for name in ('projects', 'django.request')}
+        cls.log_levels = {name: logger.level for name, logger in cls.loggers.items()}
+        for logger in cls.loggers.values():
+            logger.setLevel(logging.ERROR)
+
+    @classmethod
+    def tearDownClass(cls):
+        for name, logger in cls.loggers.items():
+            logger.setLevel(cls.log_levels[name])
+        super().tearDownClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user('admin@example.com', 'pw', first_name='Ana', role='ADMIN')
+        cls.project = Project.objects.create(
+            user=cls.admin, type='NUNTA', title_video='Ana si Ion',
+            event_date=timezone.now() + timedelta(days=30), city='Cluj',
+        )
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def test_autosave_answers_400_and_stores_nothing(self):
+        url = reverse('update_project_field', args=[self.project.slug])
+        for field_name in ('city', 'type'):
+            for value in ([1], {}):
+                with self.subTest(field=field_name, value=value):
+                    response = self.client.post(
+                        url, json.dumps({'field_name': field_name, 'field_value': value}),
+                        content_type='application/json',
+                    )
+                    self.assertEqual(response.status_code, 400)
+        self.project.refresh_from_db()
+        self.assertEqual((self.project.city, self.project.type), ('Cluj', 'NUNTA'))
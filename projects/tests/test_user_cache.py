@@ -0,0 +1,72 @@
+"""
+Cached request users and the invalidation of user-dependent caches
+
+CachedModelBackend serves request.user from the shared cache, which holds the
+session auth hash but never the password hash. Sign-ins don't invalidate
+anything; only name and email changes drop the cached project lists.
+"""
+import pickle
+
+from django.contrib.auth.models import update_last_login
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from projects.auth import cached_user, get_cached_user
+from projects.cache import generations
+from projects.models import User
+
+
+@override_settings(ALLOWED_HOSTS=['testserver'])
+class UserCacheTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('client@example.com', 'old secret', first_name='Ion', role='CLIENT')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_cache_holds_no_password_hash(self):
+        payload = pickle.dumps(get_cached_user(self.user.pk))
+        self.assertNotIn(self.user.password.encode(), payload)
+        self.assertNotIn(self.user.password.split('$')[-1].encode(), payload)
+
+    def test_cached_user_saves_without_losing_the_password(self):
+        user = cached_user(self.user.pk)
+        self.assertEqual(user.get_deferred_fields(), {'password'})
+        user.last_name = 'Popescu'
+        user.save()
+        self.assertTrue(User.objects.get(pk=self.user.pk).check_password('old secret'))
+
+        # Once a password is set on it, sessions get that password's hash, not the cached one
+        cached_hash = user.get_session_auth_hash()
+        user.set_password('new secret')
+        self.assertNotEqual(user.get_session_auth_hash(), cached_hash)
+
+    def test_sessions_are_verified_from_the_cache_and_end_with_a_password_change(self):
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(reverse('dashboard')).status_code, 200)
+        self.assertEqual(self.client.get(reverse('dashboard')).status_code, 200)  # Now from the cache
+
+        self.user.set_password('new secret')
+        self.user.save()
+        response = self.client.get(reverse('dashboard'))
+        self.assertEqual(response.status_code, 302)
+        self.assertIn(reverse('login'), response['Location'])
+
+    def test_invalidation_follows_what_changed(self):
+        user = User.objects.get(pk=self.user.pk)
+
+        def changed(action):
+            before = generations('users', 'projects')
+            action()
+            after = generations('users', 'projects')
+            return [namespace for namespace, old, new in zip(('users', 'projects'), before, after) if old != new]
+
+        self.assertEqual(changed(lambda: update_last_login(None, user)), [])
+        self.assertEqual(changed(lambda: user.save(update_fields=['role'])), ['users'])
+        user.first_name = 'Ionel'
+        self.assertEqual(changed(user.save), ['users', 'projects'])
+        self.assertEqual(changed(user.save), ['users'])
+        self.assertEqual(changed(lambda: User.objects.get(pk=user.pk).delete()), ['users', 'projects'])
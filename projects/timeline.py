@@ -0,0 +1,123 @@
+"""
+Production calendar: project event days and editing due dates
+
+ProjectCalendarEntry holds a row per active project and kind (EVENT on the
+event's local date, DUE on due_date) with the few project columns the
+calendar shows, so any range of days - up to MAX_MONTHS months - is read
+with one query on the (day, kind) index. refresh_calendar() rewrites a
+project's rows when Project.save() (signals.py) or compare_and_set() changes
+one of Project.CALENDAR_FIELDS; rebuild_calendar() recomputes the table.
+
+Due-date urgency is bucketed in SQL by due_urgency(), relative to the
+studio's current date, instead of per project in Python.
+"""
+from datetime import date, timedelta
+
+from dateutil.relativedelta import relativedelta
+from django.db import transaction
+from django.db.models import Case, CharField, Value, When
+from django.utils import timezone
+
+from .models import Project, ProjectCalendarEntry
+
+
+# (bucket, last day it covers counted from today), most urgent first; later dates are 'later'
+URGENCY_BUCKETS = (
+    ('overdue', -1),
+    ('week', 7),
+    ('two_weeks', 14),
+    ('month', 30),
+)
+
+# Longest range one request may ask for
+MAX_MONTHS = 12
+
+_COPIED = ('name', 'slug', 'type', 'status', 'edit_status')
+
+
+def due_urgency(field, today=None):
+    """Urgency bucket of the date column `field` as an SQL expression; None without a date"""
+    today = today or timezone.localdate()
+    return Case(
+        *(
+            When(**{f'{field}__lte': today + timedelta(days=days)}, then=Value(bucket))
+            for bucket, days in URGENCY_BUCKETS
+        ),
+        When(**{f'{field}__isnull': False}, then=Value('later')),
+        default=None,
+        output_field=CharField(),
+    )
+
+
+def urgency_for(day, today=None):
+    """due_urgency() for one date already in memory"""
+    if day is None:
+        return None
+    days_left = (day - (today or timezone.localdate())).days
+    for bucket, days in URGENCY_BUCKETS:
+        if days_left <= days:
+            return bucket
+    return 'later'
+
+
+def _entries(rows):
+    for row in rows:
+        copied = {name: row[name] for name in _COPIED}
+        yield ProjectCalendarEntry(
+            project_id=row['pk'], kind='EVENT', day=timezone.localdate(row['event_date']),
+            starts_at=row['event_date'], **copied,
+        )
+        if row['due_date']:
+            yield ProjectCalendarEntry(project_id=row['pk'], kind='DUE', day=row['due_date'], **copied)
+
+
+def _calendar_rows(projects):
+    return projects.filter(is_archived=False).values('pk', 'event_date', 'due_date', *_COPIED)
+
+
+def refresh_calendar(project_ids):
+    """Rewrite the calendar entries of the given projects from their current values"""
+    with transaction.atomic():
+        ProjectCalendarEntry.objects.filter(project_id__in=project_ids).delete()
+        rows = _calendar_rows(Project.objects.filter(pk__in=project_ids))
+        ProjectCalendarEntry.objects.bulk_create(_entries(rows))
+
+
+def rebuild_calendar():
+    """Recompute every calendar entry; returns how many were written"""
+    with transaction.atomic():
+        ProjectCalendarEntry.objects.all().delete()
+        created = ProjectCalendarEntry.objects.bulk_create(
+            _entries(_calendar_rows(Project.objects.all()).iterator()), batch_size=500
+        )
+    return len(created)
+
+
+def month_range(year, month, months=1):
+    """First day of `month` and the first day after `months` months, or ValueError"""
+    if not 1 <= months <= MAX_MONTHS:
+        raise ValueError(f'months must be between 1 and {MAX_MONTHS}')
+    start = date(year, month, 1)
+    return start, start + relativedelta(months=months)
+
+
+def week_range(year, week):
+    """Monday of ISO `week` and the Monday after it, or ValueError"""
+    start = date.fromisocalendar(year, week, 1)
+    return start, start + timedelta(days=7)
+
+
+def calendar_days(start, end, today=None):
+    """
+    Entries from `start` up to `end` (exclusive), in one query, as
+    day (ISO) -> list of dicts; due dates carry their urgency bucket
+    """
+    entries = ProjectCalendarEntry.objects.filter(day__gte=start, day__lt=end).annotate(
+        urgency=Case(When(kind='DUE', then=due_urgency('day', today)), default=None, output_field=CharField()),
+    ).order_by('day', 'kind', 'starts_at', 'name').values(
+        'day', 'kind', 'starts_at', 'project_id', 'name', 'slug', 'type', 'status', 'edit_status', 'urgency',
+    )
+    days = {}
+    for entry in entries:
+        days.setdefault(entry.pop('day').isoformat(), []).append(entry)
+    return days
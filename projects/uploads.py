@@ -0,0 +1,61 @@
+"""
+Upload hashing and content-addressed storage helpers
+"""
+import hashlib
+import os
+
+from django.core.files.uploadhandler import FileUploadHandler
+
+
+UPLOAD_DIGESTS_ATTR = 'upload_sha256'
+
+
+class HashingUploadHandler(FileUploadHandler):
+    """
+    Compute a SHA-256 digest of every uploaded file while it streams in.
+
+    Must be the first entry of FILE_UPLOAD_HANDLERS: it passes each chunk on
+    unchanged to the next handler (memory or temporary file), so the upload
+    is hashed without a second read. Digests are stored on the request,
+    keyed by form field name, and read back with get_upload_digest().
+    """
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self._hash = hashlib.sha256()
+
+    def receive_data_chunk(self, raw_data, start):
+        self._hash.update(raw_data)
+        return raw_data
+
+    def file_complete(self, file_size):
+        if self.request is not None:
+            digests = getattr(self.request, UPLOAD_DIGESTS_ATTR, None)
+            if digests is None:
+                digests = {}
+                setattr(self.request, UPLOAD_DIGESTS_ATTR, digests)
+            digests[self.field_name] = self._hash.hexdigest()
+        # Let the next handler build the actual UploadedFile
+        return None
+
+
+def get_upload_digest(request, field_name, uploaded_file=None):
+    """
+    Return the SHA-256 digest recorded for an uploaded file field.
+    Falls back to hashing the file if the streaming handler was not active.
+    """
+    digest = getattr(request, UPLOAD_DIGESTS_ATTR, {}).get(field_name)
+    if digest or uploaded_file is None:
+        return digest
+
+    hasher = hashlib.sha256()
+    for chunk in uploaded_file.chunks():
+        hasher.update(chunk)
+    uploaded_file.seek(0)
+    return hasher.hexdigest()
+
+
+def blob_upload_path(instance, filename):
+    """Content-addressed path: project_files/blobs/ab/abcdef...ext"""
+    ext = os.path.splitext(filename)[1].lower()
+    return f'project_files/blobs/{instance.sha256[:2]}/{instance.sha256}{ext}'
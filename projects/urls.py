@@ -5,12 +5,20 @@ urlpatterns = [
     # Specific paths must come before generic slug pattern
     path('create/', views.create_project, name='create_project'),
     path('archived/', views.archived_projects, name='archived_projects'),
+    path('delivery/', views.delivery_status, name='delivery_status'),
+    path('calendar/<int:year>/<int:month>/', views.calendar_month, name='calendar_month'),
+    path('calendar/<int:year>/week/<int:week>/', views.calendar_week, name='calendar_week'),
+    path('performance/', views.performance_stats, name='performance_stats'),
+    path('performance/metrics/', views.performance_metrics, name='performance_metrics'),
     path('backup/', views.backup_database, name='backup_management'),
     path('backup/restore/', views.restore_database_view, name='restore_database'),
     path('backup/download/<str:filename>/', views.download_backup, name='download_backup'),
     path('backup/delete/<str:filename>/', views.delete_backup, name='delete_backup'),
     path('file/<int:file_id>/download/', views.download_file, name='download_file'),
+    path('file/<int:file_id>/preview/<str:kind>/', views.file_preview, name='file_preview'),
     path('modification/<int:mod_id>/approve/', views.approve_modification, name='approve_modification'),
+    path('modification/review/', views.review_modifications, name='review_modifications'),
+    path('events/', views.project_events, name='project_events_all'),
     
     # Slug-based action paths (must come before the generic slug detail view)
     path('<str:slug>/notify/', views.notify_client, name='notify_client'),
@@ -21,7 +29,9 @@ urlpatterns = [
     path('<str:slug>/batch-update/', views.batch_update_project, name='batch_update_project'),
     path('<str:slug>/update-field-order/', views.update_field_order, name='update_field_order'),
     path('<str:slug>/field-history/<str:field_name>/', views.get_field_history, name='get_field_history'),
+    path('<str:slug>/rejected-modifications/', views.rejected_modifications_feed, name='rejected_modifications_feed'),
     path('<str:slug>/dismiss-guidance/', views.dismiss_guidance, name='dismiss_guidance'),
+    path('<str:slug>/events/', views.project_events, name='project_events'),
     path('archive/<str:slug>/', views.archive_project, name='archive_project'),
     path('delete/<str:slug>/', views.delete_project, name='delete_project'),
     
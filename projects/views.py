@@ -1,75 +1,54 @@
-from django.shortcuts import render, redirect, get_object_or_404
+from asgiref.sync import sync_to_async
+from django.shortcuts import aget_object_or_404, render, redirect, get_object_or_404
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.core.mail import send_mail, EmailMessage
+from django.core.mail import EmailMessage
 from django.conf import settings
-from django.http import HttpResponse, JsonResponse, FileResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, JsonResponse, FileResponse, StreamingHttpResponse
 from django.utils import timezone
 from django.views.decorators.http import require_http_methods
 from datetime import datetime
-from django.db.models import Q
-from .models import Project, File, FileDownloadEvent, ProjectModification, User, FieldHistory
-from .forms import LoginForm, ProjectForm, ProjectDetailForm, FileUploadForm
+from django.db.models import F, Q
+from .models import (
+    Project, File, ProjectModification, User, FieldHistory, get_package_presets_json,
+)
+from .auth import alogin_required
+from .cache import cached, invalidate
+from .instrumentation import registry as performance_registry
+from .forms import LoginForm, ProjectForm, ProjectDetailForm, ClientProjectDetailForm, FileUploadForm
+from .uploads import get_upload_digest
+from .analytics import delivery_status_queryset, record_download
+from .autosave import record_auto_applied, record_field_history
+from .changes import ChangeConflict, apply_change_set, record_applied, save_project_changes
+from .pending import PendingConflict, submit_pending
+from .planner import weekly_load
+from .policy import (
+    BYPASS_APPROVAL_FIELDS, CEREMONY_FIELDS, HISTORY_FIELDS, QUIET_FIELDS, client_projection, field_groups,
+)
+from .schema import FIELDS
+from .timeline import calendar_days, due_urgency, month_range, week_range
+from .events import latest_event_id, live_updates_enabled, stream_events, stream_events_sync
+from .mail import asend
+from .reviews import ReviewError, apply_reviews, rejection_emails
+from .media import ranged_file_response
+from .backups import BackupCatalog, create_backup, delete_backup_file, get_retention_policy, prune_backups
+from .storage import get_backup_storage, presigned_url
+import asyncio
 import json
+import logging
+import mimetypes
 import secrets
 import string
 
+logger = logging.getLogger(__name__)
 
-def send_rejection_email(modification, rejection_reason, admin_user):
-    """Send rejection email to client with CC to admin"""
-    project = modification.project
-    client_email = project.client_email
-    
-    if not client_email:
-        raise Exception("No client email found for this project")
-    
-    # Get admin emails for CC
-    admin_users = User.objects.filter(role='ADMIN')
-    admin_emails = [admin.email for admin in admin_users if admin.email]
-    
-    # Prepare email content
-    field_display_name = modification.field_name.replace('_', ' ').title()
-    
-    subject = f'Change Request Rejected - {project.name}'
-    
-    message = f'''Dear {project.client_name or 'Client'},
-
-Your change request for the project "{project.name}" has been reviewed and rejected.
-
-Project Details:
-- Project: {project.name}
-- Event Date: {project.event_date.strftime('%B %d, %Y')}
-- Field: {field_display_name}
-- Your Requested Change: {modification.new_value}
-
-Rejection Reason:
-{rejection_reason}
+# Rejected change requests shown to a client per page of the feed
+CLIENT_FEED_PAGE_SIZE = 20
 
-What's Next:
-Please review the feedback above and feel free to submit a new change request with the necessary corrections. If you have any questions, please don't hesitate to contact us.
-
-Best regards,
-{admin_user.get_full_name() or admin_user.email}
-Wedding Video Portal Team
-
----
-This is an automated message from the Wedding Video Portal system.
-'''
-    
-    try:
-        # Send email to client with CC to admins using EmailMessage
-        email = EmailMessage(
-            subject=subject,
-            body=message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            to=[client_email],
-            cc=admin_emails,
-        )
-        email.send(fail_silently=False)
-        return True
-    except Exception as e:
-        raise Exception(f"Failed to send rejection email: {str(e)}")
+# Pending change requests listed on the admin dashboard (the count covers all of them)
+DASHBOARD_PENDING_LIMIT = 20
 
 
 def home(request):
@@ -109,6 +88,62 @@ def logout_view(request):
     return redirect('login')
 
 
+@cached('projects')
+def dashboard_projects(owner_id, include_archived, search_query, sort_field, today):
+    """
+    Dashboard project list; owner_id None means every client's projects (admin view).
+    Due date urgency is computed in SQL relative to `today`, which is part of the cache key.
+    """
+    projects = Project.objects.for_list().annotate(due_urgency=due_urgency('due_date', today))
+    if owner_id is not None:
+        projects = projects.filter(user_id=owner_id)
+    if not include_archived:
+        projects = projects.filter(is_archived=False)
+    
+    # Apply search filter
+    if search_query:
+        search = (
+            Q(name__icontains=search_query) |
+            Q(client_name__icontains=search_query) |
+            Q(status__icontains=search_query) |
+            Q(type__icontains=search_query)
+        )
+        if owner_id is None:
+            search |= (
+                Q(user__username__icontains=search_query) |
+                Q(user__first_name__icontains=search_query) |
+                Q(user__last_name__icontains=search_query)
+            )
+        projects = projects.filter(search)
+    
+    return list(projects.order_by(sort_field))
+
+
+@cached('projects')
+def pending_modifications_list():
+    """The newest pending client modifications, shown on the admin dashboard"""
+    return list(
+        ProjectModification.objects.filter(status='PENDING').select_related('project', 'created_by')
+        .only(
+            'field_name', 'created_at', 'project__name', 'project__slug',
+            'created_by__first_name', 'created_by__last_name', 'created_by__email',
+        )
+        .order_by('-created_at', '-id')[:DASHBOARD_PENDING_LIMIT]
+    )
+
+
+@cached('projects')
+def pending_modification_count():
+    """Active change requests; counted from the partial index of one_pending_modification_per_field"""
+    return ProjectModification.objects.filter(status='PENDING').count()
+
+
+@cached('projects')
+def editing_workload(today):
+    """Weekly editing load for the admin dashboard (see planner.py); keyed by day so weeks roll over"""
+    return weekly_load(today)
+
+
 @login_required
 def dashboard(request):
     """Dashboard view - shows projects based on user role"""
@@ -136,29 +171,12 @@ def dashboard(request):
     
     if user.is_admin():
         # Admin sees all projects
-        if include_archived:
-            projects = Project.objects.all()  # Include both archived and active
-        else:
-            projects = Project.objects.filter(is_archived=False)
-        pending_modifications = ProjectModification.objects.filter(status='PENDING')
-        
-        # Apply search filter
-        if search_query:
-            projects = projects.filter(
-                Q(name__icontains=search_query) |
-                Q(client_name__icontains=search_query) |
-                Q(user__username__icontains=search_query) |
-                Q(user__first_name__icontains=search_query) |
-                Q(user__last_name__icontains=search_query) |
-                Q(status__icontains=search_query) |
-                Q(type__icontains=search_query)
-            )
-        
-        projects = projects.order_by(sort_field)
-        
         context = {
-            'projects': projects,
-            'pending_modifications': pending_modifications,
+            'projects': dashboard_projects(None, include_archived, search_query, sort_field, timezone.localdate()),
+            'pending_modifications': pending_modifications_list(),
+            'pending_count': pending_modification_count(),
+            'workload': editing_workload(timezone.localdate()),
+            'editing_capacity': settings.EDITING_CAPACITY_HOURS,
             'is_admin': True,
             'search_query': search_query,
             'current_sort': sort_by,
@@ -166,37 +184,38 @@ def dashboard(request):
         }
     else:
         # Client sees only their projects
-        if include_archived:
-            projects = Project.objects.filter(user=user)  # Include both archived and active
-        else:
-            projects = Project.objects.filter(user=user, is_archived=False)
-        
-        # Apply search filter
-        if search_query:
-            projects = projects.filter(
-                Q(name__icontains=search_query) |
-                Q(client_name__icontains=search_query) |
-                Q(status__icontains=search_query) |
-                Q(type__icontains=search_query)
-            )
-        
-        projects = projects.order_by(sort_field)
-        
         context = {
-            'projects': projects,
+            'projects': dashboard_projects(user.pk, include_archived, search_query, sort_field, timezone.localdate()),
             'is_admin': False,
             'search_query': search_query,
             'current_sort': sort_by,
             'include_archived': include_archived,
         }
+    context['live_updates'] = live_updates_enabled(request)
     
     return render(request, 'dashboard.html', context)
 
 
+def client_modification_feed(project, before=None, limit=CLIENT_FEED_PAGE_SIZE):
+    """A page of the project's rejected change requests, newest first, and whether more follow"""
+    feed = project.modifications.filter(status='REJECTED').select_related('approved_by').order_by('-created_at', '-id')
+    if before is not None:
+        # Keyset pagination: continue after the last row the client already has
+        feed = feed.filter(Q(created_at__lt=before.created_at) | Q(created_at=before.created_at, id__lt=before.id))
+    page = list(feed[:limit + 1])
+    return page[:limit], len(page) > limit
+
+
 @login_required
 def project_detail(request, slug):
     """Project detail view"""
-    project = get_object_or_404(Project, slug=slug)
+    if request.user.is_admin():
+        project = get_object_or_404(Project, slug=slug)
+        form_class = ProjectDetailForm
+    else:
+        # Clients never load the admin-only columns, nor get form fields for them
+        project = get_object_or_404(client_projection(Project.objects), slug=slug)
+        form_class = ClientProjectDetailForm
     
     # Check permissions
     if not request.user.is_admin() and project.user != request.user:
@@ -205,73 +224,27 @@ def project_detail(request, slug):
     if request.method == 'POST':
         if 'update_project' in request.POST:
             if request.user.is_client():
-                # Fields that bypass approval workflow (apply immediately for clients)
-                bypass_approval_fields = ['filming_details', 'notes']
-                
                 # For clients: Don't bind form to instance to prevent automatic changes
-                form = ProjectDetailForm(request.POST)
+                form = form_class(request.POST)
                 if form.is_valid():
-                    # Get original values from database
-                    original_project = Project.objects.get(pk=project.pk)
-                    
-                    has_pending_changes = False
-                    has_direct_changes = False
-                    
-                    # Track modifications and apply bypass field changes
-                    for field_name, new_value in form.cleaned_data.items():
-                        old_value = str(getattr(original_project, field_name) or '')
-                        new_value_str = str(new_value or '')
-                        
-                        # Only process if value actually changed
-                        if old_value != new_value_str:
-                            if field_name in bypass_approval_fields:
-                                # Apply changes immediately for bypass fields
-                                setattr(project, field_name, new_value)
-                                has_direct_changes = True
-                                
-                                # Create AUTO_APPLIED modification record
-                                ProjectModification.objects.create(
-                                    project=project,
-                                    field_name=field_name,
-                                    old_value=old_value,
-                                    new_value=new_value_str,
-                                    created_by=request.user,
-                                    status='AUTO_APPLIED'
-                                )
-                                
-                                # Create field history
-                                FieldHistory.objects.create(
-                                    project=project,
-                                    field_name=field_name,
-                                    old_value=old_value,
-                                    new_value=new_value_str,
-                                    edited_by=request.user
-                                )
-                            else:
-                                # Create PENDING modification for other fields
-                                ProjectModification.objects.create(
-                                    project=project,
-                                    field_name=field_name,
-                                    old_value=old_value,
-                                    new_value=new_value_str,
-                                    created_by=request.user,
-                                    status='PENDING'
-                                )
-                                has_pending_changes = True
-                    
-                    if has_pending_changes:
-                        project.admin_notified_of_changes = True
-                        project.has_unsent_changes = True
-                    
-                    project.save()
+                    # Typed diff against the loaded project, written in one transaction;
+                    # fields that bypass approval apply immediately
+                    try:
+                        applied, requested = apply_change_set(
+                            project, form.cleaned_data, request.user, BYPASS_APPROVAL_FIELDS
+                        )
+                    except ChangeConflict:
+                        messages.error(request, 'This project was changed by someone else while you were editing. '
+                                                'Please review the latest values and try again.')
+                        return redirect('project_detail', slug=project.slug)
                     
                     # Send email notification to admin only if there are pending changes
-                    if has_pending_changes:
+                    if requested:
                         if project.notify_admin_of_changes(request.user):
                             messages.info(request, 'Your changes have been submitted for admin approval and administrators have been notified.')
                         else:
                             messages.info(request, 'Your changes have been submitted for admin approval.')
-                    elif has_direct_changes:
+                    elif applied:
                         messages.success(request, 'Your changes have been saved successfully.')
                     
             else:
@@ -286,92 +259,38 @@ def project_detail(request, slug):
         elif 'upload_file' in request.POST:
             file_form = FileUploadForm(request.POST, request.FILES)
             if file_form.is_valid():
+                uploaded = request.FILES['file']
                 file = file_form.save(commit=False)
                 file.project = project
                 file.uploaded_by = request.user
-                file.size_bytes = request.FILES['file'].size
+                # Content hash was computed while the upload streamed in
+                is_duplicate = file.attach_upload(uploaded, get_upload_digest(request, 'file', uploaded))
                 file.save()
-                messages.success(request, 'File uploaded successfully.')
-                return redirect('project_detail', pk=project.pk)
+                if is_duplicate:
+                    messages.success(request, 'File uploaded successfully (identical content already stored, reusing it).')
+                else:
+                    messages.success(request, 'File uploaded successfully.')
+                return redirect('project_detail', slug=project.slug)
+            form = form_class(instance=project)
     else:
-        form = ProjectDetailForm(instance=project)
+        form = form_class(instance=project)
         file_form = FileUploadForm()
     
-    files = project.files.all()
-    modifications = project.modifications.filter(status='PENDING') if request.user.is_admin() else None
+    files = project.files.select_related('download_stats', 'preview')
+    modifications = project.modifications.filter(status='PENDING').select_related('created_by') if request.user.is_admin() else None
+    rejected_modifications, rejected_has_more, rejected_total = [], False, 0
+    if not request.user.is_admin():
+        rejected_modifications, rejected_has_more = client_modification_feed(project)
+        if rejected_has_more:
+            rejected_total = project.modifications.filter(status='REJECTED').count()
+        else:
+            rejected_total = len(rejected_modifications)
     ceremony_fields = project.get_ceremony_fields_ordered()
     
     # Get field history for filming_details and notes
     filming_details_history = project.field_history.filter(field_name='filming_details').order_by('-created_at')
     notes_history = project.field_history.filter(field_name='notes').order_by('-created_at')
     
-    # Package presets for client-side use
-    package_presets = {
-        'Clasic': {
-            'package_type': 'Clasic',
-            'package_4k': True, 'package_fullhd': False, 'package_cameras': 1,
-            'montage_highlights': True, 'montage_movie': True, 'montage_bonus_primary': False, 'montage_bonus_full': False,
-            'montage_movie_duration': '2h-3h', 'montage_cinema_duration': '1h30min',
-            'equipment_audio_recorder': True, 'equipment_stabilizer': True, 'equipment_external_light': False,
-            'team_videographer': 1, 'team_operator': 0, 'team_assistant': 0,
-            'delivery_online': True, 'delivery_usb': False
-        },
-        'Highlights': {
-            'package_type': 'Highlights',
-            'package_4k': True, 'package_fullhd': False, 'package_cameras': 2,
-            'montage_highlights': True, 'montage_movie': False, 'montage_bonus_primary': False, 'montage_bonus_full': True,
-            'montage_movie_duration': '', 'montage_cinema_duration': '1h',
-            'equipment_audio_recorder': True, 'equipment_stabilizer': True, 'equipment_external_light': True,
-            'team_videographer': 1, 'team_operator': 0, 'team_assistant': 1,
-            'delivery_online': True, 'delivery_usb': False
-        },
-        'Duo': {
-            'package_type': 'Duo',
-            'package_4k': True, 'package_fullhd': False, 'package_cameras': 2,
-            'montage_highlights': True, 'montage_movie': True, 'montage_bonus_primary': False, 'montage_bonus_full': False,
-            'montage_movie_duration': '3h-4h', 'montage_cinema_duration': '1h30min',
-            'equipment_audio_recorder': True, 'equipment_stabilizer': True, 'equipment_external_light': False,
-            'team_videographer': 1, 'team_operator': 1, 'team_assistant': 0,
-            'delivery_online': True, 'delivery_usb': False
-        },
-        'Cinema': {
-            'package_type': 'Cinema',
-            'package_4k': True, 'package_fullhd': False, 'package_cameras': 2,
-            'montage_highlights': True, 'montage_movie': False, 'montage_bonus_primary': True, 'montage_bonus_full': True,
-            'montage_movie_duration': '', 'montage_cinema_duration': '1h30min',
-            'equipment_audio_recorder': True, 'equipment_stabilizer': True, 'equipment_external_light': True,
-            'team_videographer': 2, 'team_operator': 0, 'team_assistant': 0,
-            'delivery_online': True, 'delivery_usb': False
-        },
-        'Creative': {
-            'package_type': 'Creative',
-            'package_4k': True, 'package_fullhd': False, 'package_cameras': 3,
-            'montage_highlights': True, 'montage_movie': True, 'montage_bonus_primary': False, 'montage_bonus_full': True,
-            'montage_movie_duration': '3h-4h', 'montage_cinema_duration': '1h30min',
-            'equipment_audio_recorder': True, 'equipment_stabilizer': True, 'equipment_external_light': True,
-            'team_videographer': 2, 'team_operator': 1, 'team_assistant': 0,
-            'delivery_online': True, 'delivery_usb': True
-        },
-        'Botez': {
-            'package_type': 'Botez',
-            'package_4k': True, 'package_fullhd': False, 'package_cameras': 1,
-            'montage_highlights': True, 'montage_movie': True, 'montage_bonus_primary': False, 'montage_bonus_full': False,
-            'montage_movie_duration': '2h-3h', 'montage_cinema_duration': '1h30min',
-            'equipment_audio_recorder': True, 'equipment_stabilizer': True, 'equipment_external_light': False,
-            'team_videographer': 1, 'team_operator': 0, 'team_assistant': 0,
-            'delivery_online': True, 'delivery_usb': False
-        },
-        'Custom': {
-            'package_type': 'Custom',
-            'package_4k': True, 'package_fullhd': False, 'package_cameras': 1,
-            'montage_highlights': False, 'montage_movie': False, 'montage_bonus_primary': False, 'montage_bonus_full': False,
-            'montage_movie_duration': '', 'montage_cinema_duration': '1h30min',
-            'equipment_audio_recorder': False, 'equipment_stabilizer': False, 'equipment_external_light': False,
-            'team_videographer': 1, 'team_operator': 0, 'team_assistant': 0,
-            'delivery_online': True, 'delivery_usb': False
-        }
-    }
-    
     # Get guidance message info for clients
     guidance_message = None
     guidance_message_type = None
@@ -387,14 +306,19 @@ def project_detail(request, slug):
         'file_form': file_form,
         'files': files,
         'modifications': modifications,
+        'rejected_modifications': rejected_modifications,
+        'rejected_has_more': rejected_has_more,
+        'rejected_total': rejected_total,
         'is_admin': request.user.is_admin(),
+        'field_groups': field_groups(request.user.role),
         'ceremony_fields': ceremony_fields,
-        'package_presets': json.dumps(package_presets),
+        'package_presets': get_package_presets_json(),
         'filming_details_history': filming_details_history,
         'notes_history': notes_history,
         'guidance_message': guidance_message,
         'guidance_message_type': guidance_message_type,
         'show_guidance': show_guidance,
+        'live_updates': live_updates_enabled(request),
     }
     
     return render(request, 'project_detail.html', context)
@@ -436,7 +360,8 @@ def create_project(request):
                                 first_name=client_user.first_name,
                                 last_name=client_user.last_name
                             )
-                            Project.objects.filter(user=client_user).update(client_name=client_name)
+                            Project.objects.filter(user=client_user).update(client_name=client_name, version=F('version') + 1)
+                            invalidate('projects')  # queryset.update() sends no signals
                             
                 except User.DoesNotExist:
                     # Create new client user
@@ -503,7 +428,7 @@ def archived_projects(request):
         messages.error(request, 'Only administrators can view archived projects.')
         return redirect('dashboard')
     
-    projects = Project.objects.filter(is_archived=True).order_by('-id')
+    projects = Project.objects.for_list().filter(is_archived=True).order_by('-id')
     
     context = {
         'projects': projects,
@@ -515,47 +440,174 @@ def archived_projects(request):
 
 
 @login_required
-def download_file(request, file_id):
+def delivery_status(request):
+    """Delivery status of active projects, read from the download rollups - admin only"""
+    if not request.user.is_admin():
+        messages.error(request, 'Only administrators can view delivery status.')
+        return redirect('dashboard')
+    
+    show = request.GET.get('show', 'all')
+    projects = delivery_status_queryset()
+    if show == 'undelivered':
+        projects = projects.filter(
+            Q(download_stats__isnull=True) | Q(download_stats__client_download_count=0)
+        )
+    
+    context = {
+        'projects': projects,
+        'show': show,
+        'is_admin': True,
+        'page_title': 'Delivery Status'
+    }
+    
+    return render(request, 'delivery_status.html', context)
+
+
+@login_required
+def calendar_month(request, year, month):
+    """
+    Production calendar as JSON from the first day of `month` - admin only.
+    ?months=N (up to 12) returns N months; the whole range is read in one query.
+    """
+    if not request.user.is_admin():
+        return JsonResponse({'error': 'Unauthorized'}, status=403)
+    try:
+        start, end = month_range(year, month, int(request.GET.get('months', 1)))
+    except ValueError as e:
+        return JsonResponse({'error': f'Invalid range: {e}'}, status=400)
+    return calendar_response(start, end)
+
+
+@login_required
+def calendar_week(request, year, week):
+    """Production calendar as JSON for ISO `week` of `year` - admin only"""
+    if not request.user.is_admin():
+        return JsonResponse({'error': 'Unauthorized'}, status=403)
+    try:
+        start, end = week_range(year, week)
+    except ValueError as e:
+        return JsonResponse({'error': f'Invalid range: {e}'}, status=400)
+    return calendar_response(start, end)
+
+
+def calendar_response(start, end):
+    """Event days and due dates from `start` up to `end` (exclusive), grouped by day"""
+    today = timezone.localdate()
+    return JsonResponse({
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'today': today.isoformat(),
+        'days': calendar_days(start, end, today),
+    })
+
+
+@login_required
+def performance_stats(request):
+    """Per-view request timings collected by PerformanceMiddleware - admin only"""
+    if not request.user.is_admin():
+        messages.error(request, 'Only administrators can view performance statistics.')
+        return redirect('dashboard')
+    
+    if request.method == 'POST' and request.POST.get('action') == 'reset':
+        performance_registry.reset()
+        messages.success(request, 'Performance statistics were reset.')
+        return redirect('performance_stats')
+    
+    context = {
+        'rows': performance_registry.summaries(),
+        'started_at': datetime.fromtimestamp(performance_registry.started_at, tz=timezone.get_current_timezone()),
+        'window': performance_registry.window,
+        'is_admin': True,
+        'page_title': 'Performance'
+    }
+    
+    return render(request, 'performance_stats.html', context)
+
+
+def performance_metrics(request):
+    """Prometheus text export of the request metrics (admin session or METRICS_TOKEN bearer)"""
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    authorized = request.user.is_authenticated and request.user.is_admin()
+    if not authorized and token:
+        authorized = secrets.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}')
+    if not authorized:
+        return HttpResponse('Forbidden', status=403, content_type='text/plain')
+    
+    return HttpResponse(
+        performance_registry.prometheus(),
+        content_type='text/plain; version=0.0.4; charset=utf-8'
+    )
+
+
+@alogin_required
+async def download_file(request, file_id):
     """Download a file"""
-    file = get_object_or_404(File, pk=file_id)
+    file = await aget_object_or_404(File.objects.select_related('project'), pk=file_id)
     project = file.project
     
     # Check permissions
-    if not request.user.is_admin() and project.user != request.user:
+    if not request.user.is_admin() and project.user_id != request.user.pk:
         messages.error(request, 'You do not have permission to download this file.')
         return redirect('dashboard')
     
-    # Track download
-    FileDownloadEvent.objects.create(
-        file=file,
-        project=project,
-        downloaded_by=request.user,
-        success=True
-    )
+    # Track download (updates the download rollups as well)
+    await sync_to_async(record_download)(file, request.user)
     
-    # Serve file
-    response = FileResponse(file.file, as_attachment=True, filename=file.display_name)
-    return response
+    # Object storage: hand the transfer off to a short-lived presigned URL
+    url = presigned_url(file.file.storage, file.file.name, filename=file.display_name)
+    if url:
+        return redirect(url)
+    
+    # Local storage: stream the file (resumable; read in chunks, see media.file_body)
+    content_type = mimetypes.guess_type(file.display_name)[0] or 'application/octet-stream'
+    return await sync_to_async(ranged_file_response, thread_sensitive=False)(
+        request, file.file, content_type, filename=file.display_name
+    )
 
 
 @login_required
-def notify_client(request, slug):
+def file_preview(request, file_id, kind):
+    """Stream the generated preview proxy or poster of a video file"""
+    file = get_object_or_404(File.objects.select_related('project', 'preview'), pk=file_id)
+    
+    # Check permissions
+    if not request.user.is_admin() and file.project.user != request.user:
+        return HttpResponse(status=403)
+    
+    preview = getattr(file, 'preview', None)
+    if preview is None or preview.status != 'READY':
+        return HttpResponse(status=404)
+    
+    field_file = {'poster': preview.poster, 'proxy': preview.proxy}.get(kind)
+    if not field_file:
+        return HttpResponse(status=404)
+    
+    # Object storage handles range requests itself
+    url = presigned_url(field_file.storage, field_file.name)
+    if url:
+        return redirect(url)
+    
+    content_type = 'image/jpeg' if kind == 'poster' else 'video/mp4'
+    return ranged_file_response(request, field_file, content_type)
+
+
+@alogin_required
+async def notify_client(request, slug):
     """Send notification email to client - admin only"""
     if not request.user.is_admin():
         return JsonResponse({'error': 'Unauthorized'}, status=403)
     if request.method != 'POST':
         return JsonResponse({'error': 'Method not allowed'}, status=405)
     
-    project = get_object_or_404(Project, slug=slug)
+    project = await aget_object_or_404(Project.objects.select_related('user'), slug=slug)
     
     # Parse request body to check for force parameter
     force_send = False
     if request.content_type == 'application/json':
         try:
-            import json
             body = json.loads(request.body)
             force_send = body.get('force', False)
-        except:
+        except (ValueError, AttributeError):
             pass
     
     # Check if we should send notification (unless forced)
@@ -571,9 +623,9 @@ def notify_client(request, slug):
     
     # Send email
     try:
-        send_mail(
+        await asend(EmailMessage(
             subject=f'Update on your project: {project.name}',
-            message=f'''
+            body=f'''
             Dear {project.user.get_full_name() or project.user.username},
             
             There has been an update to your wedding video project "{project.name}".
@@ -588,19 +640,41 @@ def notify_client(request, slug):
             Wedding Video Portal Team
             ''',
             from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[project.user.email],
-            fail_silently=False,
-        )
+            to=[project.user.email],
+        ))
         
         project.last_client_notification_date = timezone.now()
         project.has_unsent_changes = False
-        project.save()
+        await project.asave(update_fields=['last_client_notification_date', 'has_unsent_changes'])
         
         return JsonResponse({'success': True, 'message': 'Notification sent successfully'})
     except Exception as e:
         return JsonResponse({'error': str(e)}, status=500)
 
 
+def project_conflict_response(project, fields):
+    """409 with the project's current version and values of `fields`, for the client to merge or reload"""
+    current = Project.objects.filter(pk=project.pk).values('version', *fields).get()
+    version = current.pop('version')
+    logger.info('Edit conflict', extra={'project': project.slug, 'fields': ','.join(fields)})
+    return JsonResponse({
+        'error': 'This project was changed by someone else while you were editing. Reload to see the latest values.',
+        'conflict': True,
+        'version': version,
+        'current_values': current,
+    }, status=409)
+
+
+def parse_client_version(value):
+    """The project version a client sent, or None if it sent none"""
+    if value in (None, ''):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError('Invalid version')
+
+
 @login_required
 def update_project_field(request, slug):
     """Update a single project field via AJAX"""
@@ -621,131 +695,93 @@ def update_project_field(request, slug):
         if not field_name:
             return JsonResponse({'error': 'Field name is required'}, status=400)
         
-        # Validate field exists on model
-        if not hasattr(project, field_name):
+        # Validate the field is editable (the version and bookkeeping are managed by the server)
+        spec = FIELDS.get(field_name)
+        if spec is None:
             return JsonResponse({'error': 'Invalid field name'}, status=400)
+        if request.user.is_client() and field_name not in field_groups('CLIENT')['editable']:
+            return JsonResponse({'error': 'Field not editable'}, status=403)
         
         # Store old value for modification tracking
-        old_value = str(getattr(project, field_name) or '')
-        
-        # Handle different field types
-        field = project._meta.get_field(field_name)
+        old_value = spec.text(getattr(project, field_name))
         
-        # Handle boolean fields
-        if field.__class__.__name__ == 'BooleanField':
-            if isinstance(field_value, str):
-                field_value = field_value.lower() in ('true', '1', 'yes', 'on')
-            elif not isinstance(field_value, bool):
-                field_value = bool(field_value)
+        # Convert to the field's type (booleans, integers, choices, dates, JSON)
+        try:
+            field_value = spec.coerce(field_value)
+            # Optimistic locking: the version the page was loaded at and, optionally,
+            # the value the client saw for this field (field-level compare-and-set)
+            client_version = parse_client_version(data.get('version'))
+            client_expected = None
+            if 'expected_value' in data:
+                client_expected = {field_name: spec.coerce(data['expected_value'])}
+        except ValueError as e:
+            return JsonResponse({'error': str(e)}, status=400)
         
-        # Handle integer fields
-        elif field.__class__.__name__ == 'IntegerField':
+        # Track modifications if client is editing (except fields that bypass approval)
+        if request.user.is_client() and spec.visibility != 'bypass':
+            # Replaces the client's earlier request for this field, if any
             try:
-                field_value = int(field_value) if field_value != '' else 0
-            except (ValueError, TypeError):
-                return JsonResponse({'error': f'Invalid integer value for {field_name}'}, status=400)
-        
-        # Handle choice fields
-        elif hasattr(field, 'choices') and field.choices:
-            # Validate choice field
-            valid_choices = [choice[0] for choice in field.choices]
-            if field_value not in valid_choices and field_value != '':
-                return JsonResponse({'error': 'Invalid choice'}, status=400)
-        
-        # Fields that bypass approval workflow (apply immediately for both admin and client)
-        bypass_approval_fields = ['filming_details', 'notes']
-        
-        # Track modifications if client is editing (except bypass fields)
-        if request.user.is_client() and field_name not in bypass_approval_fields:
-            ProjectModification.objects.create(
-                project=project,
-                field_name=field_name,
-                old_value=old_value,
-                new_value=str(field_value),
-                created_by=request.user,
-                status='PENDING'
-            )
-            project.admin_notified_of_changes = True
-            project.has_unsent_changes = True
-            project.save()
+                created = submit_pending(project, {field_name: (old_value, spec.text(field_value))}, request.user)
+            except PendingConflict:
+                return project_conflict_response(project, [field_name])
+            if not created:
+                return JsonResponse({
+                    'success': True,
+                    'message': 'No change to submit',
+                    'pending_approval': False,
+                    'version': project.version
+                })
+            # Only the flags change, so no version check is needed
+            project.compare_and_set({'admin_notified_of_changes': True, 'has_unsent_changes': True})
             
             # Send email notification to admin
             project.notify_admin_of_changes(request.user)
             return JsonResponse({
                 'success': True, 
                 'message': 'Change submitted for admin approval',
-                'pending_approval': True
+                'pending_approval': True,
+                'version': project.version
             })
         
         # Admin changes OR client changes to bypass fields are applied immediately
-        if request.user.is_admin() or field_name in bypass_approval_fields:
-            # Convert date strings for DateTimeField where needed
-            if field_name == 'event_date':
-                # Accept either 'YYYY-MM-DD' or 'YYYY-MM-DDTHH:MM'
-                parsed = None
-                try:
-                    if isinstance(field_value, str):
-                        if 'T' in field_value:
-                            # datetime-local format
-                            parsed = datetime.strptime(field_value, '%Y-%m-%dT%H:%M')
-                        else:
-                            # date-only, default to midnight
-                            parsed = datetime.strptime(field_value, '%Y-%m-%d')
-                    if parsed is not None:
-                        # Make timezone-aware using current timezone
-                        tz = timezone.get_current_timezone()
-                        field_value = timezone.make_aware(parsed, tz)
-                except Exception:
-                    return JsonResponse({'error': 'Invalid date format for event_date'}, status=400)
-
-            setattr(project, field_name, field_value)
-            
-            # Admin-only fields that should NOT trigger client notification
-            admin_only_fields = [
-                'videographer_filming_notes',
-                'critical_production_notes', 
-                'videographer_editing_notes',
-                'price',
-                'price_currency',
-                'price_other_details'
-            ]
+        if request.user.is_admin() or spec.visibility == 'bypass':
+            changes = {field_name: field_value}
             
             # Mark that there are changes not yet notified to the client
-            # BUT only if the field is visible to clients
-            if field_name not in admin_only_fields:
-                project.has_unsent_changes = True
+            # BUT only if the change is news for the client
+            if field_name not in QUIET_FIELDS:
+                changes['has_unsent_changes'] = True
             
-            project.save()  # The save method will auto-update project name if title_video changed
+            # Conditional UPDATE; also derives the project name if title_video changed
+            if not save_project_changes(project, changes, [field_name], client_version, client_expected, request.user):
+                return project_conflict_response(project, [field_name])
             
-            # Create auto-applied modification record
-            ProjectModification.objects.create(
-                project=project,
-                field_name=field_name,
-                old_value=old_value,
-                new_value=str(field_value),
-                created_by=request.user,
-                status='AUTO_APPLIED'
-            )
+            # Create auto-applied modification record (coalesced with the user's recent autosaves)
+            record_auto_applied(project, field_name, old_value, spec.text(field_value), request.user)
             
             # Track field history for specific fields (filming_details, notes)
-            if field_name in ['filming_details', 'notes']:
-                print(f"🔍 Field History Check: field={field_name}, old='{old_value}', new='{str(field_value)}'")
-                if old_value != str(field_value):
-                    history_entry = FieldHistory.objects.create(
-                        project=project,
-                        field_name=field_name,
-                        old_value=old_value,
-                        new_value=str(field_value),
-                        edited_by=request.user
-                    )
-                    print(f"✅ Field History Created: ID={history_entry.id}, by={request.user.email}")
+            if field_name in HISTORY_FIELDS:
+                logger.debug('Field history check: old=%r new=%r', old_value, field_value,
+                             extra={'project': slug, 'field': field_name})
+                history_entry, created = record_field_history(
+                    project, field_name, old_value, spec.text(field_value), request.user
+                )
+                if created:
+                    logger.info('Field history created',
+                                extra={'project': slug, 'field': field_name, 'history_id': history_entry.id,
+                                       'user': request.user.pk})
+                elif history_entry is not None:
+                    logger.debug('Field history coalesced',
+                                 extra={'project': slug, 'field': field_name, 'history_id': history_entry.id})
                 else:
-                    print(f"⏭️ No change detected, skipping history entry")
+                    logger.debug('No change detected, skipping history entry',
+                                 extra={'project': slug, 'field': field_name})
             
             return JsonResponse({
                 'success': True, 
                 'message': 'Field updated successfully',
-                'new_value': str(getattr(project, field_name))
+                'new_value': str(getattr(project, field_name)),
+                'version': project.version
             })
             
     except json.JSONDecodeError:
@@ -768,85 +804,79 @@ def batch_update_project(request, slug):
     
     try:
         updates = json.loads(request.body)
-        print(f"📦 BATCH UPDATE REQUEST for {slug}: {updates}")
+        # The payload is only formatted when DEBUG is enabled for this module
+        logger.debug('Batch update payload: %s', updates, extra={'project': slug})
         
         if not isinstance(updates, dict):
             return JsonResponse({'error': 'Updates must be a dictionary'}, status=400)
         
+        # Optimistic locking: the version the page was loaded at and, optionally,
+        # the values the client saw for the fields it sends (see save_project_changes)
+        try:
+            client_version = parse_client_version(updates.pop('_version', None))
+        except ValueError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+        expected_values = updates.pop('_expected', None) or {}
+        if not isinstance(expected_values, dict):
+            return JsonResponse({'error': '_expected must be a dictionary'}, status=400)
+        client_expected = {}
+        
+        # Clients may not even request changes to admin-only or admin-managed fields
+        if request.user.is_client():
+            forbidden = sorted(f for f in updates if f in FIELDS and f not in field_groups('CLIENT')['editable'])
+            if forbidden:
+                return JsonResponse({'error': f'Fields not editable: {", ".join(forbidden)}'}, status=403)
+        
         updated_fields = []
         original_values = {}  # Store original values before any changes
         processed_updates = {}  # Store processed field values
         
         # First pass: capture original values and validate fields
         for field_name, field_value in updates.items():
-            # Validate field exists on model
-            if not hasattr(project, field_name):
+            # Validate the field is editable (the version and bookkeeping are managed by the server)
+            spec = FIELDS.get(field_name)
+            if spec is None:
                 continue  # Skip invalid fields
             
+            # Convert to the field's type (booleans, integers, choices, dates, JSON)
             try:
-                field = project._meta.get_field(field_name)
-                
-                # Store original value before any changes
-                original_values[field_name] = str(getattr(project, field_name) or '')
-                
-                # Handle boolean fields
-                if field.__class__.__name__ == 'BooleanField':
-                    if isinstance(field_value, str):
-                        field_value = field_value.lower() in ('true', '1', 'yes', 'on')
-                    elif not isinstance(field_value, bool):
-                        field_value = bool(field_value)
-                
-                # Handle integer fields
-                elif field.__class__.__name__ == 'IntegerField':
-                    try:
-                        field_value = int(field_value) if field_value != '' else 0
-                    except (ValueError, TypeError):
-                        continue  # Skip invalid values
-                
-                # Handle choice fields
-                elif hasattr(field, 'choices') and field.choices:
-                    valid_choices = [choice[0] for choice in field.choices]
-                    if field_value not in valid_choices and field_value != '':
-                        continue  # Skip invalid choices
-                
-                # Store processed value
-                processed_updates[field_name] = field_value
-                updated_fields.append(field_name)
-                
-            except Exception:
-                continue  # Skip fields that cause errors
+                field_value = spec.coerce(field_value)
+                if field_name in expected_values:
+                    client_expected[field_name] = spec.coerce(expected_values[field_name])
+            except ValueError:
+                continue  # Skip invalid values
+            
+            # Store original and processed values
+            original_values[field_name] = spec.text(getattr(project, field_name))
+            processed_updates[field_name] = field_value
+            updated_fields.append(field_name)
         
         # Fields that bypass approval workflow
-        bypass_approval_fields = ['filming_details', 'notes']
+        bypass_approval_fields = {f for f in updated_fields if FIELDS[f].visibility == 'bypass'}
+        
+        def expected_for(fields):
+            # Field-level compare-and-set only when the client sent every value it overwrites
+            return client_expected if all(f in client_expected for f in fields) else None
         
         # Apply changes for admins or bypass fields for clients
         if request.user.is_admin():
             # Apply changes immediately for admins
-            for field_name, field_value in processed_updates.items():
-                setattr(project, field_name, field_value)
+            changes = dict(processed_updates)
             
-            print(f"💾 SAVING {len(updated_fields)} fields: {updated_fields}")
-            
-            # Admin-only fields that should NOT trigger client notification
-            admin_only_fields = [
-                'videographer_filming_notes',
-                'critical_production_notes', 
-                'videographer_editing_notes',
-                'price',
-                'price_currency',
-                'price_other_details'
-            ]
-            
-            # Check if any client-visible fields were updated
-            client_visible_fields = [f for f in updated_fields if f not in admin_only_fields]
+            # Check if any fields that are news for the client were updated
+            client_visible_fields = [f for f in updated_fields if f not in QUIET_FIELDS]
             if client_visible_fields:
-                project.has_unsent_changes = True
+                changes['has_unsent_changes'] = True
             
             try:
-                project.save()
-                print(f"✅ PROJECT SAVED SUCCESSFULLY")
+                if updated_fields and not save_project_changes(
+                    project, changes, updated_fields, client_version, expected_for(updated_fields), request.user
+                ):
+                    return project_conflict_response(project, updated_fields)
+                logger.info('Batch update saved: %s', updated_fields,
+                            extra={'project': slug, 'user': request.user.pk, 'fields': len(updated_fields)})
             except Exception as save_error:
-                print(f"❌ DATABASE SAVE ERROR: {save_error}")
+                logger.exception('Batch update save failed', extra={'project': slug})
                 return JsonResponse({'error': f'Database error: {str(save_error)}'}, status=500)
         else:
             # For clients: Apply changes only for bypass fields
@@ -854,52 +884,46 @@ def batch_update_project(request, slug):
             pending_fields = [f for f in updated_fields if f not in bypass_approval_fields]
             
             if bypass_fields_to_save:
-                for field_name in bypass_fields_to_save:
-                    setattr(project, field_name, processed_updates[field_name])
-                project.save()
-                print(f"✅ CLIENT: Applied {len(bypass_fields_to_save)} bypass fields: {bypass_fields_to_save}")
+                changes = {field_name: processed_updates[field_name] for field_name in bypass_fields_to_save}
+                if not save_project_changes(
+                    project, changes, bypass_fields_to_save, client_version, expected_for(bypass_fields_to_save),
+                    request.user,
+                ):
+                    return project_conflict_response(project, bypass_fields_to_save)
+                logger.info('Client batch update applied bypass fields: %s', bypass_fields_to_save,
+                            extra={'project': slug, 'user': request.user.pk})
             
             if pending_fields:
-                print(f"📝 CLIENT BATCH UPDATE: {len(pending_fields)} fields queued for approval: {pending_fields}")
+                logger.info('Client batch update queued for approval: %s', pending_fields,
+                            extra={'project': slug, 'user': request.user.pk})
         
         # Track modifications
         if updated_fields:
             try:
+                pending_requests, applied = {}, {}
                 for field_name in updated_fields:
-                    # Determine status and value based on user and field type
+                    # Determine value based on user and field type
                     if request.user.is_client():
-                        new_value = str(processed_updates.get(field_name, '') or '')
-                        # Bypass fields get AUTO_APPLIED status for clients too
-                        status = 'AUTO_APPLIED' if field_name in bypass_approval_fields else 'PENDING'
+                        new_value = FIELDS[field_name].text(processed_updates[field_name])
+                        if field_name not in bypass_approval_fields:
+                            pending_requests[field_name] = (original_values.get(field_name, ''), new_value)
+                            continue
                     else:
-                        new_value = str(getattr(project, field_name) or '')
-                        status = 'AUTO_APPLIED'
+                        new_value = FIELDS[field_name].text(getattr(project, field_name))
                     
-                    ProjectModification.objects.create(
-                        project=project,
-                        field_name=field_name,
-                        old_value=original_values.get(field_name, ''),
-                        new_value=new_value,
-                        created_by=request.user,
-                        status=status
-                    )
-                    
-                    # Track field history for specific fields (filming_details, notes) for both admin and client
-                    if field_name in ['filming_details', 'notes']:
-                        old_val = original_values.get(field_name, '')
-                        if old_val != new_value:
-                            history_entry = FieldHistory.objects.create(
-                                project=project,
-                                field_name=field_name,
-                                old_value=old_val,
-                                new_value=new_value,
-                                edited_by=request.user
-                            )
-                            print(f"📜 Field History Created: {field_name} by {request.user.email} (ID={history_entry.id})")
+                    # Bypass fields get AUTO_APPLIED status for clients too
+                    applied[field_name] = (original_values.get(field_name, ''), new_value)
+                
+                # AUTO_APPLIED rows and field history (filming_details, notes) in one INSERT each
+                record_applied(project, applied, request.user)
                 
-                print(f"📝 CREATED {len(updated_fields)} MODIFICATION RECORDS")
-            except Exception as mod_error:
-                print(f"⚠️ MODIFICATION TRACKING ERROR: {mod_error}")
+                # One active request per field: replaces the client's earlier ones
+                submit_pending(project, pending_requests, request.user)
+            except PendingConflict as conflict:
+                # Unlike other tracking errors, this means the requests weren't submitted
+                return project_conflict_response(project, conflict.fields)
+            except Exception:
+                logger.exception('Modification tracking failed', extra={'project': slug})
                 # Don't fail the whole request for tracking errors
         
         # Handle notifications and project state
@@ -909,21 +933,17 @@ def batch_update_project(request, slug):
             
             if pending_fields:
                 # Mark project as having unsent changes only if there are pending fields
-                project.admin_notified_of_changes = True
-                project.has_unsent_changes = True
-                project.save()
+                # (only the flags change, so no version check is needed)
+                project.compare_and_set({'admin_notified_of_changes': True, 'has_unsent_changes': True})
                 
                 # Notify admin if client made pending changes
                 if project.should_notify_admin():
                     try:
                         project.notify_admin_of_changes(request.user)
-                        print(f"📧 ADMIN NOTIFICATION SENT for {len(pending_fields)} pending fields")
-                    except Exception as notify_error:
-                        print(f"⚠️ NOTIFICATION ERROR: {notify_error}")
+                    except Exception:
+                        logger.exception('Admin notification failed', extra={'project': slug})
                         # Don't fail the whole request for notification errors
         
-        print(f"🎉 BATCH UPDATE COMPLETED SUCCESSFULLY")
-        
         if request.user.is_client():
             bypass_fields_updated = [f for f in updated_fields if f in bypass_approval_fields]
             pending_fields_updated = [f for f in updated_fields if f not in bypass_approval_fields]
@@ -934,7 +954,8 @@ def batch_update_project(request, slug):
                     'success': True, 
                     'message': message,
                     'pending_approval': True,
-                    'updated_fields': updated_fields
+                    'updated_fields': updated_fields,
+                    'version': project.version
                 }, status=202)
             elif bypass_fields_updated:
                 message = f'{len(bypass_fields_updated)} changes saved successfully'
@@ -942,7 +963,8 @@ def batch_update_project(request, slug):
                     'success': True, 
                     'message': message,
                     'pending_approval': False,
-                    'updated_fields': updated_fields
+                    'updated_fields': updated_fields,
+                    'version': project.version
                 })
             else:
                 message = f'{len(pending_fields_updated)} changes submitted for admin approval'
@@ -950,65 +972,40 @@ def batch_update_project(request, slug):
                     'success': True, 
                     'message': message,
                     'pending_approval': True,
-                    'updated_fields': updated_fields
+                    'updated_fields': updated_fields,
+                    'version': project.version
                 }, status=202)
         else:
             return JsonResponse({
                 'success': True, 
                 'message': f'Updated {len(updated_fields)} fields successfully',
-                'updated_fields': updated_fields
+                'updated_fields': updated_fields,
+                'version': project.version
             }, status=200)
         
     except json.JSONDecodeError as json_error:
-        print(f"❌ JSON DECODE ERROR: {json_error}")
+        logger.warning('Batch update with invalid JSON: %s', json_error, extra={'project': slug})
         return JsonResponse({'error': 'Invalid JSON'}, status=400)
     except Exception as e:
-        print(f"❌ BATCH UPDATE ERROR: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception('Batch update failed', extra={'project': slug})
         return JsonResponse({'error': str(e)}, status=500)
 
 
-@login_required
-def approve_modification(request, mod_id):
+@alogin_required
+async def approve_modification(request, mod_id):
     """Approve or reject a modification - admin only"""
     if not request.user.is_admin():
         return JsonResponse({'error': 'Unauthorized'}, status=403)
     
-    modification = get_object_or_404(ProjectModification, pk=mod_id)
+    modification = await aget_object_or_404(ProjectModification.objects.select_related('project'), pk=mod_id)
     action = request.POST.get('action')
     
     if action == 'approve':
-        # Apply the change
-        project = modification.project
-        new_val = modification.new_value
-        # Convert date strings when applying approved changes
-        if modification.field_name == 'event_date':
-            try:
-                if isinstance(new_val, str):
-                    if 'T' in new_val:
-                        dt = datetime.strptime(new_val, '%Y-%m-%dT%H:%M')
-                    else:
-                        dt = datetime.strptime(new_val, '%Y-%m-%d')
-                else:
-                    dt = new_val
-                tz = timezone.get_current_timezone()
-                new_val = timezone.make_aware(dt, tz) if isinstance(dt, datetime) and dt.tzinfo is None else dt
-            except Exception:
-                messages.error(request, 'Invalid date format in approved modification for event_date.')
-                return redirect('project_detail', pk=project.pk)
-
-        setattr(project, modification.field_name, new_val)
-        # Mark as having unnotified changes (client should be notified)
-        project.has_unsent_changes = True
-        project.save()
-        
-        modification.status = 'APPROVED'
-        modification.approved_by = request.user
-        modification.approved_at = timezone.now()
-        modification.save()
-        
-        messages.success(request, 'Modification approved and applied.')
+        try:
+            await sync_to_async(apply_reviews)(request.user, approve_ids=[modification.pk])
+            messages.success(request, 'Modification approved and applied.')
+        except ReviewError as e:
+            messages.error(request, f'Modification not approved: {e}')
     elif action == 'reject':
         rejection_reason = request.POST.get('notes', '').strip()
         
@@ -1016,15 +1013,20 @@ def approve_modification(request, mod_id):
             messages.error(request, 'Rejection reason is required.')
             return redirect('project_detail', slug=modification.project.slug)
         
-        modification.status = 'REJECTED'
-        modification.approved_by = request.user
-        modification.approved_at = timezone.now()
-        modification.notes = rejection_reason
-        modification.save()
+        try:
+            _, rejected = await sync_to_async(apply_reviews)(
+                request.user, reject_ids=[modification.pk], reasons=rejection_reason
+            )
+        except ReviewError as e:
+            messages.error(request, f'Modification not rejected: {e}')
+            return redirect('project_detail', slug=modification.project.slug)
         
         # Send rejection email to client with CC to admin
         try:
-            send_rejection_email(modification, rejection_reason, request.user)
+            emails = await sync_to_async(rejection_emails)(rejected, request.user)
+            if not emails:
+                raise Exception('No client email found for this project')
+            await asend(emails[0])
             messages.success(request, 'Modification rejected and client notified via email.')
         except Exception as e:
             messages.warning(request, f'Modification rejected, but email notification failed: {str(e)}')
@@ -1032,6 +1034,57 @@ def approve_modification(request, mod_id):
     return redirect('project_detail', slug=modification.project.slug)
 
 
+def parse_id_list(value):
+    """A JSON list of ids as ints; ValueError for anything else"""
+    if not isinstance(value, list) or not all(isinstance(pk, int) and not isinstance(pk, bool) for pk in value):
+        raise ValueError('Expected a list of modification ids')
+    return value
+
+
+@alogin_required
+async def review_modifications(request):
+    """
+    Approve and/or reject several pending modifications at once - admin only.
+    Body: {"approve": [ids], "reject": [ids], "notes": "reason" or {"<id>": "reason"}}
+    """
+    if not request.user.is_admin():
+        return JsonResponse({'error': 'Unauthorized'}, status=403)
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Method not allowed'}, status=405)
+    
+    try:
+        data = json.loads(request.body)
+        approve_ids = parse_id_list(data.get('approve', []))
+        reject_ids = parse_id_list(data.get('reject', []))
+    except (ValueError, AttributeError) as e:
+        return JsonResponse({'error': f'Invalid request: {e}'}, status=400)
+    if not approve_ids and not reject_ids:
+        return JsonResponse({'error': 'No modifications selected'}, status=400)
+    
+    try:
+        approved, rejected = await sync_to_async(apply_reviews)(
+            request.user, approve_ids, reject_ids, data.get('notes')
+        )
+    except ReviewError as e:
+        return JsonResponse({'error': str(e), 'modification_ids': e.ids}, status=409)
+    logger.info('Bulk review: %d approved, %d rejected', len(approved), len(rejected),
+                extra={'user': request.user.pk})
+    
+    # One email per client, sent concurrently once the review is committed
+    emails = await sync_to_async(rejection_emails)(rejected, request.user)
+    results = await asyncio.gather(*(asend(email) for email in emails), return_exceptions=True)
+    email_errors = [str(result) for result in results if isinstance(result, Exception)]
+    
+    return JsonResponse({
+        'success': True,
+        'approved': [modification.pk for modification in approved],
+        'rejected': [modification.pk for modification in rejected],
+        'emails_sent': len(emails) - len(email_errors),
+        'email_errors': email_errors,
+        'without_client_email': sorted({m.project.slug for m in rejected if not m.project.client_email}),
+    })
+
+
 @login_required
 def clear_notification(request, slug):
     """Clear unnotified changes flag for a project - admin only"""
@@ -1043,19 +1096,19 @@ def clear_notification(request, slug):
     project = get_object_or_404(Project, slug=slug)
     project.has_unsent_changes = False
     project.admin_notified_of_changes = False
-    project.save()
+    project.save(update_fields=['has_unsent_changes', 'admin_notified_of_changes'])
     return JsonResponse({'success': True, 'message': 'Notifications cleared'})
 
 
-@login_required
-def send_credentials(request, slug):
+@alogin_required
+async def send_credentials(request, slug):
     """Send login credentials to client - admin only"""
     if not request.user.is_admin():
         return JsonResponse({'error': 'Unauthorized'}, status=403)
     if request.method != 'POST':
         return JsonResponse({'error': 'Method not allowed'}, status=405)
 
-    project = get_object_or_404(Project, slug=slug)
+    project = await aget_object_or_404(Project.objects.select_related('user'), slug=slug)
     client_user = project.user
     
     if not project.client_email:
@@ -1063,14 +1116,15 @@ def send_credentials(request, slug):
     
     # Generate a new password
     password = ''.join(secrets.choice(string.ascii_letters + string.digits) for _ in range(12))
-    client_user.set_password(password)
-    client_user.save()
+    # Password hashing is deliberately slow; keep it off the event loop
+    await sync_to_async(client_user.set_password, thread_sensitive=False)(password)
+    await client_user.asave()
     
     # Send email with credentials
     try:
-        send_mail(
+        await asend(EmailMessage(
             subject=f'Login Credentials for Wedding Video Portal - {project.name}',
-            message=f'''
+            body=f'''
             Dear {project.client_name or client_user.get_full_name() or 'Client'},
             
             Your login credentials for the Wedding Video Portal have been created for project "{project.name}".
@@ -1086,9 +1140,8 @@ def send_credentials(request, slug):
             Wedding Video Portal Team
             ''',
             from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[project.client_email],
-            fail_silently=False,
-        )
+            to=[project.client_email],
+        ))
         
         return JsonResponse({'success': True, 'message': 'Credentials sent successfully'})
     except Exception as e:
@@ -1127,7 +1180,8 @@ def change_client_data(request, slug):
                         new_user.last_name = ' '.join(name_parts[1:]) if len(name_parts) > 1 else ''
                         new_user.save()
                         # Update name in ALL projects for this user
-                        Project.objects.filter(user=new_user).update(client_name=new_name)
+                        Project.objects.filter(user=new_user).update(client_name=new_name, version=F('version') + 1)
+                        invalidate('projects')  # queryset.update() sends no signals
                         
                 except User.DoesNotExist:
                     # Create new user for the new email
@@ -1154,7 +1208,8 @@ def change_client_data(request, slug):
                 project.user.save()
                 
                 # Update client_name in ALL projects for this user
-                Project.objects.filter(user=project.user).update(client_name=new_name)
+                Project.objects.filter(user=project.user).update(client_name=new_name, version=F('version') + 1)
+                invalidate('projects')  # queryset.update() sends no signals
             
             else:
                 # No changes needed
@@ -1197,9 +1252,8 @@ def update_field_order(request, slug):
             return JsonResponse({'error': 'field_order must be a list'}, status=400)
         
         # Validate that all fields are valid ceremony fields
-        valid_fields = ['civil_union_details', 'prep', 'church', 'session', 'restaurant']
         for field in field_order:
-            if field not in valid_fields:
+            if not isinstance(field, str) or field not in CEREMONY_FIELDS:
                 return JsonResponse({'error': f'Invalid field: {field}'}, status=400)
         
         # Save the field order to the project
@@ -1223,8 +1277,6 @@ def get_field_history(request, slug, field_name):
     """Get the edit history for a specific field"""
     project = get_object_or_404(Project, slug=slug)
     
-    print(f"📜 Fetching history for: project={slug}, field={field_name}")
-    
     # Check permissions
     if not request.user.is_admin() and project.user != request.user:
         return JsonResponse({'error': 'Unauthorized'}, status=403)
@@ -1235,8 +1287,6 @@ def get_field_history(request, slug, field_name):
         field_name=field_name
     ).select_related('edited_by').order_by('-created_at')
     
-    print(f"📊 Found {history_entries.count()} history entries")
-    
     # Format the response
     from django.utils.timesince import timesince
     history_data = []
@@ -1254,6 +1304,8 @@ def get_field_history(request, slug, field_name):
             'time_ago': timesince(entry.created_at)
         })
     
+    logger.debug('Field history fetched', extra={'project': slug, 'field': field_name, 'entries': len(history_data)})
+    
     return JsonResponse({
         'success': True,
         'field_name': field_name,
@@ -1261,6 +1313,85 @@ def get_field_history(request, slug, field_name):
     })
 
 
+@login_required
+def rejected_modifications_feed(request, slug):
+    """Next page of rejected change requests for the client feed ("load more")"""
+    project = get_object_or_404(Project, slug=slug)
+    
+    # Check permissions
+    if not request.user.is_admin() and project.user != request.user:
+        return JsonResponse({'error': 'Unauthorized'}, status=403)
+    
+    before = None
+    before_id = request.GET.get('before', '')
+    if before_id:
+        if before_id.isdigit():
+            before = project.modifications.filter(pk=before_id, status='REJECTED').only('id', 'created_at').first()
+        if before is None:
+            return JsonResponse({'error': 'Unknown modification'}, status=400)
+    
+    page, has_more = client_modification_feed(project, before)
+    
+    from django.template.defaultfilters import title
+    from django.utils.timesince import timesince
+    visible = field_groups(request.user.role)['visible']
+    modifications_data = []
+    for mod in page:
+        reviewer = mod.approved_by
+        modifications_data.append({
+            'id': mod.id,
+            'field_name': mod.field_name,
+            'field_label': title(mod.field_name),
+            # Requests made before admin-only fields were refused must not reveal their value
+            'old_value': (mod.old_value or '') if mod.field_name in visible else None,
+            'new_value': mod.new_value or '',
+            'notes': mod.notes or '',
+            'rejected_by': (reviewer.get_full_name() or reviewer.email) if reviewer else '',
+            'time_ago': timesince(mod.approved_at) if mod.approved_at else '',
+        })
+    
+    return JsonResponse({
+        'success': True,
+        'modifications': modifications_data,
+        'has_more': has_more,
+    })
+
+
+async def project_events(request, slug=None):
+    """Server-Sent Events stream of live changes to one project, or every visible project without a slug"""
+    # login_required doesn't wrap async views before Django 5.1, so check here
+    if request.method != 'GET':
+        return JsonResponse({'error': 'Method not allowed'}, status=405)
+    if not live_updates_enabled(request):
+        # A WSGI stream would hold a worker thread; 204 tells EventSource not to reconnect
+        return HttpResponse(status=204)
+    user = await request.auser()
+    if not user.is_authenticated:
+        return JsonResponse({'error': 'Authentication required'}, status=401)
+
+    project_id = None
+    if slug is not None:
+        project = await Project.objects.filter(slug=slug).only('id', 'user_id').afirst()
+        if project is None:
+            return JsonResponse({'error': 'Not found'}, status=404)
+        if not user.is_admin() and project.user_id != user.pk:
+            return JsonResponse({'error': 'Unauthorized'}, status=403)
+        project_id = project.id
+
+    # EventSource resends the last id it saw when it reconnects
+    cursor = request.headers.get('Last-Event-ID') or request.GET.get('after', '')
+    after_id = int(cursor) if cursor.isdigit() else await sync_to_async(latest_event_id)()
+
+    if isinstance(request, ASGIRequest):
+        stream = stream_events(user, after_id, project_id)
+    else:
+        stream = stream_events_sync(user, after_id, project_id)  # WSGI with SSE_WSGI
+    response = StreamingHttpResponse(stream, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # Stop nginx from buffering the stream
+    return response
+
+
 @login_required
 def dismiss_guidance(request, slug):
     """Dismiss the current guidance message for a project"""
@@ -1303,114 +1434,46 @@ def backup_database(request):
         messages.error(request, 'Only administrators can create backups.')
         return redirect('dashboard')
     
+    catalog = BackupCatalog()
+    
     if request.method == 'POST':
-        from django.core.management import call_command
-        from pathlib import Path
-        from datetime import datetime
-        import io
-        
         backup_format = request.POST.get('format', 'json')
         
         try:
-            # Create backups directory if it doesn't exist
-            backup_dir = Path(settings.BASE_DIR) / 'backups'
-            backup_dir.mkdir(parents=True, exist_ok=True)
-            
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            base_filename = f'wedding_portal_backup_{timestamp}'
-            
-            if backup_format == 'json':
-                # JSON backup
-                json_file = backup_dir / f'{base_filename}.json'
-                with open(json_file, 'w', encoding='utf-8') as f:
-                    call_command(
-                        'dumpdata',
-                        '--natural-foreign',
-                        '--natural-primary',
-                        '--indent', '2',
-                        stdout=f,
-                        exclude=['contenttypes', 'auth.permission', 'sessions.session']
-                    )
-                
-                file_size = json_file.stat().st_size / (1024 * 1024)
-                messages.success(request, f'Backup created successfully: {json_file.name} ({file_size:.2f} MB)')
-                
-            elif backup_format == 'sqlite':
-                # SQLite file copy
-                db_engine = settings.DATABASES['default']['ENGINE']
-                if 'sqlite' in db_engine:
-                    import shutil
-                    db_path = Path(settings.DATABASES['default']['NAME'])
-                    if db_path.exists():
-                        sqlite_file = backup_dir / f'{base_filename}.sqlite3'
-                        shutil.copy2(db_path, sqlite_file)
-                        file_size = sqlite_file.stat().st_size / (1024 * 1024)
-                        messages.success(request, f'Backup created successfully: {sqlite_file.name} ({file_size:.2f} MB)')
-                    else:
-                        messages.error(request, 'Database file not found.')
-                else:
-                    messages.error(request, 'SQLite backup only works with SQLite databases.')
+            created = create_backup(backup_format, catalog=catalog)
+            if len(created) == 1:
+                file_size = created[0]['size_bytes'] / (1024 * 1024)
+                messages.success(request, f'Backup created successfully: {created[0]["name"]} ({file_size:.2f} MB)')
+            else:
+                messages.success(request, f'Backups created: {", ".join(entry["name"] for entry in created)}')
             
-            elif backup_format == 'both':
-                # Both formats
-                files_created = []
-                
-                # JSON
-                json_file = backup_dir / f'{base_filename}.json'
-                with open(json_file, 'w', encoding='utf-8') as f:
-                    call_command(
-                        'dumpdata',
-                        '--natural-foreign',
-                        '--natural-primary',
-                        '--indent', '2',
-                        stdout=f,
-                        exclude=['contenttypes', 'auth.permission', 'sessions.session']
-                    )
-                files_created.append(json_file.name)
-                
-                # SQLite
-                db_engine = settings.DATABASES['default']['ENGINE']
-                if 'sqlite' in db_engine:
-                    import shutil
-                    db_path = Path(settings.DATABASES['default']['NAME'])
-                    if db_path.exists():
-                        sqlite_file = backup_dir / f'{base_filename}.sqlite3'
-                        shutil.copy2(db_path, sqlite_file)
-                        files_created.append(sqlite_file.name)
-                
-                messages.success(request, f'Backups created: {", ".join(files_created)}')
+            pruned = prune_backups(catalog=catalog)
+            if pruned:
+                messages.info(request, f'Retention policy removed {len(pruned)} old backup file(s).')
             
+        except FileNotFoundError:
+            messages.error(request, 'Database file not found.')
         except Exception as e:
             messages.error(request, f'Backup failed: {str(e)}')
         
         return redirect('backup_management')
     
-    # GET request - show backup management page
-    from pathlib import Path
-    from datetime import datetime
-    
-    backup_dir = Path(settings.BASE_DIR) / 'backups'
+    # GET request - show backup management page from the catalog (no directory scan)
     backups = []
-    
-    if backup_dir.exists():
-        # List all backup files
-        backup_files = sorted(
-            backup_dir.glob('wedding_portal_backup_*'),
-            key=lambda p: p.stat().st_mtime,
-            reverse=True
-        )
-        
-        for backup_file in backup_files:
-            backups.append({
-                'name': backup_file.name,
-                'size': backup_file.stat().st_size / (1024 * 1024),  # MB
-                'date': datetime.fromtimestamp(backup_file.stat().st_mtime),
-                'type': backup_file.suffix[1:].upper()  # .json -> JSON
-            })
+    for entry in catalog.entries():
+        backups.append({
+            'name': entry['name'],
+            'size': entry['size_bytes'] / (1024 * 1024),  # MB
+            'date': datetime.fromisoformat(entry['created_at']),
+            'type': entry['type'],
+            'checksum': entry['checksum'],
+            'duration_ms': entry['duration_ms'],
+        })
     
     context = {
         'backups': backups,
-        'backup_dir': str(backup_dir),
+        'backup_dir': str(catalog.backup_dir),
+        'retention': get_retention_policy(),
         'is_admin': True
     }
     
@@ -1435,6 +1498,13 @@ def download_backup(request, filename):
         return redirect('backup_management')
     
     if not backup_file.exists():
+        # Fall back to the offloaded copy in object storage, if any
+        entry = BackupCatalog(backup_dir).get(filename)
+        storage = get_backup_storage()
+        if entry and entry.get('remote') and storage is not None:
+            url = presigned_url(storage, entry['remote'], filename=filename)
+            if url:
+                return redirect(url)
         messages.error(request, 'Backup file not found.')
         return redirect('backup_management')
     
@@ -1463,9 +1533,11 @@ def delete_backup(request, filename):
         messages.error(request, 'Invalid backup file.')
         return redirect('backup_management')
     
-    if backup_file.exists():
+    catalog = BackupCatalog(backup_dir)
+    if backup_file.exists() or catalog.get(filename):
         try:
-            backup_file.unlink()
+            delete_backup_file(catalog, filename)
+            catalog.remove(filename)
             messages.success(request, f'Backup deleted: {filename}')
         except Exception as e:
             messages.error(request, f'Failed to delete backup: {str(e)}')
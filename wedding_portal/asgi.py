@@ -0,0 +1,15 @@
+"""
+ASGI config for wedding_portal project.
+
+Serves the same application as wsgi.py, e.g. `uvicorn wedding_portal.asgi:application`.
+Under ASGI the async views (email, file downloads, live-update streams) wait
+on the event loop instead of holding a worker thread.
+"""
+
+import os
+
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'wedding_portal.settings')
+
+application = get_asgi_application()
@@ -4,6 +4,7 @@ Django settings for wedding_portal project.
 
 from pathlib import Path
 import os
+import sys
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -40,6 +41,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'projects.instrumentation.PerformanceMiddleware',  # First, so it times everything below
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.locale.LocaleMiddleware',  # Language switching
@@ -54,7 +56,8 @@ ROOT_URLCONF = 'wedding_portal.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # DjangoTemplates that also reports render time to PerformanceMiddleware
+        'BACKEND': 'projects.instrumentation.InstrumentedDjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -75,13 +78,124 @@ WSGI_APPLICATION = 'wedding_portal.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
 
-DATABASES = {
+# DATABASE_ENGINE selects the profile: 'sqlite' (default, tuned for several
+# workers via the PRAGMAs in SQLITE_PRAGMAS) or 'postgresql' (persistent
+# connections with health checks; needs `pip install "psycopg[binary]"`)
+DATABASE_ENGINE = os.getenv('DATABASE_ENGINE', 'sqlite')
+
+if DATABASE_ENGINE == 'postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.getenv('POSTGRES_DB', 'wedding_portal'),
+            'USER': os.getenv('POSTGRES_USER', 'postgres'),
+            'PASSWORD': os.getenv('POSTGRES_PASSWORD', ''),
+            'HOST': os.getenv('POSTGRES_HOST', 'localhost'),
+            'PORT': os.getenv('POSTGRES_PORT', '5432'),
+            # Reuse connections across requests instead of reconnecting every time,
+            # and check them before reuse so a restarted server doesn't surface errors
+            'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 600)),
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {
+                'connect_timeout': 5,
+            },
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.getenv('SQLITE_PATH', BASE_DIR / 'db.sqlite3'),
+            'OPTIONS': {
+                # Seconds the Python driver waits for a write lock before "database is locked"
+                'timeout': int(os.getenv('SQLITE_TIMEOUT', 20)),
+            },
+        }
+    }
+
+# Applied to every new SQLite connection (see projects/db.py). WAL lets readers
+# run while one worker writes; NORMAL sync is safe with WAL and avoids an fsync
+# per commit. Set SQLITE_JOURNAL_MODE=delete to get the old behaviour back.
+SQLITE_PRAGMAS = {
+    'journal_mode': os.getenv('SQLITE_JOURNAL_MODE', 'wal'),
+    'busy_timeout': int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', 20000)),
+    'synchronous': os.getenv('SQLITE_SYNCHRONOUS', 'normal'),
+    'mmap_size': int(os.getenv('SQLITE_MMAP_SIZE', 256 * 1024 * 1024)),
+    'cache_size': -int(os.getenv('SQLITE_CACHE_KB', 20000)),  # negative = KiB
+    'temp_store': 'memory',
+    'foreign_keys': 'on',
+}
+
+
+# Cache
+# 'locmem' (per process; always used by the test runner), 'file' (shared by all
+# workers on one host) or 'redis' (any Redis-compatible server: Redis, Valkey,
+# KeyDB; needs `pip install redis`)
+TESTING = len(sys.argv) > 1 and sys.argv[1] == 'test'
+CACHE_BACKEND = 'locmem' if TESTING else os.getenv('CACHE_BACKEND', 'file')
+
+# Cache keys are prefixed with the deploy version so a release never reads
+# entries pickled by the previous code. Set RELEASE_VERSION in the deploy
+# pipeline; otherwise the checked-out git commit is used.
+RELEASE_VERSION = os.getenv('RELEASE_VERSION', '')
+if not RELEASE_VERSION:
+    try:
+        _head = (BASE_DIR / '.git' / 'HEAD').read_text().strip()
+        if _head.startswith('ref: '):
+            _head = (BASE_DIR / '.git' / _head[5:]).read_text().strip()
+        RELEASE_VERSION = _head[:12]
+    except OSError:
+        RELEASE_VERSION = 'dev'
+
+if CACHE_BACKEND == 'redis':
+    _cache = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.getenv('REDIS_URL', 'redis://127.0.0.1:6379/1'),
+    }
+elif CACHE_BACKEND == 'file':
+    _cache = {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.getenv('CACHE_DIR', BASE_DIR / '.cache'),
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    }
+else:
+    _cache = {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'wedding-portal',
+    }
+
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        **_cache,
+        'KEY_PREFIX': f'wp:{RELEASE_VERSION}',
+        'TIMEOUT': 300,
     }
 }
 
+# Default lifetime of values cached through projects.cache.cached (seconds);
+# signals invalidate them earlier when the underlying rows change
+APP_CACHE_TIMEOUT = int(os.getenv('APP_CACHE_TIMEOUT', 300))
+
+# Autosaves by the same user to the same field within this many seconds update
+# the open ProjectModification / FieldHistory row instead of adding one (0 = off)
+AUTOSAVE_COALESCE_SECONDS = int(os.getenv('AUTOSAVE_COALESCE_SECONDS', 120))
+
+# Live updates (Server-Sent Events, see projects/events.py)
+SSE_POLL_INTERVAL = float(os.getenv('SSE_POLL_INTERVAL', 2))
+SSE_HEARTBEAT_SECONDS = int(os.getenv('SSE_HEARTBEAT_SECONDS', 15))
+SSE_MAX_SECONDS = int(os.getenv('SSE_MAX_SECONDS', 300))  # Browsers reconnect and resume after this
+SSE_RETRY_MS = int(os.getenv('SSE_RETRY_MS', 3000))
+# Pages only open streams when served through ASGI: under WSGI each stream holds a
+# worker thread for SSE_MAX_SECONDS. Set SSE_WSGI=True to stream anyway (e.g. with
+# a threaded runserver or many gunicorn threads).
+SSE_WSGI = os.getenv('SSE_WSGI', 'False') == 'True'
+EVENT_RETENTION_HOURS = int(os.getenv('EVENT_RETENTION_HOURS', 48))
+
+# Editing workload planner (see projects/planner.py): editing hours available per
+# week, and how many weeks ahead the admin dashboard projects the load
+EDITING_CAPACITY_HOURS = float(os.getenv('EDITING_CAPACITY_HOURS', 30))
+WORKLOAD_WEEKS = int(os.getenv('WORKLOAD_WEEKS', 12))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
@@ -136,6 +250,51 @@ STATICFILES_DIRS = [BASE_DIR / 'static']
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Storage backend for uploads and backup offload: 'local' (MEDIA_ROOT) or
+# 's3' (any S3-compatible service: AWS, MinIO, ...; see projects/storage.py)
+STORAGE_BACKEND = os.getenv('STORAGE_BACKEND', 'local')
+
+if STORAGE_BACKEND == 's3':
+    S3_STORAGE_OPTIONS = {
+        'bucket_name': os.getenv('AWS_STORAGE_BUCKET_NAME', 'wedding-portal'),
+        'endpoint_url': os.getenv('AWS_S3_ENDPOINT_URL') or None,  # e.g. http://localhost:9000 for MinIO
+        'region_name': os.getenv('AWS_S3_REGION_NAME') or None,
+        'access_key': os.getenv('AWS_ACCESS_KEY_ID'),
+        'secret_key': os.getenv('AWS_SECRET_ACCESS_KEY'),
+        'default_acl': None,
+        'file_overwrite': False,
+        'querystring_auth': True,
+        'querystring_expire': int(os.getenv('AWS_QUERYSTRING_EXPIRE', '3600')),
+        'signature_version': 's3v4',
+    }
+    STORAGES = {
+        'default': {
+            'BACKEND': 'projects.storage.MediaS3Storage',
+            'OPTIONS': S3_STORAGE_OPTIONS,
+        },
+        'backups': {
+            'BACKEND': 'projects.storage.MediaS3Storage',
+            'OPTIONS': {**S3_STORAGE_OPTIONS, 'location': 'backups'},
+        },
+        'staticfiles': {
+            'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+        },
+    }
+else:
+    STORAGES = {
+        'default': {
+            'BACKEND': 'django.core.files.storage.FileSystemStorage',
+        },
+        'staticfiles': {
+            'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+        },
+    }
+
+# Multipart upload tuning for S3 (large video exports)
+S3_MULTIPART_THRESHOLD_MB = int(os.getenv('S3_MULTIPART_THRESHOLD_MB', '64'))
+S3_MULTIPART_CHUNK_MB = int(os.getenv('S3_MULTIPART_CHUNK_MB', '64'))
+S3_MAX_CONCURRENCY = int(os.getenv('S3_MAX_CONCURRENCY', '8'))
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
 
@@ -173,3 +332,108 @@ DATA_UPLOAD_MAX_MEMORY_SIZE = FILE_UPLOAD_MAX_MEMORY_SIZE
 
 # Session settings
 SESSION_COOKIE_AGE = 86400 * 7  # 7 days
+
+# SESSION_STORE selects where sessions live:
+# 'cached_db' (default) reads from the cache and writes through to the database,
+# 'signed_cookies' keeps the (signed, not encrypted) session in the cookie itself,
+# 'db' is Django's plain database backend. Expired DB sessions are removed by
+# the scheduled `clearsessions` job (see README).
+SESSION_STORE = os.getenv('SESSION_STORE', 'cached_db')
+SESSION_ENGINE = {
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+    'db': 'django.contrib.sessions.backends.db',
+}[SESSION_STORE]
+
+# The cached backend serves the per-request user lookup from the cache; the
+# plain ModelBackend stays listed so sessions created before it keep working
+AUTHENTICATION_BACKENDS = [
+    'projects.auth.CachedModelBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+
+# Logging
+# Records go through a queue to a background thread (projects.log.BackgroundHandler),
+# so request threads never block on stderr. LOG_FORMAT=json emits one JSON object
+# per line. Per-module levels: LOG_LEVELS="projects.views=DEBUG,projects.models=WARNING"
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+LOG_LEVELS = dict(
+    item.strip().split('=', 1) for item in os.getenv('LOG_LEVELS', '').split(',') if '=' in item
+)
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'keyvalue': {
+            '()': 'projects.log.KeyValueFormatter',
+            'format': '%(asctime)s %(levelname)s %(name)s %(message)s',
+        },
+        'json': {
+            '()': 'projects.log.JSONFormatter',
+        },
+    },
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+            'formatter': 'json' if os.getenv('LOG_FORMAT') == 'json' else 'keyvalue',
+        },
+        'queue': {
+            # A '()' factory: from Python 3.12 dictConfig rewires QueueHandler
+            # subclasses given by 'class' (their 'queue' and 'handlers' keys)
+            '()': 'projects.log.BackgroundHandler',
+            'targets': ['cfg://handlers.console'],
+        },
+    },
+    'root': {
+        'handlers': ['queue'],
+        'level': 'WARNING',
+    },
+    'loggers': {
+        'django': {
+            'handlers': ['queue'],
+            'level': os.getenv('DJANGO_LOG_LEVEL', 'INFO'),
+            'propagate': False,
+        },
+        'projects': {
+            'handlers': ['queue'],
+            'level': LOG_LEVEL,
+            'propagate': False,
+        },
+        **{name: {'level': level.upper()} for name, level in LOG_LEVELS.items()},
+    },
+}
+
+# Request instrumentation (projects/instrumentation.py): per-view timings on
+# the admin Performance page and at /projects/performance/metrics/ for Prometheus.
+# Server-Timing headers go to 'admin' users only, 'all' responses, or 'off'.
+PERFORMANCE_INSTRUMENTATION = os.getenv('PERFORMANCE_INSTRUMENTATION', 'True') == 'True'
+PERFORMANCE_SERVER_TIMING = os.getenv('PERFORMANCE_SERVER_TIMING', 'all' if DEBUG else 'admin')
+PERFORMANCE_WINDOW = int(os.getenv('PERFORMANCE_WINDOW', 500))  # Recent samples kept per view
+# Lets a Prometheus scraper read the metrics with "Authorization: Bearer <token>"
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+
+# Backup retention (grandfather-father-son): keep the newest automatic backup
+# of each of the last N days, ISO weeks and months
+BACKUP_RETENTION = {
+    'daily': int(os.getenv('BACKUP_KEEP_DAILY', '7')),
+    'weekly': int(os.getenv('BACKUP_KEEP_WEEKLY', '4')),
+    'monthly': int(os.getenv('BACKUP_KEEP_MONTHLY', '12')),
+}
+
+# Upload handlers: hash uploads (SHA-256) as they stream in, then hand the
+# chunks to Django's default memory/temporary-file handlers
+FILE_UPLOAD_HANDLERS = [
+    'projects.uploads.HashingUploadHandler',
+    'django.core.files.uploadhandler.MemoryFileUploadHandler',
+    'django.core.files.uploadhandler.TemporaryFileUploadHandler',
+]
+
+# Video previews (python manage.py process_media); ffmpeg is optional
+FFMPEG_BINARY = os.getenv('FFMPEG_BINARY', 'ffmpeg')
+FFPROBE_BINARY = os.getenv('FFPROBE_BINARY', 'ffprobe')
+MEDIA_PREVIEW_HEIGHT = 480
+MEDIA_PREVIEW_BITRATE = '800k'
+# Seconds after which a preview still PROCESSING is taken to belong to a worker
+# that died, and is claimed again (longer than ffmpeg's own 1h timeout)
+MEDIA_PREVIEW_CLAIM_TIMEOUT = int(os.getenv('MEDIA_PREVIEW_CLAIM_TIMEOUT', 2 * 3600))